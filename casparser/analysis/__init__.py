@@ -1,3 +1,4 @@
 from .gains import CapitalGainsReport
+from .harvest import HarvestSimulator
 
-__all__ = ["CapitalGainsReport"]
+__all__ = ["CapitalGainsReport", "HarvestSimulator"]
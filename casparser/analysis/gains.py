@@ -1,21 +1,24 @@
 import csv
 import io
 import itertools
+import math
+import os
 import re
-from collections import deque
-from dataclasses import dataclass
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
-from typing import List
+from fractions import Fraction
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple
 
 from dateutil.parser import parse as dateparse
-from dateutil.relativedelta import relativedelta
 
 from casparser.enums import FundType, GainType, TransactionType
 from casparser.exceptions import GainsError, IncompleteCASError
-from casparser.types import CASData, TransactionData
+from casparser.types import CASData, SchemeValuation, TransactionData
 
-from .utils import CII, get_fin_year, nav_search
+from .utils import CII, add_years, fin_year_start, get_fin_year, nav_search, nav_table
 
 PURCHASE_TXNS = {
     TransactionType.DIVIDEND_REINVEST,
@@ -141,6 +144,119 @@ class MergedTransaction:
             self.purchase = Decimal(0.0)
 
 
+def _parse_date(value: str) -> date:
+    """`dateparse(value).date()`, skipping dateutil for plain ISO dates."""
+    if len(value) == 10 and value[4] == value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return dateparse(value).date()
+
+
+class _DailyTotals:
+    """A scheme's transactions netted per day into parallel arrays, in
+    date order, with `MergedTransaction.add`'s rules applied per day.
+
+    Built in one pass: dates are parsed once, the (already date-ordered)
+    transactions are only sorted if they are not, and each day's rows
+    are ordered by descending amount as `MergedTransaction` consumers
+    expect (the last purchase/sale NAV of the day wins).
+    """
+
+    __slots__ = (
+        "dates",
+        "navs",
+        "purchase",
+        "purchase_units",
+        "sale",
+        "sale_units",
+        "stamp_duty",
+        "stt",
+        "tds",
+    )
+
+    def __init__(self, transactions: Iterable[TransactionData], after: Optional[date] = None):
+        for name in self.__slots__:
+            setattr(self, name, [])
+        parsed: Dict[str, date] = {}
+        rows: List[Tuple[date, TransactionData]] = []
+        for txn in transactions:
+            if txn.amount is None:
+                continue
+            dt = txn.date
+            if isinstance(dt, str):
+                dt = parsed.get(txn.date)
+                if dt is None:
+                    dt = parsed[txn.date] = _parse_date(txn.date)
+            if after is not None and dt <= after:
+                continue
+            rows.append((dt, txn))
+        if any(rows[idx][0] > rows[idx + 1][0] for idx in range(len(rows) - 1)):
+            rows.sort(key=lambda row: row[0])
+        start = 0
+        while start < len(rows):
+            dt = rows[start][0]
+            stop = start + 1
+            while stop < len(rows) and rows[stop][0] == dt:
+                stop += 1
+            day = [txn for _, txn in rows[start:stop]]
+            if len(day) > 1:
+                day.sort(key=lambda x: -x.amount)
+            self._add_day(dt, day)
+            start = stop
+
+    def _add_day(self, dt: date, txns: List[TransactionData]):
+        nav = purchase = purchase_units = Decimal(0.0)
+        sale = sale_units = stamp_duty = stt = tds = Decimal(0.0)
+        for txn in txns:
+            txn_type = txn.type
+            if txn_type in PURCHASE_TXNS and txn.units is not None:
+                nav = txn.nav
+                purchase_units += txn.units
+                purchase += txn.amount
+            elif txn_type in SALE_TXNS and txn.units is not None:
+                nav = txn.nav
+                sale_units += txn.units
+                sale += txn.amount
+            elif txn_type == TransactionType.STT_TAX:
+                stt += txn.amount
+            elif txn_type == TransactionType.STAMP_DUTY_TAX:
+                stamp_duty += txn.amount
+            elif txn_type == TransactionType.TDS_TAX:
+                tds += txn.amount
+            elif txn_type == TransactionType.SEGREGATION:
+                nav = Decimal(0.0)
+                purchase_units += txn.units
+                purchase = Decimal(0.0)
+        self.dates.append(dt)
+        self.navs.append(nav)
+        self.purchase.append(purchase)
+        self.purchase_units.append(purchase_units)
+        self.sale.append(sale)
+        self.sale_units.append(sale_units)
+        self.stamp_duty.append(stamp_duty)
+        self.stt.append(stt)
+        self.tds.append(tds)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def merged(self, idx: int) -> MergedTransaction:
+        """Day `idx` as a `MergedTransaction`."""
+        return MergedTransaction(
+            dt=self.dates[idx],
+            nav=self.navs[idx],
+            purchase=self.purchase[idx],
+            purchase_units=self.purchase_units[idx],
+            sale=self.sale[idx],
+            sale_units=self.sale_units[idx],
+            stamp_duty=self.stamp_duty[idx],
+            stt=self.stt[idx],
+            tds=self.tds[idx],
+        )
+
+
 @dataclass
 class Fund:
     """Fund details"""
@@ -158,9 +274,30 @@ class Fund:
         return self.scheme < other.scheme
 
 
-@dataclass
+# Marks a GainEntry whose FMV NAV hasn't been looked up yet.
+_NAV_NOT_LOADED = object()
+
+# Grandfathering (sec 112A) cut-offs for equity lots.
+_FMV_CUTOFF_DATE = date(2018, 1, 31)
+_FMV_SELL_CUTOFF_DATE = date(2018, 4, 1)
+
+# Minimum holding period, in years, for a sale to be long-term (shared
+# with `harvest`).
+LTCG_HOLDING_YEARS = {FundType.EQUITY.name: 1, FundType.DEBT.name: 3}
+
+
+@dataclass(slots=True)
 class GainEntry:
-    """Gain data of a realised transaction"""
+    """Gain data of a realised transaction.
+
+    The gain type and the realised LTCG/STCG split are computed once, at
+    creation. The remaining derived values (index ratio, cost of
+    acquisition, taxable LTCG) are computed on first access and cached.
+
+    The 31-Jan-2018 FMV NAV is looked up only when `fmv_nav` is first
+    read: from `nav_table` (prefetched by `CapitalGainsReport` in one DB
+    session) when it has the fund's ISIN, else via `nav_search`.
+    """
 
     fy: str
     fund: Fund
@@ -174,25 +311,39 @@ class GainEntry:
     sale_value: Decimal
     stt: Decimal
     units: Decimal
+    nav_table: Optional[Mapping[str, Optional[Decimal]]] = field(
+        default=None, repr=False, compare=False
+    )
+    gain_type: GainType = field(init=False, repr=False, compare=False)
+    gain: Decimal = field(init=False, repr=False, compare=False)
+    ltcg: Decimal = field(init=False, repr=False, compare=False)
+    stcg: Decimal = field(init=False, repr=False, compare=False)
+    _fmv_isin: object = field(default=_NAV_NOT_LOADED, init=False, repr=False, compare=False)
+    _fmv_nav: Optional[Decimal] = field(default=None, init=False, repr=False, compare=False)
+    _index_ratio: Optional[Decimal] = field(default=None, init=False, repr=False, compare=False)
+    _coa: Optional[Decimal] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self.__cutoff_date = date(2018, 1, 31)
-        self.__sell_cutoff_date = date(2018, 4, 1)
-        self.__update_nav()
+        # Identify gain type based on the fund type, buy and sell dates.
+        ltcg_date = add_years(self.purchase_date, LTCG_HOLDING_YEARS[self.type])
+        self.gain_type = GainType.LTCG if self.sale_date > ltcg_date else GainType.STCG
+        self.gain = Decimal(round(self.sale_value - self.acquisition_value, 2))
+        if self.gain_type == GainType.LTCG:
+            self.ltcg, self.stcg = self.gain, Decimal(0.0)
+        else:
+            self.ltcg, self.stcg = Decimal(0.0), self.gain
 
     def __update_nav(self):
-        self._cached_isin = self.fund.isin
-        self._cached_nav = nav_search(self._cached_isin)
-
-    @property
-    def gain_type(self):
-        """Identify gain type based on the current fund type, buy and sell dates."""
-        ltcg = {
-            FundType.EQUITY.name: self.purchase_date + relativedelta(years=1),
-            FundType.DEBT.name: self.purchase_date + relativedelta(years=3),
-        }
-
-        return GainType.LTCG if self.sale_date > ltcg[self.type] else GainType.STCG
+        isin = self.fund.isin
+        if not isin:
+            nav = None
+        elif self.nav_table is not None and isin in self.nav_table:
+            nav = self.nav_table[isin]
+        else:
+            nav = nav_search(isin)
+        self._fmv_isin = isin
+        self._fmv_nav = nav
+        self._coa = None
 
     @property
     def acquisition_value(self) -> Decimal:
@@ -205,15 +356,11 @@ class GainEntry:
         """
         return self.purchase_value + self.stamp_duty
 
-    @property
-    def gain(self) -> Decimal:
-        return Decimal(round(self.sale_value - self.acquisition_value, 2))
-
     @property
     def fmv_nav(self) -> Decimal:
-        if self.fund.isin != self._cached_isin:
+        if self.fund.isin != self._fmv_isin:
             self.__update_nav()
-        return self._cached_nav
+        return self._fmv_nav
 
     @property
     def fmv(self) -> Decimal:
@@ -223,18 +370,26 @@ class GainEntry:
 
     @property
     def index_ratio(self) -> Decimal:
-        return Decimal(
-            round(CII[get_fin_year(self.sale_date)] / CII[get_fin_year(self.purchase_date)], 2)
-        )
+        if self._index_ratio is None:
+            sale_cii = CII.for_year(fin_year_start(self.sale_date))
+            purchase_cii = CII.for_year(fin_year_start(self.purchase_date))
+            self._index_ratio = Decimal(round(sale_cii / purchase_cii, 2))
+        return self._index_ratio
 
     @property
     def coa(self) -> Decimal:
         if self.fund.type == FundType.DEBT:
-            return Decimal(round(self.acquisition_value * self.index_ratio, 2))
-        if self.purchase_date < self.__cutoff_date:
-            if self.sale_date < self.__sell_cutoff_date:
+            if self._coa is None:
+                self._coa = Decimal(round(self.acquisition_value * self.index_ratio, 2))
+            return self._coa
+        if self.purchase_date < _FMV_CUTOFF_DATE:
+            if self.sale_date < _FMV_SELL_CUTOFF_DATE:
                 return self.sale_value
-            return max(self.acquisition_value, min(self.fmv, self.sale_value))
+            # Goes through `fmv_nav`, which resets the cache on an ISIN change.
+            fmv = self.fmv
+            if self._coa is None:
+                self._coa = max(self.acquisition_value, min(fmv, self.sale_value))
+            return self._coa
         return self.acquisition_value
 
     @property
@@ -243,18 +398,6 @@ class GainEntry:
             return Decimal(round(self.sale_value - self.coa, 2))
         return Decimal(0.0)
 
-    @property
-    def ltcg(self) -> Decimal:
-        if self.gain_type == GainType.LTCG:
-            return self.gain
-        return Decimal(0.0)
-
-    @property
-    def stcg(self) -> Decimal:
-        if self.gain_type == GainType.STCG:
-            return self.gain
-        return Decimal(0.0)
-
 
 def get_fund_type(transactions: List[TransactionData]) -> FundType:
     """
@@ -281,74 +424,311 @@ def get_fund_type(transactions: List[TransactionData]) -> FundType:
     )
 
 
+# `FIFOUnits.sell` keeps matching lots while at least this many units
+# are pending (compared exactly, as `Decimal >= float` does).
+_MIN_PENDING_UNITS = Fraction(1e-2)
+
+# An open lot: (purchase date, units, purchase NAV, unallocated stamp duty).
+Lot = Tuple[date, Decimal, Decimal, Decimal]
+
+
+class LotQueue:
+    """FIFO queue of purchase lots held in parallel arrays.
+
+    Units are also tracked as scaled integers: `_cum[i]` is the total of
+    the (original) units of lots ``0..i-1`` times ``10**_digits``, where
+    `_digits` grows to the most decimal places seen, so the sums are
+    exact. Together with `_used` (units already taken from the front)
+    this lets `match` find every lot a sale reaches with a single
+    `bisect` over the prefix sums instead of popping lot by lot.
+    """
+
+    def __init__(self):
+        self.dates: List[date] = []
+        self.units: List[Decimal] = []  # units still open in each lot
+        self.navs: List[Decimal] = []
+        self.taxes: List[Decimal] = []  # stamp duty not yet allocated
+        self._cum: List[int] = [0]
+        self._used = 0
+        self._digits = 0
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.dates) - self.head
+
+    def __iter__(self) -> Iterator[Lot]:
+        for idx in range(self.head, len(self.dates)):
+            yield self.dates[idx], self.units[idx], self.navs[idx], self.taxes[idx]
+
+    def _scaled(self, units: Decimal) -> int:
+        """`units` as an integer count of ``10**-_digits`` units,
+        widening the scale (and rescaling the sums) when needed."""
+        exponent = units.as_tuple().exponent
+        if exponent < -self._digits:
+            factor = 10 ** (-exponent - self._digits)
+            self._cum = [value * factor for value in self._cum]
+            self._used *= factor
+            self._digits = -exponent
+        return int(units.scaleb(self._digits))
+
+    def push(self, txn_date: date, units: Decimal, nav: Decimal, tax: Decimal):
+        scaled = self._scaled(units)
+        self.dates.append(txn_date)
+        self.units.append(units)
+        self.navs.append(nav)
+        self.taxes.append(tax)
+        self._cum.append(self._cum[-1] + scaled)
+
+    def match(self, quantity: Decimal) -> range:
+        """Indexes of the lots a sale of `quantity` units draws from, in
+        FIFO order, or None if the queue runs out first. The last lot
+        may be only partly used (see `consume`)."""
+        scaled = self._scaled(quantity)
+        scale = 10**self._digits
+        threshold = math.ceil(_MIN_PENDING_UNITS * scale)
+        if scaled < threshold:
+            return range(self.head, self.head)
+        if not self:
+            return None
+        # Lot j (after the head) is reached while the units pending
+        # before it, `scaled - (_cum[j] - _used)`, are >= threshold.
+        stop = bisect_right(
+            self._cum, self._used + scaled - threshold, self.head + 1, len(self.dates)
+        )
+        if stop == len(self.dates) and self._used + scaled - self._cum[stop] >= threshold:
+            return None
+        return range(self.head, stop)
+
+    def consume(self, stop: int, remainder: Optional[Decimal] = None, tax=None):
+        """Drop lots before `stop`; if `remainder` is given, lot
+        ``stop - 1`` stays at the front with `remainder` units and
+        `tax` unallocated stamp duty."""
+        if remainder is None:
+            self.head = stop
+            self._used = self._cum[stop]
+        else:
+            self.head = stop - 1
+            self.units[self.head] = remainder
+            self.taxes[self.head] = tax
+            self._used = self._cum[stop] - self._scaled(remainder)
+        if self.head >= 64 and self.head * 2 >= len(self.dates):
+            self._compact()
+
+    def _compact(self):
+        head = self.head
+        del self.dates[:head], self.units[:head], self.navs[:head], self.taxes[:head]
+        base = self._cum[head]
+        self._cum = [value - base for value in self._cum[head:]]
+        self._used -= base
+        self.head = 0
+
+
+# Snapshots are keyed by (folio, ISIN); the scheme name stands in for
+# a missing ISIN.
+SnapshotKey = Tuple[str, str]
+
+
+def snapshot_key(fund: Fund) -> SnapshotKey:
+    return fund.folio, fund.isin or fund.scheme
+
+
+@dataclass
+class FIFOSnapshot:
+    """Open FIFO state of one scheme after every transaction up to and
+    including `as_of`, to resume `FIFOUnits` from on a later statement."""
+
+    folio: str
+    isin: str
+    as_of: date
+    fund_type: str
+    invested: Decimal
+    balance: Decimal
+    lots: List[Lot]
+
+    @property
+    def key(self) -> SnapshotKey:
+        return self.folio, self.isin
+
+    def to_dict(self) -> dict:
+        """JSON-serialisable form; dates as ISO strings, amounts as strings."""
+        return {
+            "folio": self.folio,
+            "isin": self.isin,
+            "as_of": self.as_of.isoformat(),
+            "fund_type": self.fund_type,
+            "invested": str(self.invested),
+            "balance": str(self.balance),
+            "lots": [
+                [dt.isoformat(), str(units), str(nav), str(tax)]
+                for dt, units, nav, tax in self.lots
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FIFOSnapshot":
+        return cls(
+            folio=data["folio"],
+            isin=data["isin"],
+            as_of=date.fromisoformat(data["as_of"]),
+            fund_type=data["fund_type"],
+            invested=Decimal(data["invested"]),
+            balance=Decimal(data["balance"]),
+            lots=[
+                (date.fromisoformat(dt), Decimal(units), Decimal(nav), Decimal(tax))
+                for dt, units, nav, tax in data["lots"]
+            ],
+        )
+
+
+def _open_lot_gains(
+    fund: Fund,
+    fund_type: str,
+    lots: Iterable[Lot],
+    as_on: date,
+    nav: Decimal,
+    nav_table: Optional[Mapping[str, Optional[Decimal]]] = None,
+) -> List[GainEntry]:
+    """Unrealised gain of each open lot, as if sold at `nav` on `as_on`.
+
+    Each lot becomes a `GainEntry` (no STT, the lot's unallocated stamp
+    duty), so it is classified and valued like a realised sale.
+    """
+    fy = get_fin_year(as_on)
+    return [
+        GainEntry(
+            fy=fy,
+            fund=fund,
+            type=fund_type,
+            purchase_date=purchase_date,
+            purchase_nav=purchase_nav,
+            purchase_value=round(units * purchase_nav, 2),
+            stamp_duty=round(tax, 2),
+            sale_date=as_on,
+            sale_nav=nav,
+            sale_value=round(units * nav, 2),
+            stt=Decimal("0.00"),
+            units=units,
+            nav_table=nav_table,
+        )
+        for purchase_date, units, purchase_nav, tax in lots
+    ]
+
+
 class FIFOUnits:
     """First-In First-Out units calculator."""
 
-    def __init__(self, fund: Fund, transactions: List[TransactionData]):
+    def __init__(
+        self,
+        fund: Fund,
+        transactions: List[TransactionData],
+        nav_table: Optional[Mapping[str, Optional[Decimal]]] = None,
+        resume: Optional[FIFOSnapshot] = None,
+    ):
         """
         :param fund: name of fund, mainly for reporting purposes.
         :param transactions: list of transactions for the fund
+        :param nav_table: optional prefetched ISIN -> 31-Jan-2018 NAV map
+            handed to every `GainEntry` (see `utils.nav_table`).
+        :param resume: snapshot of an earlier run (see `snapshot`); its
+            open lots seed the queue and only transactions after its
+            `as_of` date are processed.
         """
         self._fund: Fund = fund
+        self._nav_table = nav_table
         self._original_transactions = transactions
-        if fund.type not in ("EQUITY", "DEBT"):
-            self.fund_type = get_fund_type(transactions)
-        else:
+        self._resume = resume
+        # Last date processed, in this run or the one `resume` came from.
+        self.as_of: Optional[date] = resume.as_of if resume is not None else None
+        if fund.type in ("EQUITY", "DEBT"):
             self.fund_type = getattr(FundType, fund.type)
-        self._merged_transactions = self.merge_transactions()
+        elif resume is not None and resume.fund_type != FundType.UNKNOWN.name:
+            self.fund_type = getattr(FundType, resume.fund_type)
+        else:
+            self.fund_type = get_fund_type(transactions)
+        self._days = _DailyTotals(transactions, after=resume.as_of if resume is not None else None)
 
-        self.transactions = deque()
+        self.lots = LotQueue()
         self.invested = Decimal(0.0)
         self.balance = Decimal(0.0)
+        if resume is not None:
+            for lot in resume.lots:
+                self.lots.push(*lot)
+            self.invested = resume.invested
+            self.balance = resume.balance
         self.gains: List[GainEntry] = []
 
         self.process()
 
+    @property
+    def transactions(self) -> List[Lot]:
+        """Open purchase lots, oldest first."""
+        return list(self.lots)
+
     @property
     def clean_transactions(self):
         """remove redundant transactions, without amount"""
         return filter(lambda x: x.amount is not None, self._original_transactions)
 
-    def merge_transactions(self):
+    def merge_transactions(self) -> Dict[date, MergedTransaction]:
         """Group transactions by date with taxes and investments/redemptions separated."""
-        merged_transactions = {}
-        for txn in sorted(self.clean_transactions, key=lambda x: (x.date, -x.amount)):
-            dt = txn.date
+        return {dt: self._days.merged(idx) for idx, dt in enumerate(self._days.dates)}
 
-            if isinstance(dt, str):
-                dt = dateparse(dt).date()
-
-            if dt not in merged_transactions:
-                merged_transactions[dt] = MergedTransaction(dt)
-            merged_transactions[dt].add(txn)
-        return merged_transactions
+    @property
+    def _merged_transactions(self) -> Dict[date, MergedTransaction]:
+        return self.merge_transactions()
 
     def process(self):
         self.gains = []
-        for dt in sorted(self._merged_transactions.keys()):
-            txn = self._merged_transactions[dt]
-            if txn.purchase_units > 0:
-                self.buy(dt, txn.purchase_units, txn.nav, txn.stamp_duty)
-            if txn.sale_units < 0:
-                self.sell(dt, txn.sale_units, txn.nav, txn.stt)
+        days = self._days
+        for idx, dt in enumerate(days.dates):
+            if days.purchase_units[idx] > 0:
+                self.buy(dt, days.purchase_units[idx], days.navs[idx], days.stamp_duty[idx])
+            if days.sale_units[idx] < 0:
+                self.sell(dt, days.sale_units[idx], days.navs[idx], days.stt[idx])
+            self.as_of = dt
         return self.gains
 
+    def unrealised(self, as_on: date, nav: Decimal) -> List[GainEntry]:
+        """Unrealised gains of the lots still open, valued at `nav` on `as_on`."""
+        return _open_lot_gains(
+            self._fund, self.fund_type.name, self.lots, as_on, nav, self._nav_table
+        )
+
+    def snapshot(self) -> Optional[FIFOSnapshot]:
+        """The open lots, `invested` and `balance` as of the last processed
+        date, or None if nothing has been processed yet."""
+        if self.as_of is None:
+            return None
+        return FIFOSnapshot(
+            folio=self._fund.folio,
+            isin=snapshot_key(self._fund)[1],
+            as_of=self.as_of,
+            fund_type=self.fund_type.name,
+            invested=self.invested,
+            balance=self.balance,
+            lots=self.transactions,
+        )
+
     def buy(self, txn_date: date, quantity: Decimal, nav: Decimal, tax: Decimal):
-        self.transactions.append((txn_date, quantity, nav, tax))
+        self.lots.push(txn_date, quantity, nav, tax)
         self.invested += quantity * nav
         self.balance += quantity
 
     def sell(self, sell_date: date, quantity: Decimal, nav: Decimal, tax: Decimal):
         fin_year = get_fin_year(sell_date)
         original_quantity = abs(quantity)
+        matched = self.lots.match(original_quantity)
+        if matched is None:
+            raise GainsError(f"FIFOUnits mismatch for {self._fund.name}. Please contact support.")
+        if not matched:
+            return
+        lots = self.lots
         pending_units = original_quantity
-        while pending_units >= 1e-2:
-            try:
-                purchase_date, units, purchase_nav, purchase_tax = self.transactions.popleft()
-            except IndexError:
-                raise GainsError(
-                    f"FIFOUnits mismatch for {self._fund.name}. Please contact support."
-                )
+        for idx in matched:
+            purchase_date = lots.dates[idx]
+            units = lots.units[idx]
+            purchase_nav = lots.navs[idx]
+            purchase_tax = lots.taxes[idx]
             if units <= pending_units:
                 gain_units = units
             else:
@@ -372,6 +752,7 @@ class FIFOUnits:
                 sale_value=sale_value,
                 stt=stt,
                 units=gain_units,
+                nav_table=self._nav_table,
             )
             self.gains.append(ge)
 
@@ -379,46 +760,304 @@ class FIFOUnits:
             self.invested -= purchase_value
 
             pending_units -= units
-            if pending_units < 0 and purchase_nav is not None:
-                # Sale is partially matched against the last buy transactions.
-                # Re-add the remaining units to the FIFO queue with the
-                # *unallocated* stamp-duty remainder — not the full original.
-                # Otherwise a lot consumed across N disposals would re-claim
-                # the full original stamp on every disposal, over-stating the
-                # transfer-expense deduction on Schedule 112A by a factor
-                # that grows with split depth.
-                self.transactions.appendleft(
-                    (purchase_date, -1 * pending_units, purchase_nav, purchase_tax - stamp_duty)
+
+        if pending_units < 0 and purchase_nav is not None:
+            # Sale is partially matched against the last buy transactions.
+            # Keep the remaining units at the front of the FIFO queue with
+            # the *unallocated* stamp-duty remainder — not the full original.
+            # Otherwise a lot consumed across N disposals would re-claim
+            # the full original stamp on every disposal, over-stating the
+            # transfer-expense deduction on Schedule 112A by a factor
+            # that grows with split depth.
+            lots.consume(matched.stop, -1 * pending_units, purchase_tax - stamp_duty)
+        else:
+            lots.consume(matched.stop)
+
+
+# One scheme's FIFO input (with the snapshot to resume from, if any), and
+# its outcome: ``(invested, gains, snapshot, None)`` on success or
+# ``(None, [], None, message)`` if `FIFOUnits` raised GainsError.
+_FIFOJob = Tuple[Fund, List[TransactionData], Optional[FIFOSnapshot]]
+_FIFOResult = Tuple[Optional[Decimal], List[GainEntry], Optional[FIFOSnapshot], Optional[str]]
+
+
+def _run_fifo_folio(
+    jobs: List[_FIFOJob], nav_table: Mapping[str, Optional[Decimal]]
+) -> List[_FIFOResult]:
+    """Run `FIFOUnits` for each scheme of one folio. Module-level so a
+    process pool can pickle it."""
+    results: List[_FIFOResult] = []
+    for fund, transactions, resume in jobs:
+        try:
+            fifo = FIFOUnits(fund, transactions, nav_table=nav_table, resume=resume)
+        except GainsError as exc:
+            results.append((None, [], None, str(exc)))
+        else:
+            results.append((fifo.invested, fifo.gains, fifo.snapshot(), None))
+    return results
+
+
+def _run_fifo_jobs(
+    folio_jobs: List[List[_FIFOJob]],
+    nav_table: Mapping[str, Optional[Decimal]],
+    workers: Optional[int] = 1,
+) -> List[List[_FIFOResult]]:
+    """Results for each folio's jobs, in input order.
+
+    With `workers` other than 1 (None means one per CPU) the folios are
+    spread, in chunks, over a process pool. `Executor.map` hands results
+    back in submission order, so the merge is the same as a serial run.
+    """
+    if workers == 1 or len(folio_jobs) < 2:
+        return [_run_fifo_folio(jobs, nav_table) for jobs in folio_jobs]
+    n_workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(folio_jobs) // (n_workers * 4))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(
+            pool.map(_run_fifo_folio, folio_jobs, itertools.repeat(nav_table), chunksize=chunksize)
+        )
+
+
+def _schedule_112a_rows(fund: Fund, txns: Iterable[GainEntry]) -> List[GainEntry112A]:
+    """Schedule 112A rows for one fund's equity LTCG entries of one FY."""
+    entries: List[GainEntry112A] = []  # grandfathered (1a=BE), one per txn
+    # AE-acquired lots are consolidated, but keyed on the transfer
+    # flag (1b) so a fund sold both before and on/after the
+    # 23-Jul-2024 cutoff yields one row per side (the utility
+    # taxes the two sides at different rates).
+    consolidated: dict[str, GainEntry112A] = {}
+    for txn in txns:
+        transferred = _transfer_flag(txn.sale_date)
+        if txn.purchase_date <= date(2018, 1, 31):
+            entries.append(
+                GainEntry112A(
+                    "BE",
+                    transferred,
+                    fund.isin,
+                    fund.scheme,
+                    txn.units,
+                    txn.sale_nav,
+                    txn.sale_value,
+                    txn.purchase_value,
+                    txn.fmv_nav,
+                    txn.fmv,
+                    txn.stt,
+                    txn.stamp_duty,
                 )
+            )
+        elif transferred not in consolidated:
+            consolidated[transferred] = GainEntry112A(
+                "AE",
+                transferred,
+                fund.isin,
+                fund.scheme,
+                txn.units,
+                txn.sale_nav,
+                txn.sale_value,
+                txn.purchase_value,
+                Decimal(0.0),
+                Decimal(0.0),
+                txn.stt,
+                txn.stamp_duty,
+            )
+        else:
+            ce = consolidated[transferred]
+            ce.purchase_value += txn.purchase_value
+            ce.stt += txn.stt
+            ce.stamp_duty += txn.stamp_duty
+            ce.units += txn.units
+            ce.sale_value += txn.sale_value
+            ce.sale_nav = Decimal(round(txn.sale_value / txn.units, 3))
+    return entries + list(consolidated.values())
+
+
+def _fund_key(fund: Fund) -> Tuple[str, str, str, str]:
+    """Hashable identity of a `Fund` (the dataclass itself is unhashable)."""
+    return fund.scheme, fund.folio, fund.isin, fund.type
+
+
+class _GainsIndex:
+    """Report gains sorted once by ``(fy, fund, sale_date)``, plus
+    secondary indexes into that order. Every list preserves the sorted
+    order, so consumers never re-sort or re-filter the full list."""
+
+    def __init__(self, gains: List[GainEntry]):
+        self.sorted: List[GainEntry] = sorted(gains, key=lambda x: (x.fy, x.fund, x.sale_date))
+        self.by_fy: Dict[str, List[GainEntry]] = {}
+        self.by_fund: Dict[Tuple[str, str, str, str], List[GainEntry]] = {}
+        self.by_fy_type: Dict[Tuple[str, GainType], List[GainEntry]] = {}
+        for gain in self.sorted:
+            self.by_fy.setdefault(gain.fy, []).append(gain)
+            self.by_fund.setdefault(_fund_key(gain.fund), []).append(gain)
+            self.by_fy_type.setdefault((gain.fy, gain.gain_type), []).append(gain)
+        self.fy_list: List[str] = sorted(self.by_fy, reverse=True)
 
 
 class CapitalGainsReport:
     """Generate Capital Gains Report from the parsed CAS data"""
 
-    def __init__(self, data: CASData):
+    def __init__(
+        self,
+        data: CASData,
+        workers: Optional[int] = 1,
+        resume: Optional[Mapping[SnapshotKey, FIFOSnapshot]] = None,
+    ):
+        """
+        :param data: parsed CAS data
+        :param workers: processes for the per-scheme FIFO work; 1 (the
+            default) runs it in-process, None uses one per CPU.
+        :param resume: FIFO snapshots from an earlier report (see
+            `get_snapshots`). Schemes with a snapshot resume from it and
+            only their transactions after its `as_of` date are processed,
+            so gains cover just those sales; their opening balance need
+            not be zero.
+        """
+        self._reset(data, resume)
+        self.process_data(workers=workers)
+
+    def _reset(self, data: CASData, resume: Optional[Mapping[SnapshotKey, FIFOSnapshot]] = None):
         self._data: CASData = data
         self._gains: List[GainEntry] = []
+        self._invalidate_index()
+        self._resume: Dict[SnapshotKey, FIFOSnapshot] = dict(resume or {})
+        self._snapshots: Dict[SnapshotKey, FIFOSnapshot] = dict(self._resume)
+        self._fmv_navs: Mapping[str, Optional[Decimal]] = {}
+        # (fund, FIFO state, valuation) of every scheme run in this report.
+        self._holdings: List[Tuple[Fund, FIFOSnapshot, SchemeValuation]] = []
         self.errors = []
         self.invested_amount = Decimal(0.0)
         self.current_value = Decimal(0.0)
-        self.process_data()
+
+    @classmethod
+    def batch(
+        cls,
+        datas: Iterable[CASData],
+        workers: Optional[int] = 1,
+        resumes: Optional[Iterable[Optional[Mapping[SnapshotKey, FIFOSnapshot]]]] = None,
+    ) -> List["CapitalGainsReport"]:
+        """Build one report per CAS in `datas` (e.g. a family or a whole
+        client book), with one NAV prefetch for all of them and, when
+        `workers` asks for it, every folio's FIFO work spread over one
+        process pool. Reports come back in input order and match
+        building each with ``CapitalGainsReport(data)``.
+
+        :param workers: pool size; 1 (the default) runs in-process, None
+            uses one per CPU.
+        :param resumes: optional snapshots to resume from, one mapping
+            (or None) per CAS in `datas`.
+        """
+        datas = list(datas)
+        resumes = list(resumes) if resumes is not None else [None] * len(datas)
+        reports = []
+        for data, resume in zip(datas, resumes):
+            report = cls.__new__(cls)
+            report._reset(data, resume)
+            reports.append(report)
+        fmv_navs = nav_table(isin for report in reports for isin in report._fifo_isins())
+        for report in reports:
+            report._fmv_navs = fmv_navs
+        planned = [report._folio_jobs() for report in reports]
+        results = _run_fifo_jobs(
+            [jobs for folio_jobs, _ in planned for jobs in folio_jobs], fmv_navs, workers
+        )
+        offset = 0
+        for report, (folio_jobs, values) in zip(reports, planned):
+            report._gains = []
+            report._invalidate_index()
+            report._add_results(folio_jobs, values, results[offset : offset + len(folio_jobs)])
+            offset += len(folio_jobs)
+        return reports
+
+    @property
+    def _index(self) -> _GainsIndex:
+        """The gains index, built on first use and kept until
+        `_invalidate_index`."""
+        index = self.__dict__.get("_gains_index")
+        if index is None:
+            index = self._gains_index = _GainsIndex(self._gains)
+        return index
+
+    def _invalidate_index(self):
+        """Drop the gains index; called wherever `_gains` is assigned or extended."""
+        self.__dict__.pop("_gains_index", None)
 
     @property
     def gains(self) -> List[GainEntry]:
-        return list(sorted(self._gains, key=lambda x: (x.fy, x.fund, x.sale_date)))
+        return list(self._index.sorted)
 
     def has_gains(self) -> bool:
-        return len(self.gains) > 0
+        return len(self._gains) > 0
 
     def has_error(self) -> bool:
         return len(self.errors) > 0
 
     def get_fy_list(self) -> List[str]:
-        return list(sorted(set([f.fy for f in self.gains]), reverse=True))
-
-    def process_data(self):
-        self._gains = []
+        return list(self._index.fy_list)
+
+    def get_fy_gains(self, fy: str, gain_type: Optional[GainType] = None) -> List[GainEntry]:
+        """Gains realised in `fy` (optionally only `gain_type`), in report order."""
+        if gain_type is None:
+            return list(self._index.by_fy.get(fy, []))
+        return list(self._index.by_fy_type.get((fy, gain_type), []))
+
+    def get_fund_gains(self, fund: Fund) -> List[GainEntry]:
+        """All gains realised on `fund`, in report order."""
+        return list(self._index.by_fund.get(_fund_key(fund), []))
+
+    def get_snapshots(self) -> Dict[SnapshotKey, FIFOSnapshot]:
+        """FIFO state of every scheme, keyed by `snapshot_key`, to resume a
+        later report from. Schemes without new transactions (or whose FIFO
+        run failed) keep the snapshot they were resumed from."""
+        return dict(self._snapshots)
+
+    def get_unrealised(self) -> List[GainEntry]:
+        """Unrealised gain of every open lot, valued at its scheme's
+        `valuation.nav` and classified as if sold on the valuation date.
+
+        Reads the lots left in each scheme's FIFO queue, so it costs one
+        walk over the open lots rather than a second replay. Schemes
+        whose type is neither known nor inferable from a sale (e.g. a
+        buy-only scheme of type ``N/A``) can't be classified; they are
+        skipped and recorded in `errors`.
+        """
+        unrealised = self.__dict__.get("_unrealised")
+        if unrealised is None:
+            unrealised = self._unrealised = []
+            for fund, state, as_on, nav in self._valued_holdings():
+                if state.lots and state.fund_type not in LTCG_HOLDING_YEARS:
+                    self.errors.append(
+                        (fund.name, f"Cannot value open lots of {fund.name}; unknown fund type.")
+                    )
+                    continue
+                unrealised.extend(
+                    _open_lot_gains(fund, state.fund_type, state.lots, as_on, nav, self._fmv_navs)
+                )
+        return list(unrealised)
+
+    def _valued_holdings(self) -> Iterator[Tuple[Fund, FIFOSnapshot, date, Decimal]]:
+        """(fund, FIFO state, valuation date, valuation NAV) per scheme run."""
+        for fund, state, valuation in self._holdings:
+            as_on = valuation.date
+            if isinstance(as_on, str):
+                as_on = dateparse(as_on).date()
+            nav = valuation.nav
+            if isinstance(nav, float):
+                nav = Decimal(str(nav))
+            yield fund, state, as_on, nav
+
+    def _fifo_isins(self) -> Iterator[str]:
         for folio in self._data.folios:
+            for scheme in folio.schemes:
+                resumed = (folio.folio, scheme.isin or scheme.scheme) in self._resume
+                if scheme.transactions or resumed:
+                    yield scheme.isin
+
+    def _folio_jobs(self) -> Tuple[List[List[_FIFOJob]], List[SchemeValuation]]:
+        """FIFO jobs grouped by folio, plus each scheme's valuation."""
+        folio_jobs: List[List[_FIFOJob]] = []
+        values: List[SchemeValuation] = []
+        for folio in self._data.folios:
+            jobs: List[_FIFOJob] = []
             for scheme in folio.schemes:
                 transactions = scheme.transactions
                 fund = Fund(
@@ -427,24 +1066,55 @@ class CapitalGainsReport:
                     isin=scheme.isin,
                     type=scheme.type,
                 )
-                if len(transactions) > 0:
-                    if scheme.open >= 0.01:
+                resume = self._resume.get(snapshot_key(fund))
+                # A resumed scheme runs even without new transactions, to
+                # carry its open lots into `get_unrealised`.
+                if len(transactions) > 0 or resume is not None:
+                    if resume is None and scheme.open >= 0.01:
                         raise IncompleteCASError(
                             "Incomplete CAS found. For gains computation, "
                             "all folios should have zero opening balance"
                         )
-                    try:
-                        fifo = FIFOUnits(fund, transactions)
-                        self.invested_amount += fifo.invested
-                        self.current_value += scheme.valuation.value
-                        self._gains.extend(fifo.gains)
-                    except GainsError as exc:
-                        self.errors.append((fund.name, str(exc)))
+                    jobs.append((fund, transactions, resume))
+                    values.append(scheme.valuation)
+            folio_jobs.append(jobs)
+        return folio_jobs, values
+
+    def _add_results(
+        self,
+        folio_jobs: List[List[_FIFOJob]],
+        values: List[SchemeValuation],
+        results: List[List[_FIFOResult]],
+    ):
+        jobs = itertools.chain.from_iterable(folio_jobs)
+        outcomes = itertools.chain.from_iterable(results)
+        for (fund, *_), value, (invested, gains, state, error) in zip(jobs, values, outcomes):
+            if error is not None:
+                self.errors.append((fund.name, error))
+                continue
+            self.invested_amount += invested
+            self.current_value += value.value
+            self._gains.extend(gains)
+            self._invalidate_index()
+            if state is not None:
+                self._snapshots[state.key] = state
+                self._holdings.append((fund, state, value))
+
+    def process_data(self, workers: Optional[int] = 1):
+        self._gains = []
+        self._invalidate_index()
+        self._holdings = []
+        self.__dict__.pop("_unrealised", None)
+        # Grandfathering NAVs for every fund, loaded in one DB session
+        # rather than one connect per realised lot.
+        fmv_navs = self._fmv_navs = nav_table(self._fifo_isins())
+        folio_jobs, values = self._folio_jobs()
+        self._add_results(folio_jobs, values, _run_fifo_jobs(folio_jobs, fmv_navs, workers))
 
     def get_summary(self):
         """Calculate capital gains summary"""
         summary = []
-        for (fy, fund), txns in itertools.groupby(self.gains, key=lambda x: (x.fy, x.fund)):
+        for (fy, fund), txns in itertools.groupby(self._index.sorted, key=lambda x: (x.fy, x.fund)):
             ltcg = stcg = ltcg_taxable = Decimal(0.0)
             for txn in txns:
                 ltcg += txn.ltcg
@@ -487,7 +1157,7 @@ class CapitalGainsReport:
         with io.StringIO() as csv_fp:
             writer = csv.writer(csv_fp)
             writer.writerow(headers)
-            for gain in self.gains:
+            for gain in self._index.sorted:
                 writer.writerow(
                     [
                         gain.fy,
@@ -511,73 +1181,80 @@ class CapitalGainsReport:
             csv_data = csv_fp.read()
             return csv_data
 
-    def generate_112a(self, fy) -> List[GainEntry112A]:
-        fy_transactions = sorted(
-            list(
-                filter(
-                    lambda x: x.fy == fy
-                    and x.fund.type == "EQUITY"
-                    and x.gain_type == GainType.LTCG,
-                    self.gains,
+    def get_unrealised_csv_data(self) -> str:
+        """Return lot-wise unrealised gains as a csv string."""
+        headers = [
+            "FY",
+            "Fund",
+            "ISIN",
+            "Type",
+            "Units",
+            "Purchase Date",
+            "Purchase Value",
+            "Stamp Duty",
+            "Acquisition Value",
+            "Valuation Date",
+            "Market Value",
+            "LTCG",
+            "LTCG Taxable",
+            "STCG",
+        ]
+        with io.StringIO() as csv_fp:
+            writer = csv.writer(csv_fp)
+            writer.writerow(headers)
+            for gain in self.get_unrealised():
+                writer.writerow(
+                    [
+                        gain.fy,
+                        gain.fund.name,
+                        gain.fund.isin,
+                        gain.type,
+                        gain.units,
+                        gain.purchase_date,
+                        gain.purchase_value,
+                        gain.stamp_duty,
+                        gain.coa,
+                        gain.sale_date,
+                        gain.sale_value,
+                        gain.ltcg,
+                        gain.ltcg_taxable,
+                        gain.stcg,
+                    ]
                 )
-            ),
-            key=lambda x: x.fund,
-        )
+            csv_fp.seek(0)
+            csv_data = csv_fp.read()
+            return csv_data
+
+    def generate_112a(self, fy) -> List[GainEntry112A]:
+        # Already in (fund, sale_date) order within the FY.
+        fy_transactions = [
+            x
+            for x in self._index.by_fy_type.get((fy, GainType.LTCG), [])
+            if x.fund.type == "EQUITY"
+        ]
         rows: List[GainEntry112A] = []
         for fund, txns in itertools.groupby(fy_transactions, key=lambda x: x.fund):
-            entries: List[GainEntry112A] = []  # grandfathered (1a=BE), one per txn
-            # AE-acquired lots are consolidated, but keyed on the transfer
-            # flag (1b) so a fund sold both before and on/after the
-            # 23-Jul-2024 cutoff yields one row per side (the utility
-            # taxes the two sides at different rates).
-            consolidated: dict[str, GainEntry112A] = {}
-            for txn in txns:
-                transferred = _transfer_flag(txn.sale_date)
-                if txn.purchase_date <= date(2018, 1, 31):
-                    entries.append(
-                        GainEntry112A(
-                            "BE",
-                            transferred,
-                            fund.isin,
-                            fund.scheme,
-                            txn.units,
-                            txn.sale_nav,
-                            txn.sale_value,
-                            txn.purchase_value,
-                            txn.fmv_nav,
-                            txn.fmv,
-                            txn.stt,
-                            txn.stamp_duty,
-                        )
-                    )
-                elif transferred not in consolidated:
-                    consolidated[transferred] = GainEntry112A(
-                        "AE",
-                        transferred,
-                        fund.isin,
-                        fund.scheme,
-                        txn.units,
-                        txn.sale_nav,
-                        txn.sale_value,
-                        txn.purchase_value,
-                        Decimal(0.0),
-                        Decimal(0.0),
-                        txn.stt,
-                        txn.stamp_duty,
-                    )
-                else:
-                    ce = consolidated[transferred]
-                    ce.purchase_value += txn.purchase_value
-                    ce.stt += txn.stt
-                    ce.stamp_duty += txn.stamp_duty
-                    ce.units += txn.units
-                    ce.sale_value += txn.sale_value
-                    ce.sale_nav = Decimal(round(txn.sale_value / txn.units, 3))
-            rows.extend(entries)
-            rows.extend(consolidated.values())
+            rows.extend(_schedule_112a_rows(fund, txns))
         return rows
 
-    def generate_112a_csv_data(self, fy):
+    def generate_112a_all(self) -> Dict[str, List[GainEntry112A]]:
+        """`generate_112a` for every FY of `get_fy_list` (in that order)
+        that has equity LTCG, grouping all LTCG by (FY, fund) in a single
+        pass over the gains. FYs without any 112A rows are left out."""
+        rows: Dict[str, List[GainEntry112A]] = {fy: [] for fy in self._index.fy_list}
+        ltcg = (
+            x
+            for x in self._index.sorted
+            if x.gain_type == GainType.LTCG and x.fund.type == "EQUITY"
+        )
+        for (fy, fund), txns in itertools.groupby(ltcg, key=lambda x: (x.fy, x.fund)):
+            rows[fy].extend(_schedule_112a_rows(fund, txns))
+        return {fy: fy_rows for fy, fy_rows in rows.items() if fy_rows}
+
+    def write_112a_csv(self, fp: TextIO, fy: str, rows: Optional[List[GainEntry112A]] = None):
+        """Write the schedule 112A CSV for `fy` to the text stream `fp`,
+        row by row. Pass `rows` (e.g. from `generate_112a_all`) to skip
+        regenerating them."""
         # Schedule 112A column 1b ("Share/Unit Transferred") was added on the
         # AY 2025-26 (FY 2024-25) utility for the 23-Jul-2024 LTCG-regime
         # split. Emit it only from FY2024-25 onward so older returns keep
@@ -601,30 +1278,31 @@ class CapitalGainsReport:
         ]
         if with_transfer_col:
             headers.insert(1, "Share/Unit Transferred(1b)")
-        with io.StringIO() as csv_fp:
-            writer = csv.writer(csv_fp)
-            writer.writerow(headers)
+        writer = csv.writer(fp)
+        writer.writerow(headers)
+
+        for row in rows if rows is not None else self.generate_112a(fy):
+            values = [
+                row.acquired,
+                row.isin,
+                row.name,
+                str(row.units),
+                str(row.sale_nav),
+                str(row.sale_value),
+                str(row.actual_coa),
+                str(row.purchase_value),
+                str(row.consideration_value),
+                str(row.fmv_nav),
+                str(row.fmv),
+                str(row.expenditure),
+                str(row.deductions),
+                str(row.balance),
+            ]
+            if with_transfer_col:
+                values.insert(1, row.transferred)
+            writer.writerow(values)
 
-            for row in self.generate_112a(fy):
-                values = [
-                    row.acquired,
-                    row.isin,
-                    row.name,
-                    str(row.units),
-                    str(row.sale_nav),
-                    str(row.sale_value),
-                    str(row.actual_coa),
-                    str(row.purchase_value),
-                    str(row.consideration_value),
-                    str(row.fmv_nav),
-                    str(row.fmv),
-                    str(row.expenditure),
-                    str(row.deductions),
-                    str(row.balance),
-                ]
-                if with_transfer_col:
-                    values.insert(1, row.transferred)
-                writer.writerow(values)
-            csv_fp.seek(0)
-            csv_data = csv_fp.read()
-            return csv_data
+    def generate_112a_csv_data(self, fy):
+        with io.StringIO() as csv_fp:
+            self.write_112a_csv(csv_fp, fy)
+            return csv_fp.getvalue()
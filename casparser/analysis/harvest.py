@@ -0,0 +1,231 @@
+"""Tax-harvesting queries over a scheme's open FIFO lots.
+
+`HarvestSimulator` answers "what gain does selling U units on date D
+realise" and "how many units can be sold before taxable LTCG crosses G"
+without replaying the scheme's transactions through `FIFOUnits` for
+every hypothetical sale.
+
+The open lots are kept with prefix sums of their units and the dates
+each lot turns long-term. The per-lot sale value, gain and taxable LTCG
+at a given NAV are computed once (per NAV and financial year) with the
+same `GainEntry` rules a realised sale uses, and kept as prefix sums
+too. Each query is then a couple of bisects plus one `GainEntry` for
+the partly sold lot.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from decimal import ROUND_FLOOR, Decimal
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from casparser.exceptions import GainsError
+
+from .gains import LTCG_HOLDING_YEARS, FIFOSnapshot, Fund, GainEntry, Lot, LotQueue, SnapshotKey
+from .utils import add_years, get_fin_year
+
+if TYPE_CHECKING:
+    from .gains import CapitalGainsReport
+
+# Granularity of the units returned by `HarvestSimulator.units_for_gain`.
+UNIT_STEP = Decimal("0.001")
+
+
+@dataclass
+class HarvestResult:
+    """Outcome of a simulated FIFO redemption."""
+
+    units: Decimal
+    sale_value: Decimal
+    ltcg: Decimal
+    ltcg_taxable: Decimal
+    stcg: Decimal
+
+
+class _PricedLots:
+    """Prefix sums of every open lot, sold in full at one NAV."""
+
+    def __init__(self, entries: List[GainEntry]):
+        self.sale_value = [Decimal(0)]
+        self.gain = [Decimal(0)]
+        self.taxable = [Decimal(0)]
+        # Running maximum of `taxable`, so "first prefix above G" bisects.
+        self.taxable_max = [Decimal(0)]
+        for entry in entries:
+            self.sale_value.append(self.sale_value[-1] + entry.sale_value)
+            self.gain.append(self.gain[-1] + entry.gain)
+            taxable = Decimal(round(entry.sale_value - entry.coa, 2))
+            self.taxable.append(self.taxable[-1] + taxable)
+            self.taxable_max.append(max(self.taxable_max[-1], self.taxable[-1]))
+
+
+class HarvestSimulator:
+    """What-if FIFO redemptions from one scheme's open lots.
+
+    :param fund: the scheme, for classification and grandfathering.
+    :param fund_type: ``EQUITY`` or ``DEBT`` (see `FIFOUnits.fund_type`).
+    :param lots: open lots, oldest first (see `FIFOSnapshot.lots`).
+    :param nav: default NAV to sell at.
+    :param as_on: default sale date.
+    :param nav_table: optional prefetched 31-Jan-2018 NAVs (see `GainEntry`).
+    :raises ValueError: if `fund_type` has no LTCG holding period.
+    """
+
+    def __init__(
+        self,
+        fund: Fund,
+        fund_type: str,
+        lots: Iterable[Lot],
+        nav: Optional[Decimal] = None,
+        as_on: Optional[date] = None,
+        nav_table=None,
+    ):
+        if fund_type not in LTCG_HOLDING_YEARS:
+            raise ValueError(
+                f"Cannot simulate sales of {fund.name}: unknown fund type {fund_type!r}"
+            )
+        self.fund = fund
+        self.fund_type = fund_type
+        self.nav = nav
+        self.as_on = as_on
+        self._nav_table = nav_table
+        self._queue = LotQueue()
+        for lot in lots:
+            self._queue.push(*lot)
+        self.lots: List[Lot] = list(self._queue)
+        years = LTCG_HOLDING_YEARS[fund_type]
+        # A lot sold after `_ltcg_from[i]` is long-term; non-decreasing
+        # because lots are in purchase order.
+        self._ltcg_from = [add_years(lot[0], years) for lot in self.lots]
+        self._units = [Decimal(0)]
+        for lot in self.lots:
+            self._units.append(self._units[-1] + lot[1])
+        self._priced: Dict[Tuple[Decimal, str], _PricedLots] = {}
+
+    @classmethod
+    def from_snapshot(
+        cls, fund: Fund, snapshot: FIFOSnapshot, nav=None, as_on=None, nav_table=None
+    ) -> "HarvestSimulator":
+        return cls(fund, snapshot.fund_type, snapshot.lots, nav, as_on, nav_table)
+
+    @classmethod
+    def from_report(cls, report: "CapitalGainsReport") -> Dict[SnapshotKey, "HarvestSimulator"]:
+        """One simulator per scheme of `report`, defaulting to the
+        scheme's valuation NAV and date (see `get_unrealised`). Schemes
+        of unknown type (no LTCG holding period) are left out."""
+        simulators = {}
+        for fund, state, as_on, nav in report._valued_holdings():
+            if state.fund_type not in LTCG_HOLDING_YEARS:
+                continue
+            simulators[state.key] = cls.from_snapshot(fund, state, nav, as_on, report._fmv_navs)
+        return simulators
+
+    @property
+    def total_units(self) -> Decimal:
+        return self._units[-1]
+
+    def _args(self, sale_date: Optional[date], nav: Optional[Decimal]) -> Tuple[date, Decimal]:
+        sale_date = sale_date if sale_date is not None else self.as_on
+        nav = nav if nav is not None else self.nav
+        if sale_date is None or nav is None:
+            raise ValueError("sale_date and nav are required without simulator defaults")
+        return sale_date, nav
+
+    def _entry(self, idx: int, units: Decimal, sale_date: date, nav: Decimal) -> GainEntry:
+        """`GainEntry` for selling `units` of lot `idx`, as `FIFOUnits.sell` builds it."""
+        purchase_date, lot_units, purchase_nav, tax = self.lots[idx]
+        return GainEntry(
+            fy=get_fin_year(sale_date),
+            fund=self.fund,
+            type=self.fund_type,
+            purchase_date=purchase_date,
+            purchase_nav=purchase_nav,
+            purchase_value=round(units * purchase_nav, 2),
+            stamp_duty=round(tax * units / lot_units, 2),
+            sale_date=sale_date,
+            sale_nav=nav,
+            sale_value=round(units * nav, 2),
+            stt=Decimal("0.00"),
+            units=units,
+            nav_table=self._nav_table,
+        )
+
+    def _priced_lots(self, sale_date: date, nav: Decimal) -> _PricedLots:
+        # Cost of acquisition depends on the sale date only via its FY.
+        key = (nav, get_fin_year(sale_date))
+        priced = self._priced.get(key)
+        if priced is None:
+            entries = [
+                self._entry(idx, lot[1], sale_date, nav) for idx, lot in enumerate(self.lots)
+            ]
+            priced = self._priced[key] = _PricedLots(entries)
+        return priced
+
+    def _long_term_lots(self, sale_date: date) -> int:
+        """Number of leading lots that are long-term on `sale_date`."""
+        return bisect_left(self._ltcg_from, sale_date)
+
+    def gain(
+        self, units: Decimal, sale_date: Optional[date] = None, nav: Optional[Decimal] = None
+    ) -> HarvestResult:
+        """Gains realised by redeeming `units` (FIFO) at `nav` on
+        `sale_date`, matching what `FIFOUnits` would record (before STT)."""
+        sale_date, nav = self._args(sale_date, nav)
+        units = Decimal(units)
+        matched = self._queue.match(units)
+        if matched is None:
+            raise GainsError(f"Cannot redeem {units} units of {self.fund.name}; not enough held.")
+        priced = self._priced_lots(sale_date, nav)
+        stop = matched.stop
+        partial = None
+        if stop and self._units[stop] > units:
+            stop -= 1
+            partial = self._entry(stop, units - self._units[stop], sale_date, nav)
+        split = min(stop, self._long_term_lots(sale_date))
+        result = HarvestResult(
+            units=self._units[stop],
+            sale_value=priced.sale_value[stop],
+            ltcg=priced.gain[split],
+            ltcg_taxable=priced.taxable[split],
+            stcg=priced.gain[stop] - priced.gain[split],
+        )
+        if partial is not None:
+            result.units += partial.units
+            result.sale_value += partial.sale_value
+            result.ltcg += partial.ltcg
+            result.ltcg_taxable += partial.ltcg_taxable
+            result.stcg += partial.stcg
+        return result
+
+    def units_for_gain(
+        self, target: Decimal, sale_date: Optional[date] = None, nav: Optional[Decimal] = None
+    ) -> Decimal:
+        """Most units that can be redeemed (FIFO) at `nav` on `sale_date`
+        while taxable LTCG stays within `target` at every step, in
+        multiples of `UNIT_STEP`. Never reaches into short-term lots."""
+        sale_date, nav = self._args(sale_date, nav)
+        priced = self._priced_lots(sale_date, nav)
+        long_term = self._long_term_lots(sale_date)
+        # First prefix of long-term lots whose taxable LTCG exceeds target.
+        crossing = bisect_right(priced.taxable_max, target, 0, long_term + 1)
+        if crossing == 0:
+            return Decimal(0)
+        if crossing > long_term:
+            return self._units[long_term]
+        idx = crossing - 1
+        room = target - priced.taxable[idx]
+        lot_units = self.lots[idx][1]
+        lot_taxable = priced.taxable[crossing] - priced.taxable[idx]
+        units = (lot_units * room / lot_taxable).quantize(UNIT_STEP, rounding=ROUND_FLOOR)
+        units = min(max(units, Decimal(0)), lot_units)
+        # Per-lot rounding and grandfathering can nudge the linear
+        # estimate either way; settle it against the exact entry.
+        while units > 0 and self._entry(idx, units, sale_date, nav).ltcg_taxable > room:
+            units -= UNIT_STEP
+        while units + UNIT_STEP <= lot_units and (
+            self._entry(idx, units + UNIT_STEP, sale_date, nav).ltcg_taxable <= room
+        ):
+            units += UNIT_STEP
+        return self._units[idx] + units
@@ -2,7 +2,7 @@ import re
 from collections import UserDict
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
 from casparser_isin import MFISINDb
 
@@ -41,6 +41,16 @@ class _CII(UserDict):
         self.years = list(sorted(self.data.keys()))
         self._min_year = self.years[0]
         self._max_year = self.years[-1]
+        # Integer index keyed by the FY's starting year ("FY2001-02" -> 2001).
+        self._by_start = {int(fy[2:6]): value for fy, value in self.data.items()}
+        self._min_start = min(self._by_start)
+        self._max_start = max(self._by_start)
+
+    def for_year(self, start_year: int) -> int:
+        """CII of the FY starting in `start_year` (see `fin_year_start`),
+        clamped to the first / last notified FY like string lookups."""
+        year = min(max(start_year, self._min_start), self._max_start)
+        return self._by_start[year]
 
     def __missing__(self, key):
         if not re.search(r"FY\d{4}-\d{2,4}", key):
@@ -60,6 +70,29 @@ def nav_search(isin: str) -> Optional[Decimal]:
         return db.nav_lookup(isin)
 
 
+def nav_table(isins: Iterable[str]) -> Dict[str, Optional[Decimal]]:
+    """Map each ISIN to its 31-Jan-2018 NAV (see `nav_search`) in a single
+    DB session. Falsy ISINs are skipped; unknown ones map to None."""
+    unique = {isin for isin in isins if isin}
+    if not unique:
+        return {}
+    with MFISINDb() as db:
+        return {isin: db.nav_lookup(isin) for isin in unique}
+
+
+def add_years(dt: date, years: int) -> date:
+    """`dt + relativedelta(years=years)`: 29-Feb clamps to 28-Feb."""
+    try:
+        return dt.replace(year=dt.year + years)
+    except ValueError:
+        return dt.replace(year=dt.year + years, day=28)
+
+
+def fin_year_start(dt: date) -> int:
+    """Calendar year in which the financial year containing `dt` starts."""
+    return dt.year if dt.month > 3 else dt.year - 1
+
+
 def get_fin_year(dt: date):
     """Get financial year representation."""
     if dt.month > 3:
@@ -403,7 +403,7 @@ def save_gains_112a(capital_gains: CapitalGainsReport, fy, output_path):
     fy_list = capital_gains.get_fy_list()
     if fy == "ASK":
         fy = Prompt.ask("Enter FY year: ", choices=fy_list, default=fy_list[0])
-    else:
+    elif fy != "ALL":
         if fy.upper() not in fy_list:
             console.print(
                 f"[bold red]Warning:[/] No capital gains found for {fy}. "
@@ -411,12 +411,22 @@ def save_gains_112a(capital_gains: CapitalGainsReport, fy, output_path):
             )
             return
     base_path, ext = os.path.splitext(output_path)
-    csv_data = capital_gains.generate_112a_csv_data(fy.upper())
-    fname = f"{base_path}-{fy}-gains-112a.csv"
+    all_years = fy == "ALL"
+    if all_years:
+        fy_rows = capital_gains.generate_112a_all()
+        skipped = [x for x in fy_list if x not in fy_rows]
+        if skipped:
+            console.print(f"No equity LTCG (112a) for {', '.join(skipped)}; skipped.")
+    else:
+        fy_rows = {fy: None}
 
-    with open(fname, "w", newline="", encoding="utf-8") as fp:
-        fp.write(csv_data)
-        console.print(f"gains report (112a) saved : [bold]{fname}[/]")
+    for fy, rows in fy_rows.items():
+        fname = f"{base_path}-{fy}-gains-112a.csv"
+        with open(fname, "w", newline="", encoding="utf-8") as fp:
+            capital_gains.write_112a_csv(fp, fy, rows)
+            console.print(f"gains report (112a) saved : [bold]{fname}[/]")
+    if all_years and fy_rows:
+        console.print(f"gains report (112a) written for: [bold]{', '.join(fy_rows)}[/]")
 
 
 @click.command(name="casparser", context_settings=CONTEXT_SETTINGS)
@@ -451,9 +461,9 @@ def save_gains_112a(capital_gains: CapitalGainsReport, fy, output_path):
 @click.option(
     "--gains-112a",
     help="Generate Capital Gains Report - 112A format for a financial year - "
-    "Use 'ask' for a prompt from available options (BETA)",
+    "Use 'ask' for a prompt from available options, 'all' for every year (BETA)",
     default="",
-    metavar="ask|FY2020-21",
+    metavar="ask|all|FY2020-21",
 )
 @click.option(
     "--force-pdfminer", is_flag=True, help="Force PDFMiner parser even if MuPDF is detected"
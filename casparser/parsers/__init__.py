@@ -30,6 +30,7 @@ from casparser.types import CASData, NSDLCASData
 
 from .detect import _open_document, detect_cas_type, detect_file_type
 from .utils import cas2csv, cas2json
+from .walk import DocumentWalk
 
 
 def _sort_transactions(data: CASData) -> CASData:
@@ -143,8 +144,12 @@ def read_cas_pdf(
     # `data` is plain pydantic models holding no pdfium references, so it
     # is safe to return after the document is closed.
     doc = _open_document(filename, password)
+    # One page walk shared by detection, the issuer parser and the
+    # investor extractor: each page (and its text page) is loaded once
+    # and its raw text / lines / atoms computed at most once.
+    walk = DocumentWalk(doc)
     try:
-        file_type = detect_file_type(filename, password, _doc=doc)
+        file_type = detect_file_type(filename, password, _walk=walk)
         if file_type == FileType.UNKNOWN:
             raise CASParseError(
                 "Could not identify the CAS issuer. Supported issuers are "
@@ -152,7 +157,7 @@ def read_cas_pdf(
             )
 
         if file_type in (FileType.CAMS, FileType.KFINTECH):
-            cas_type = detect_cas_type(filename, password, _doc=doc)
+            cas_type = detect_cas_type(filename, password, _walk=walk)
             if cas_type == CASFileType.DETAILED:
                 from . import cams_detailed
 
@@ -160,7 +165,7 @@ def read_cas_pdf(
                     filename,
                     password,
                     file_type=file_type,
-                    _doc=doc,
+                    _walk=walk,
                 )
             elif cas_type == CASFileType.SUMMARY:
                 from . import cams_summary
@@ -169,7 +174,7 @@ def read_cas_pdf(
                     filename,
                     password,
                     file_type=file_type,
-                    _doc=doc,
+                    _walk=walk,
                 )
             else:
                 raise CASParseError(
@@ -185,7 +190,7 @@ def read_cas_pdf(
                 filename,
                 password,
                 file_type=FileType.NSDL,
-                _doc=doc,
+                _walk=walk,
             )
         elif file_type == FileType.CDSL:
             from . import cdsl
@@ -194,7 +199,7 @@ def read_cas_pdf(
                 filename,
                 password,
                 file_type=FileType.CDSL,
-                _doc=doc,
+                _walk=walk,
             )
         else:  # pragma: no cover — handled above
             raise CASParseError(f"Unsupported file type: {file_type}")
@@ -21,11 +21,14 @@ from typing import TYPE_CHECKING, List, Optional
 from casparser.exceptions import CASParseError
 from casparser.types import InvestorInfo
 
-from .pageobj import Atom, extract_atoms
+from .pageobj import Atom
+from .walk import get_walk
 
 if TYPE_CHECKING:  # pragma: no cover
     import pypdfium2 as pdfium
 
+    from .walk import DocumentWalk
+
 
 # Top-left column cutoffs. Everything to the right is the disclaimer
 # paragraph (CAMS/KFin) or the cover-page banner (NSDL/CDSL). 200 is
@@ -40,6 +43,25 @@ _PINCODE_RE = re.compile(r"^\s*(?:Pin\s*code|PINCODE)\s*:\s*\d+", re.I)
 _ID_MARKER_RE = re.compile(r"^\s*(?:CAS|NSDL)\s*ID\s*:", re.I)
 
 
+def _page_atoms(
+    pdf_path,
+    password,
+    index: int,
+    _doc: "Optional[pdfium.PdfDocument]",
+    _walk: "Optional[DocumentWalk]",
+    _atoms: Optional[List[List[Atom]]],
+) -> List[Atom]:
+    """Atoms of the 0-based page `index`, or `[]` if the PDF is shorter.
+
+    Only that one page is walked — the investor block never lives
+    anywhere else, so there is no reason to touch the rest of the
+    document here."""
+    if _atoms is not None:
+        return _atoms[index] if len(_atoms) > index else []
+    walk = get_walk(pdf_path, password, _doc=_doc, _walk=_walk)
+    return walk.page(index).atoms if len(walk) > index else []
+
+
 def _left_column_atoms(atoms: List[Atom]) -> List[Atom]:
     """Filter to atoms in the top-left column, sorted top-down."""
     filtered = [a for a in atoms if a.x_left < _LEFT_COLUMN_X and a.text.strip()]
@@ -52,6 +74,7 @@ def extract_cams_kfin_investor(
     password,
     *,
     _doc: "Optional[pdfium.PdfDocument]" = None,
+    _walk: "Optional[DocumentWalk]" = None,
     _atoms: Optional[List[List[Atom]]] = None,
 ) -> InvestorInfo:
     """Read the investor block from the top-left of page 1.
@@ -75,20 +98,11 @@ def extract_cams_kfin_investor(
     find it we raise `CASParseError` — a CAS without identifiable
     investor is malformed, not a "missing field" case.
 
-    `_doc` / `_atoms`: dispatcher-provided overrides to avoid a
-    second pypdfium2 open + page-object walk when the caller has
-    already extracted atoms for the holdings parser.
+    `_doc` / `_walk` / `_atoms`: dispatcher-provided overrides to avoid
+    a second pypdfium2 open + page-object walk when the caller has
+    already loaded the page (or extracted atoms for the holdings parser).
     """
-    pages = (
-        _atoms
-        if _atoms is not None
-        else extract_atoms(
-            pdf_path,
-            password,
-            _doc=_doc,
-        )
-    )
-    block = _left_column_atoms(pages[0]) if pages else []
+    block = _left_column_atoms(_page_atoms(pdf_path, password, 0, _doc, _walk, _atoms))
 
     email = ""
     mobile = ""
@@ -135,6 +149,7 @@ def extract_nsdl_cdsl_investor(
     password,
     *,
     _doc: "Optional[pdfium.PdfDocument]" = None,
+    _walk: "Optional[DocumentWalk]" = None,
     _atoms: Optional[List[List[Atom]]] = None,
 ) -> InvestorInfo:
     """NSDL / CDSL print the investor block on page 2 (after the cover
@@ -147,19 +162,10 @@ def extract_nsdl_cdsl_investor(
     Raises `CASParseError` if no investor block is found — a CAS
     without identifiable investor is malformed.
 
-    `_doc` / `_atoms`: dispatcher-provided overrides; see
+    `_doc` / `_walk` / `_atoms`: dispatcher-provided overrides; see
     `extract_cams_kfin_investor`.
     """
-    pages = (
-        _atoms
-        if _atoms is not None
-        else extract_atoms(
-            pdf_path,
-            password,
-            _doc=_doc,
-        )
-    )
-    block = _left_column_atoms(pages[1]) if len(pages) >= 2 else []
+    block = _left_column_atoms(_page_atoms(pdf_path, password, 1, _doc, _walk, _atoms))
 
     name = ""
     address_lines: List[str] = []
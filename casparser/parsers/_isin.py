@@ -1,7 +1,12 @@
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from casparser_isin import ISINDb, MFISINDb
 
+# `(scheme_name, rta, rta_code, isin)` — the arguments of `isin_search`.
+SchemeKey = Tuple[str, str, str, Optional[str]]
+# `(ISIN, AMFI, type)` — what `isin_search` returns.
+SchemeMeta = Tuple[Optional[str], Optional[str], Optional[str]]
+
 
 def isin_search(
     scheme_name: str,
@@ -24,22 +29,77 @@ def isin_search(
     :param isin: Optional ISIN hint pulled from the scheme header.
     """
     with MFISINDb() as db:
+        return _scheme_lookup(db, scheme_name, rta, rta_code, isin)
+
+
+def _scheme_lookup(
+    db: MFISINDb,
+    scheme_name: str,
+    rta: str,
+    rta_code: str,
+    isin: Optional[str] = None,
+) -> SchemeMeta:
+    """`isin_search` against an already-open `MFISINDb` session."""
+    try:
+        scheme_data = db.isin_lookup(scheme_name, rta, rta_code, isin=isin)
+        return scheme_data.isin, scheme_data.amfi_code, scheme_data.type
+    except ValueError:
+        pass
+    if isin:
         try:
-            scheme_data = db.isin_lookup(scheme_name, rta, rta_code, isin=isin)
-            return scheme_data.isin, scheme_data.amfi_code, scheme_data.type
-        except ValueError:
+            rows = db.direct_isin_lookup(isin)
+            if rows:
+                row = rows[0]
+                return row["isin"], row["amfi_code"], row["type"]
+        except (ValueError, KeyError, TypeError):
             pass
-        if isin:
-            try:
-                rows = db.direct_isin_lookup(isin)
-                if rows:
-                    row = rows[0]
-                    return row["isin"], row["amfi_code"], row["type"]
-            except (ValueError, KeyError, TypeError):
-                pass
     return None, None, None
 
 
+class ISINResolver:
+    """Deferred, deduplicated :func:`isin_search` for one CAMS/KFin parse.
+
+    Parsers :meth:`request` a lookup for each scheme as they build it,
+    with a callback that writes the result back onto the scheme, and
+    call :meth:`resolve` once at the end. Identical lookup keys are
+    resolved once and every lookup runs in a single ``MFISINDb``
+    session — the CAS-side counterpart of :func:`batch_isin_metadata`,
+    instead of one DB connect per scheme.
+    """
+
+    def __init__(self):
+        self._pending: Dict[SchemeKey, List[Callable[[SchemeMeta], None]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def request(
+        self,
+        scheme_name: str,
+        rta: str,
+        rta_code: str,
+        isin: Optional[str] = None,
+        *,
+        on_result: Callable[[SchemeMeta], None],
+    ) -> None:
+        """Queue a lookup; `on_result` receives its `(ISIN, AMFI, type)`
+        when :meth:`resolve` runs."""
+        self._pending.setdefault((scheme_name, rta, rta_code, isin), []).append(on_result)
+
+    def resolve(self) -> Dict[SchemeKey, SchemeMeta]:
+        """Run every queued lookup in one DB session, fire the callbacks
+        in request order per key, and return the results by key."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return {}
+        with MFISINDb() as db:
+            results = {key: _scheme_lookup(db, *key) for key in pending}
+        for key, callbacks in pending.items():
+            for on_result in callbacks:
+                on_result(results[key])
+        return results
+
+
 def batch_isin_metadata(
     isins: Iterable[str],
 ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
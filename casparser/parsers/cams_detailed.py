@@ -10,7 +10,7 @@ Handles:
   Amount / Units / Price / Unit Balance)
 - "Opening Unit Balance", "Closing Unit Balance", "NAV on", "Valuation on"
   labeled rows
-- ISIN / AMFI enrichment (via `_isin.isin_search`), nominees, Total Cost
+- ISIN / AMFI enrichment (batched via `_isin.ISINResolver`), nominees, Total Cost
   Value, and investor info / statement period
 
 Known limitations:
@@ -22,9 +22,11 @@ Known limitations:
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import List, Optional
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterator, List, Optional
 
 from dateutil import parser as dateparse
 
@@ -40,8 +42,9 @@ from casparser.types import (
 
 from ._classify import get_parsed_scheme_name, get_transaction_type
 from ._investor import extract_cams_kfin_investor
-from ._isin import isin_search
-from .extract import Char, Line, extract_pages
+from ._isin import ISINResolver, SchemeMeta, isin_search
+from .extract import Line, iter_pages
+from .walk import get_walk
 
 # -----------------------------------------------------------------------------
 # Column anchors
@@ -80,21 +83,9 @@ class Column:
 
 
 def _words_on_line(line: Line, min_gap: float = 1.5) -> List[tuple[str, float, float]]:
-    """Return [(text, x0, x1)] words on a line, splitting on x-gap > min_gap."""
-    cs = sorted(line.chars, key=lambda c: c.x0)
-    words = []
-    cur, cur_x0, cur_x1 = "", None, None
-    for c in cs:
-        if cur and (c.x0 - cur_x1) > min_gap:
-            words.append((cur, cur_x0, cur_x1))
-            cur = ""
-        if not cur:
-            cur_x0 = c.x0
-        cur += c.text
-        cur_x1 = c.x1
-    if cur:
-        words.append((cur, cur_x0, cur_x1))
-    return words
+    """Return [(text, x0, x1)] words on a line, splitting on x-gap > min_gap.
+    Cached on the line, so sliding header windows don't re-segment."""
+    return line.words(min_gap)
 
 
 HEADER_WINDOW_Y = 15.0  # vertical span (pts) that constitutes one logical
@@ -103,6 +94,43 @@ HEADER_WINDOW_Y = 15.0  # vertical span (pts) that constitutes one logical
 # /(INR)/Balance at bottom).
 
 
+def _header_windows(
+    lines: List[Line],
+    start_idx: int,
+    labels: set[str],
+    words_of: Callable[[Line], List[tuple[str, float, float]]] = _words_on_line,
+) -> Iterator[tuple[int, int, Dict[str, int]]]:
+    """Slide the header window down the page, one start line at a time.
+
+    Yields ``(first, stop, counts)``: the window is ``lines[first:stop]``
+    — line `first` plus every following line within ``HEADER_WINDOW_Y``
+    of its baseline — and `counts` maps each header label in it to its
+    number of occurrences (only while the generator is suspended; it is
+    updated in place). Line baselines strictly decrease down the page,
+    so the window's far edge only ever moves forward: each line's words
+    are added once and removed once, instead of re-collecting the whole
+    window for every start line.
+    """
+    counts: Dict[str, int] = {}
+    stop = start_idx
+    for first in range(start_idx, len(lines)):
+        top = lines[first].baseline
+        while stop < len(lines) and (
+            stop == first or top - lines[stop].baseline <= HEADER_WINDOW_Y
+        ):
+            for w in words_of(lines[stop]):
+                if w[0] in labels:
+                    counts[w[0]] = counts.get(w[0], 0) + 1
+            stop += 1
+        yield first, stop, counts
+        for w in words_of(lines[first]):
+            if w[0] in labels:
+                if counts[w[0]] == 1:
+                    del counts[w[0]]
+                else:
+                    counts[w[0]] -= 1
+
+
 def detect_txn_columns(
     lines: List[Line], start_idx: int
 ) -> Optional[tuple[int, int, List[Column]]]:
@@ -118,24 +146,28 @@ def detect_txn_columns(
     header window. Transaction parsing should start at last_line_index + 1;
     the [first, last] span is excluded from the scheme-header region buffer.
     """
-    for i in range(start_idx, len(lines)):
-        window = [lines[i]]
-        for j in range(i + 1, len(lines)):
-            if lines[i].baseline - lines[j].baseline > HEADER_WINDOW_Y:
-                break
-            window.append(lines[j])
-
-        all_words: List[tuple[str, float, float]] = []
-        for line in window:
-            all_words.extend(_words_on_line(line))
-        labels = {w[0] for w in all_words if w[0] in TXN_HEADER_LABELS}
-        if len(labels) < TXN_MIN_HITS:
-            continue
-        last_idx = i + len(window) - 1
-        return i, last_idx, _build_columns(all_words)
+    for first, stop, counts in _header_windows(lines, start_idx, TXN_HEADER_LABELS):
+        if len(counts) >= TXN_MIN_HITS:
+            words = [w for line in lines[first:stop] for w in _words_on_line(line)]
+            return first, stop - 1, list(_template_columns(_header_fingerprint(words)))
     return None
 
 
+def _header_fingerprint(words: List[tuple[str, float, float]]) -> tuple:
+    """The header words `_build_columns` actually looks at, in order —
+    label text plus exact x-extent. Identical across pages rendered from
+    the same statement template."""
+    return tuple(w for w in words if w[0] in TXN_HEADER_LABELS or w[0] in ALIGN)
+
+
+@lru_cache(maxsize=64)
+def _template_columns(fingerprint: tuple) -> tuple[Column, ...]:
+    """`_build_columns` memoised per header template, so a statement
+    that repeats one header on every page builds its columns once.
+    The cached `Column`s are shared; treat them as read-only."""
+    return tuple(_build_columns(list(fingerprint)))
+
+
 def _build_columns(words: List[tuple[str, float, float]]) -> List[Column]:
     """Map header words to Columns. Merge "Unit"+"Balance" into one column."""
     cols: List[Column] = []
@@ -185,34 +217,63 @@ def _column_ranges(columns: List[Column]) -> List[tuple[Column, float, float]]:
     return ranges
 
 
+class ColumnLayout:
+    """Column x-ranges compiled into a sorted boundary array.
+
+    The half-open ``[lo, hi)`` ranges from `_column_ranges` (or the
+    SUMMARY variant) may overlap or leave gaps; a char belongs to the
+    *first* range, in range order, that contains its x-midpoint. Cutting
+    the axis at every range edge gives elementary segments that each
+    resolve to one fixed owner, so placing a char is a single `bisect`
+    instead of a scan over every range. Compile once per page (or per
+    inherited header) and reuse it for every row.
+    """
+
+    __slots__ = ("labels", "bounds", "owners")
+
+    def __init__(self, ranges: List[tuple[Column, float, float]]):
+        # Output keys follow the ranges' label order, one slot per label.
+        slot_of: dict[str, int] = {}
+        for col, _, _ in ranges:
+            slot_of.setdefault(col.label, len(slot_of))
+        self.labels: List[str] = list(slot_of)
+        self.bounds: List[float] = sorted({b for _, lo, hi in ranges if lo < hi for b in (lo, hi)})
+        # owners[k] = slot owning [bounds[k], bounds[k+1]); the open
+        # segment past the last edge is unowned.
+        self.owners: List[Optional[int]] = []
+        for seg_lo in self.bounds[:-1]:
+            owner = None
+            for col, lo, hi in ranges:
+                if lo <= seg_lo < hi:
+                    owner = slot_of[col.label]
+                    break
+            self.owners.append(owner)
+        self.owners.append(None)
+
+    def assign(self, line: Line) -> dict[str, str]:
+        """Bucket each char into a column by x-midpoint and render each
+        cell left to right (see `GlyphStore.render`)."""
+        store = line.store
+        xs0, xs1 = store.x0, store.x1
+        bounds, owners = self.bounds, self.owners
+        cells: List[List[int]] = [[] for _ in self.labels]
+        # Glyphs come left to right, so each cell's ids are already in
+        # render order.
+        for g in line.glyphs:
+            k = bisect_right(bounds, (xs0[g] + xs1[g]) / 2) - 1
+            if k >= 0 and (slot := owners[k]) is not None:
+                cells[slot].append(g)
+        return {label: store.render(ids).strip() for label, ids in zip(self.labels, cells) if ids}
+
+
 def assign_cells(line: Line, columns: List[Column]) -> dict[str, str]:
     """Bucket each char into a column by x-midpoint, then render each cell
     text in left-to-right order. Overlay duplicates are already filtered
-    upstream by ``extract.extract_pages`` at the atom level."""
-    ranges = _column_ranges(columns)
-    cells: dict[str, list[Char]] = {c.label: [] for c in columns}
-    for ch in line.chars:
-        x_mid = (ch.x0 + ch.x1) / 2
-        for col, lo, hi in ranges:
-            if lo <= x_mid < hi:
-                cells[col.label].append(ch)
-                break
-    out = {}
-    for label, chars in cells.items():
-        if not chars:
-            continue
-        chars.sort(key=lambda c: c.x0)
-        heights = sorted(c.h for c in chars)
-        h_med = heights[len(heights) // 2]
-        gap = max(1.5, 0.6 * h_med)
-        parts, prev_x1 = [], None
-        for c in chars:
-            if prev_x1 is not None and (c.x0 - prev_x1) > gap:
-                parts.append(" ")
-            parts.append(c.text)
-            prev_x1 = c.x1
-        out[label] = "".join(parts).strip()
-    return out
+    upstream by ``extract.extract_pages`` at the atom level.
+
+    One-off form of ``ColumnLayout(_column_ranges(columns)).assign(line)``;
+    `parse` compiles the layout once per page instead."""
+    return ColumnLayout(_column_ranges(columns)).assign(line)
 
 
 # -----------------------------------------------------------------------------
@@ -281,6 +342,8 @@ AMC_RE = re.compile(
 # regex anchors only at start so it survives stray trailing chars
 # (e.g. KFin's instalment number "1" leaking from the description column).
 DATE_CELL_RE = re.compile(r"^\s*(\d{1,2}[-\s]*[A-Za-z]{3}[-\s]*\d{4})")
+# Lowercase endings an `AMC_RE` match must have.
+_AMC_SUFFIXES = ("mf", "fund", "house")
 
 
 def _decimal(s: str) -> Optional[Decimal]:
@@ -532,7 +595,9 @@ def _region_candidate(buf: List[str]) -> Optional[tuple[List[str], int, List[int
 
 
 def _build_scheme_from_buffer(
-    buf: List[str], statement_period: Optional[StatementPeriod]
+    buf: List[str],
+    statement_period: Optional[StatementPeriod],
+    resolver: Optional[ISINResolver] = None,
 ) -> Optional[Scheme]:
     """Build a :class:`Scheme` from an accumulated scheme-header region.
 
@@ -558,6 +623,10 @@ def _build_scheme_from_buffer(
     no scheme line or no ``Registrar`` evidence (every known template
     carries the label somewhere in the header; without it a ``<code>-``
     line is a footnote, not a scheme).
+
+    With a `resolver`, the ISIN / AMFI / type lookup is queued on it and
+    filled in when the caller runs ``resolver.resolve()``; otherwise it
+    is looked up immediately.
     """
     cand = _region_candidate(buf)
     if cand is None:
@@ -601,7 +670,6 @@ def _build_scheme_from_buffer(
     else:
         label_m = SCHEME_HEAD_RTA_RE.search(header_text)
         rta = (label_m.group(1).strip() if label_m else "") or "CAMS"
-    isin, amfi, scheme_type = isin_search(name, rta, code, isin=inline_isin)
     # Nominees are matched per region line, not on the joined blob, because
     # NOMINEE_RE is `$`-anchored — the nominee text must sit at end-of-line.
     nominees: List[str] = []
@@ -614,14 +682,14 @@ def _build_scheme_from_buffer(
             ]
             nominees = [n for n in noms if n]
             break
-    return Scheme(
+    scheme = Scheme(
         scheme=name,
         advisor=advisor,
         rta=rta,
         rta_code=code,
-        isin=isin,
-        amfi=amfi,
-        type=scheme_type or "N/A",
+        isin=None,
+        amfi=None,
+        type="N/A",
         nominees=nominees,
         open=Decimal(0),
         close=Decimal(0),
@@ -633,6 +701,16 @@ def _build_scheme_from_buffer(
         ),
         transactions=[],
     )
+    if resolver is None:
+        _apply_isin_meta(scheme, isin_search(name, rta, code, isin=inline_isin))
+    else:
+        resolver.request(name, rta, code, inline_isin, on_result=partial(_apply_isin_meta, scheme))
+    return scheme
+
+
+def _apply_isin_meta(scheme: Scheme, meta: SchemeMeta) -> None:
+    scheme.isin, scheme.amfi, scheme_type = meta
+    scheme.type = scheme_type or "N/A"
 
 
 def _abandoned_region_warning(buf: List[str], where: str) -> Optional[str]:
@@ -662,8 +740,16 @@ def parse(
     file_type: FileType = FileType.UNKNOWN,
     *,
     _doc=None,
+    _walk=None,
 ) -> CASData:
-    pages = extract_pages(pdf_path, password, _doc=_doc)
+    # One page walk feeds the line extractor and the investor extractor
+    # (and, via the dispatcher, the issuer / statement-type detection
+    # that already loaded page 1). Pages are streamed and released as
+    # the loop moves on, so the investor block — which reads page 1's
+    # atoms — is extracted before the walk gets past it.
+    walk = get_walk(pdf_path, password, _doc=_doc, _walk=_walk)
+    investor_info = extract_cams_kfin_investor(pdf_path, password, _walk=walk)
+    pages = iter_pages(pdf_path, password, _walk=walk)
 
     statement_period: Optional[StatementPeriod] = None
     # Keyed by (amc, folio_no): folio numbers are RTA-scoped, not globally
@@ -674,6 +760,7 @@ def parse(
     current_folio: Optional[Folio] = None
     current_scheme: Optional[Scheme] = None
     last_columns: List[Column] = []  # inherited if current page lacks header
+    last_layout: Optional[ColumnLayout] = None
 
     # Scheme-header region accumulator. The header is the only part of the
     # grammar that wraps unpredictably; everything else (folio line, Opening
@@ -690,28 +777,40 @@ def parse(
     # balance reconciliation extends the list afterwards.
     parse_warnings: List[str] = []
 
+    # Scheme ISIN / AMFI lookups are queued while parsing and resolved
+    # together, in one DB session, once the document is done.
+    resolver = ISINResolver()
+
     for page in pages:
         header_pos = detect_txn_columns(page.lines, 0)
         if header_pos:
             col_first, header_idx, columns = header_pos
             last_columns = columns
+            last_layout = ColumnLayout(_column_ranges(columns)) if columns else None
         else:
             # Continuation page — no header. Inherit from previous.
             # header_idx=-1 means transactions can start from line 0; the
             # empty [col_first, header_idx] window then excludes nothing.
             col_first = header_idx = -1
             columns = last_columns
+        layout = last_layout
 
         for i, line in enumerate(page.lines):
             text = line.text
+            # Literal prefilter: every anchor regex below is
+            # case-insensitive and needs its keyword in the line, so a
+            # lowercase substring test decides which of them can match.
+            # Plain transaction rows — the vast majority — contain none
+            # of the keywords and skip the regex cascade entirely.
+            low = text.lower()
 
             # --- statement period (first page only) ---
-            if statement_period is None:
+            if statement_period is None and "to" in low:
                 if m := STMT_PERIOD_RE.search(text):
                     statement_period = StatementPeriod(from_=m.group(1), to=m.group(2))
 
             # --- AMC ---
-            if m := AMC_RE.match(text.strip()):
+            if low.rstrip().endswith(_AMC_SUFFIXES) and (m := AMC_RE.match(text.strip())):
                 current_amc = m.group(0)
                 # An AMC boundary ends any dangling header region —
                 # loudly, if it still held an unconsumed scheme line.
@@ -748,9 +847,11 @@ def parse(
 
             # --- Opening Unit Balance: closes the scheme-header region and
             #     builds the scheme from the accumulated buffer. ---
-            if m := OPEN_BAL_RE.search(text):
+            if "opening" in low and (m := OPEN_BAL_RE.search(text)):
                 if header_active:
-                    current_scheme = _build_scheme_from_buffer(header_buf, statement_period)
+                    current_scheme = _build_scheme_from_buffer(
+                        header_buf, statement_period, resolver
+                    )
                     if current_scheme is not None:
                         current_folio.schemes.append(current_scheme)
                     else:
@@ -781,23 +882,28 @@ def parse(
             #     `_build_scheme_from_buffer`. ---
             consumed_footer = False
             if current_scheme is not None:
-                if m := CLOSE_BAL_RE.search(text):
+                has_inr = "inr" in low
+                if "closing" in low and (m := CLOSE_BAL_RE.search(text)):
                     current_scheme.close = _decimal(m.group(1)) or Decimal(0)
                     header_buf = []
                     header_active = True
                     consumed_footer = True
-                if m := NAV_RE.search(text):
+                if has_inr and "nav" in low and (m := NAV_RE.search(text)):
                     current_scheme.valuation.date = dateparse.parse(m.group(1)).date()
                     current_scheme.valuation.nav = _decimal(m.group(2)) or Decimal(0)
                     consumed_footer = True
-                if m := VALUATION_RE.search(text):
+                if (
+                    has_inr
+                    and ("valuation" in low or "market" in low)
+                    and (m := VALUATION_RE.search(text))
+                ):
                     current_scheme.valuation.date = dateparse.parse(m.group(1)).date()
                     current_scheme.valuation.value = _decimal(m.group(2)) or Decimal(0)
                     consumed_footer = True
-                if m := COST_VALUE_RE.search(text):
+                if "cost" in low and (m := COST_VALUE_RE.search(text)):
                     current_scheme.valuation.cost = _decimal(m.group(1))
                     consumed_footer = True
-                if not header_active and (m := NOMINEE_RE.search(text)):
+                if not header_active and "nominee" in low and (m := NOMINEE_RE.search(text)):
                     noms = [
                         (m.group("n1") or "").strip(),
                         (m.group("n2") or "").strip(),
@@ -822,7 +928,7 @@ def parse(
             # --- Transaction row (only when we have columns AND we're past
             #     the header block on this page) ---
             if columns and header_idx is not None and i > header_idx:
-                cells = assign_cells(line, columns)
+                cells = layout.assign(line)
                 date_str = cells.get("Date", "").strip()
                 desc = cells.get("Transaction", "").strip()
                 m_date = DATE_CELL_RE.match(date_str)
@@ -879,6 +985,7 @@ def parse(
     # (the statement's own checksum) and surface any discontinuity as a
     # non-fatal warning — the cheapest possible signal for the otherwise
     # silent "a row was dropped / mis-parsed" failure mode.
+    resolver.resolve()
     for folio in folios.values():
         for scheme in folio.schemes:
             _apply_balance_sign_fix(scheme)
@@ -887,7 +994,7 @@ def parse(
     return CASData(
         statement_period=statement_period or StatementPeriod(**{"from": "", "to": ""}),
         folios=list(folios.values()),
-        investor_info=extract_cams_kfin_investor(pdf_path, password, _doc=_doc),
+        investor_info=investor_info,
         cas_type=CASFileType.DETAILED,
         file_type=file_type,
         parse_warnings=parse_warnings,
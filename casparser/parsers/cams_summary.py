@@ -19,6 +19,7 @@ from __future__ import annotations
 
 import re
 from decimal import Decimal
+from functools import partial
 from typing import List, Optional
 
 from dateutil import parser as dateparse
@@ -33,9 +34,10 @@ from casparser.types import (
 )
 
 from ._investor import extract_cams_kfin_investor
-from ._isin import isin_search
-from .cams_detailed import AMC_RE, Column, _decimal
-from .extract import Char, Line, extract_pages
+from ._isin import ISINResolver, SchemeMeta
+from .cams_detailed import AMC_RE, Column, ColumnLayout, _decimal, _header_windows
+from .extract import Line, iter_pages
+from .walk import get_walk
 
 # -----------------------------------------------------------------------------
 # Column anchors
@@ -99,25 +101,7 @@ def _words_on_line(line: Line, min_gap: float = 1.5) -> List[tuple[str, float, f
     """Split a line into words by x-gap OR by literal whitespace chars.
     CAMS SUMMARY header inserts an actual ' ' Char between "Folio" and
     "No.", so x-gap alone won't separate them."""
-    cs = sorted(line.chars, key=lambda c: c.x0)
-    words = []
-    cur, cur_x0, cur_x1 = "", None, None
-    for c in cs:
-        if c.text.isspace():
-            if cur:
-                words.append((cur, cur_x0, cur_x1))
-                cur = ""
-            continue
-        if cur and (c.x0 - cur_x1) > min_gap:
-            words.append((cur, cur_x0, cur_x1))
-            cur = ""
-        if not cur:
-            cur_x0 = c.x0
-        cur += c.text
-        cur_x1 = c.x1
-    if cur:
-        words.append((cur, cur_x0, cur_x1))
-    return words
+    return line.words(min_gap, split_on_space=True)
 
 
 def detect_summary_columns(lines: List[Line], start_idx: int) -> Optional[tuple[int, List[Column]]]:
@@ -127,20 +111,12 @@ def detect_summary_columns(lines: List[Line], start_idx: int) -> Optional[tuple[
 
     Returns (index_of_last_line_in_header, ordered columns).
     """
-    for i in range(start_idx, len(lines)):
-        window = [lines[i]]
-        for j in range(i + 1, len(lines)):
-            if lines[i].baseline - lines[j].baseline > HEADER_WINDOW_Y:
-                break
-            window.append(lines[j])
-
-        words: List[tuple[str, float, float]] = []
-        for ln in window:
-            words.extend(_words_on_line(ln))
-        labels = {w[0] for w in words if w[0] in SUMMARY_HEADER_LABELS}
-        if len(labels) >= SUMMARY_MIN_HITS and "Folio" in labels and "Scheme" in labels:
-            last_idx = i + len(window) - 1
-            return last_idx, _build_summary_columns(words)
+    for first, stop, counts in _header_windows(
+        lines, start_idx, SUMMARY_HEADER_LABELS, words_of=_words_on_line
+    ):
+        if len(counts) >= SUMMARY_MIN_HITS and "Folio" in counts and "Scheme" in counts:
+            words = [w for ln in lines[first:stop] for w in _words_on_line(ln)]
+            return stop - 1, _build_summary_columns(words)
     return None
 
 
@@ -220,30 +196,9 @@ def _summary_column_ranges(columns: List[Column]) -> List[tuple[Column, float, f
 
 
 def assign_summary_cells(line: Line, columns: List[Column]) -> dict[str, str]:
-    ranges = _summary_column_ranges(columns)
-    cells: dict[str, list[Char]] = {c.label: [] for c in columns}
-    for ch in line.chars:
-        x_mid = (ch.x0 + ch.x1) / 2
-        for col, lo, hi in ranges:
-            if lo <= x_mid < hi:
-                cells[col.label].append(ch)
-                break
-    out = {}
-    for label, chars in cells.items():
-        if not chars:
-            continue
-        chars.sort(key=lambda c: c.x0)
-        heights = sorted(c.h for c in chars)
-        h_med = heights[len(heights) // 2]
-        gap = max(1.5, 0.6 * h_med)
-        parts, prev_x1 = [], None
-        for c in chars:
-            if prev_x1 is not None and (c.x0 - prev_x1) > gap:
-                parts.append(" ")
-            parts.append(c.text)
-            prev_x1 = c.x1
-        out[label] = "".join(parts).strip()
-    return out
+    """One-off form of ``ColumnLayout(_summary_column_ranges(columns)).assign(line)``;
+    `parse` compiles the layout once per page instead."""
+    return ColumnLayout(_summary_column_ranges(columns)).assign(line)
 
 
 # -----------------------------------------------------------------------------
@@ -272,14 +227,30 @@ SCHEME_LOOKS_LIKE_DATA = re.compile(r"^\s*[A-Z0-9][\w\s]{1,15}\s*-\s*\S")
 SUMMARY_TOTAL_RE = re.compile(r"^\s*(?:grand\s+|sub\s+|portfolio\s+)?total\b", re.I)
 
 
+def _apply_isin_meta(scheme: Scheme, meta: SchemeMeta) -> None:
+    """Write a resolved lookup onto a SUMMARY scheme, keeping the ISIN
+    read from the statement when the DB has no match."""
+    resolved_isin, scheme.amfi, scheme_type = meta
+    scheme.isin = resolved_isin or scheme.isin
+    scheme.type = scheme_type or "N/A"
+
+
 def parse(
     pdf_path: str,
     password: str,
     file_type: FileType = FileType.UNKNOWN,
     *,
     _doc=None,
+    _walk=None,
 ) -> CASData:
-    pages = extract_pages(pdf_path, password, _doc=_doc)
+    # One page walk feeds the line extractor and the investor extractor
+    # (and, via the dispatcher, the issuer / statement-type detection
+    # that already loaded page 1). Pages are streamed and released as
+    # the loop moves on, so the investor block — which reads page 1's
+    # atoms — is extracted before the walk gets past it.
+    walk = get_walk(pdf_path, password, _doc=_doc, _walk=_walk)
+    investor_info = extract_cams_kfin_investor(pdf_path, password, _walk=walk)
+    pages = iter_pages(pdf_path, password, _walk=walk)
 
     statement_date: Optional[str] = None
     folios: dict[str, Folio] = {}
@@ -287,15 +258,21 @@ def parse(
     current_folio: Optional[Folio] = None
     current_scheme: Optional[Scheme] = None
     last_columns: List[Column] = []
+    last_layout: Optional[ColumnLayout] = None
+    # ISIN / AMFI lookups are queued per scheme row and resolved in one
+    # DB session after the last page.
+    resolver = ISINResolver()
 
     for page in pages:
         header_pos = detect_summary_columns(page.lines, 0)
         if header_pos:
             header_idx, columns = header_pos
             last_columns = columns
+            last_layout = ColumnLayout(_summary_column_ranges(columns)) if columns else None
         else:
             header_idx = -1
             columns = last_columns
+        layout = last_layout
 
         for i, line in enumerate(page.lines):
             text = line.text
@@ -313,7 +290,7 @@ def parse(
             if not columns or header_idx is None or i <= header_idx:
                 continue
 
-            cells = assign_summary_cells(line, columns)
+            cells = layout.assign(line)
             folio_cell = cells.get("Folio", "").strip()
             # Some PDFs have folio "/0" suffix overflowing into the ISIN
             # column. Folios can also bleed into ISIN if very long. Use
@@ -417,20 +394,14 @@ def parse(
                     nav_date = dateparse.parse("1970-01-01").date()
 
                 rta_for_lookup = rta_cell or "CAMS"
-                resolved_isin, amfi, scheme_type = isin_search(
-                    name,
-                    rta_for_lookup,
-                    code,
-                    isin=isin,
-                )
                 current_scheme = Scheme(
                     scheme=name,
                     advisor=None,
                     rta=rta_for_lookup,
                     rta_code=code,
-                    isin=resolved_isin or isin,
-                    amfi=amfi,
-                    type=scheme_type or "N/A",
+                    isin=isin,
+                    amfi=None,
+                    type="N/A",
                     open=balance,
                     close=balance,
                     close_calculated=balance,
@@ -443,12 +414,20 @@ def parse(
                     transactions=[],
                 )
                 current_folio.schemes.append(current_scheme)
+                resolver.request(
+                    name,
+                    rta_for_lookup,
+                    code,
+                    isin,
+                    on_result=partial(_apply_isin_meta, current_scheme),
+                )
                 continue
 
             if is_continuation:
                 # Append the wrap text to the previous scheme's name.
                 current_scheme.scheme = (current_scheme.scheme + " " + scheme_cell).strip()
 
+    resolver.resolve()
     return CASData(
         statement_period=(
             StatementPeriod(from_=statement_date, to=statement_date)
@@ -456,7 +435,7 @@ def parse(
             else StatementPeriod(**{"from": "", "to": ""})
         ),
         folios=list(folios.values()),
-        investor_info=extract_cams_kfin_investor(pdf_path, password, _doc=_doc),
+        investor_info=investor_info,
         cas_type=CASFileType.SUMMARY,
         file_type=file_type,
     )
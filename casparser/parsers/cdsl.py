@@ -32,6 +32,7 @@ font-aware extractor and are out of scope here.
 
 from __future__ import annotations
 
+import itertools
 import re
 from decimal import Decimal, InvalidOperation
 from typing import Dict, List, Optional, Tuple
@@ -48,7 +49,8 @@ from casparser.types import (
 
 from . import pageobj
 from ._investor import extract_nsdl_cdsl_investor
-from .pageobj import Block
+from .pageobj import KIND_LABEL, KIND_ROW, Block, ColumnMap, PageBlocks
+from .walk import get_walk
 
 # --- patterns ---
 
@@ -97,6 +99,49 @@ SECTION_BOID_RE = re.compile(
     re.I | re.S,
 )
 
+# Section headings that follow the last holdings table. Once every
+# roster account's section has started and no holdings table is open,
+# a label matching one of these in full ends the holdings walk; nothing
+# after it is parsed. Full matches only, so a "Notes:" label or a
+# footer disclaimer inside a section never does.
+_TRAILER_RE = re.compile(r"notes|glossary|about cdsl|disclaimer")
+
+# `unvisited` stand-in for the MF-folios pseudo-account, which has no
+# `(type, dp_id, client_id)` key.
+_MF_FOLIOS_KEY = ("MF", "", "")
+
+
+# --- header-compiled column maps ---
+#
+# Holdings rows are decoded through a `pageobj.ColumnMap` compiled from
+# the table's column-header row, so each cell is placed by its x-band
+# instead of re-scanning the row with `_looks_numeric`. Rows the map
+# can't decode fall back to the positional rules in the row parsers.
+_EQUITY_COLUMNS = (
+    ("num_shares", ("current bal",)),
+    ("price", ("market price",)),
+    ("value", ("value",)),
+)
+_MF_COLUMNS = (
+    ("isin", ("isin",)),
+    ("folio", ("folio",)),
+    ("balance", ("closing bal", "units")),
+    ("nav", ("nav",)),
+    ("invested", ("invested", "total cost")),
+    ("value", ("value",)),
+    ("pnl", ("profit",)),
+    ("return", ("return",)),
+)
+_MF_REQUIRED = ("isin", "folio", "balance", "nav", "value")
+
+
+def _compile_columns(mode: Optional[str], header: Block) -> Optional[ColumnMap]:
+    if mode == "equities":
+        return ColumnMap.compile(header, _EQUITY_COLUMNS)
+    if mode == "mf_holdings":
+        return ColumnMap.compile(header, _MF_COLUMNS, _MF_REQUIRED)
+    return None
+
 
 # --- decimal helpers ---
 
@@ -132,6 +177,10 @@ def _looks_numeric(text: str) -> bool:
     return bool(NUMERIC_RE.match(s))
 
 
+def _numeric_or_dash(text: str) -> bool:
+    return _looks_numeric(text) or text.strip() in ("--", "-")
+
+
 # --- account key utilities ---
 
 
@@ -166,9 +215,12 @@ def parse_cdsl(
     file_type: FileType = FileType.CDSL,
     *,
     _doc=None,
+    _walk=None,
 ) -> NSDLCASData:
-    atoms = pageobj.extract_atoms(pdf_path, password, _doc=_doc)
-    blocks = pageobj.blocks_from_atoms(atoms)
+    # Pages are clustered lazily; the notes / glossary pages after the
+    # last account's holdings are never extracted (see `_TRAILER_RE`).
+    walk = get_walk(pdf_path, password, _doc=_doc, _walk=_walk)
+    blocks = pageobj.blocks_from_walk(walk)
     period = _find_period(blocks) or StatementPeriod(**{"from": "", "to": ""})
 
     # Phase 1: account roster from page 2 summary.
@@ -177,11 +229,9 @@ def parse_cdsl(
     mf_folios_account: Optional[DematAccount] = None
     pending_owners: List[DematOwner] = []
 
-    for b in blocks:
-        if b.page != 2:
-            continue
+    for b in blocks.page(2):
         txt = b.text()
-        ltxt = txt.lower()
+        ltxt = b.ltext
         if "in the single name of" in ltxt or "in the joint name" in ltxt:
             pending_owners = []
             continue
@@ -209,18 +259,18 @@ def parse_cdsl(
     # Phase 2: scheme-code → (ISIN, UCC, folio, name) map from the
     # descriptive MF blocks that follow the roster page. Their page
     # span depends on how many MF folios the investor holds; we
-    # bound-scan from page 3 up to the start of the per-account
-    # transaction section (detected via the `BO ID :` / `DPID :`
-    # marker), and only consume blocks that match the descriptive
+    # bound-scan from page 3 up to the first per-account section
+    # header (either `DP Name :` form) or, failing that, a trailer
+    # heading, and only consume blocks that match the descriptive
     # template (Scheme Name + Scheme Code + ISIN + UCC).
     scheme_meta: Dict[str, Dict[str, str]] = {}
     pending_scheme: Dict[str, str] = {}
-    for b in blocks:
-        if b.page < 3:
-            continue
-        if SECTION_BOID_RE.search(b.text()):
-            break
+    for b in itertools.chain.from_iterable(blocks.iter_pages(3)):
         txt = b.text()
+        if "dp" in b.ltext and (SECTION_BOID_RE.search(txt) or SECTION_DPC_RE.search(txt)):
+            break
+        if b.kind == KIND_LABEL and _TRAILER_RE.fullmatch(b.ltext.strip()):
+            break
         if "Scheme Name :" in txt and "Scheme Code :" in txt:
             sm = re.search(
                 r"Scheme\s*Name\s*:\s*(.+?)\s+Scheme\s*Code\s*:\s*(\S+)",
@@ -250,18 +300,36 @@ def parse_cdsl(
     # We skip pages 1-2 (cover + roster) because the roster lines
     # contain CDSL/NSDL identifiers that would otherwise look like
     # section headers; the dispatch logic below handles the rest.
+    # Both section-header patterns need a `DP Name :` label, and only
+    # ISIN-free blocks can be column headers (see `pageobj.Block.kind`).
     cur_account: Optional[DematAccount] = None
     cur_mode: Optional[str] = None  # 'equities' | 'mf_holdings'
-
-    for b in blocks:
-        if b.page < 3:
-            continue
+    # Column map compiled from the current table's header row.
+    cur_cols: Optional[ColumnMap] = None
+    # Roster accounts whose section hasn't started yet, and whether a
+    # holdings table is open (from its marker until its total row).
+    # Once the former is empty and the latter clear, the next trailer
+    # heading ends the walk.
+    unvisited = set(accounts_by_key)
+    if mf_folios_account is not None:
+        unvisited.add(_MF_FOLIOS_KEY)
+    table_open = False
+
+    for b in itertools.chain.from_iterable(blocks.iter_pages(3)):
         txt = b.text()
-        ltxt = txt.lower()
+        ltxt = b.ltext
+        if (
+            not unvisited
+            and not table_open
+            and b.kind == KIND_LABEL
+            and _TRAILER_RE.fullmatch(ltxt.strip())
+        ):
+            break
+        is_section = "dp" in ltxt
 
         # Per-account section header — `DP Name : ... BO ID : ...`
         # or `DP Name : ... DPID : ...` (NSDL variant) form.
-        m = SECTION_BOID_RE.search(txt)
+        m = SECTION_BOID_RE.search(txt) if is_section else None
         if m:
             broker = m.group(1).strip()
             bo_id = m.group(2)
@@ -269,11 +337,14 @@ def parse_cdsl(
             if type_word:
                 ac_key = _account_key(type_word, dp_id, client_id)
                 cur_account = accounts_by_key.get(ac_key)
+                unvisited.discard(ac_key)
                 cur_mode = None
+                cur_cols = None
+                table_open = False
                 continue
 
         # Or "DP Name : ... DP ID : ... CLIENT ID : ..."
-        m = SECTION_DPC_RE.search(txt)
+        m = SECTION_DPC_RE.search(txt) if is_section else None
         if m:
             type_word = "CDSL"
             if "NSDL" in txt.upper() and "CDSL" not in txt.upper():
@@ -281,33 +352,48 @@ def parse_cdsl(
             broker, dp_id, client_id = m.groups()
             ac_key = _account_key(type_word, dp_id.strip(), client_id.strip())
             cur_account = accounts_by_key.get(ac_key)
+            unvisited.discard(ac_key)
             cur_mode = None
+            cur_cols = None
+            table_open = False
             continue
 
         # Transaction-statement section — switch OFF holdings mode so
         # transaction rows aren't parsed as equity rows.
         if "statement of transactions" in ltxt:
             cur_mode = None
+            cur_cols = None
+            table_open = False
             continue
 
         # Holdings section markers
         if "holding statement" in ltxt and "as on" in ltxt:
             cur_mode = "equities"
+            cur_cols = None
+            table_open = True
             continue
         if "mutual fund units held as on" in ltxt:
             cur_account = mf_folios_account
+            unvisited.discard(_MF_FOLIOS_KEY)
             cur_mode = "mf_holdings"
+            cur_cols = None
+            table_open = True
             continue
 
-        # Skip column-header rows
-        if _is_holdings_header(b) or _is_total_row(b):
+        # Column-header rows compile the table's column map; total
+        # rows are skipped.
+        if _is_holdings_header(b):
+            cur_cols = _compile_columns(cur_mode, b)
+            continue
+        if _is_total_row(b):
+            table_open = False
             continue
 
         # Holdings rows
         if cur_account is None or cur_mode is None:
             continue
         if cur_mode == "equities":
-            row = _parse_holdings_row(b)
+            row = _parse_holdings_row(b, cur_cols)
             if row is None:
                 pass
             else:
@@ -338,7 +424,7 @@ def parse_cdsl(
                         )
                     )
         elif cur_mode == "mf_holdings":
-            mf = _parse_mf_holdings_row(b, scheme_meta)
+            mf = _parse_mf_holdings_row(b, scheme_meta, cur_cols)
             if mf:
                 cur_account.mutual_funds.append(mf)
 
@@ -348,7 +434,7 @@ def parse_cdsl(
         investor_info=extract_nsdl_cdsl_investor(
             pdf_path,
             password,
-            _atoms=atoms,
+            _walk=walk,
         ),
         file_type=file_type,
     )
@@ -417,7 +503,7 @@ def _mf_folios_account_from_summary(block: Block, owners: List[DematOwner]) -> D
 # --- helpers ---
 
 
-def _find_period(blocks: List[Block]) -> Optional[StatementPeriod]:
+def _find_period(blocks: PageBlocks) -> Optional[StatementPeriod]:
     for b in blocks:
         m = PERIOD_RE.search(b.text())
         if m:
@@ -427,10 +513,9 @@ def _find_period(blocks: List[Block]) -> Optional[StatementPeriod]:
 
 def _is_holdings_header(block: Block) -> bool:
     """Block has no ISIN and looks like a column-label row."""
-    txt = block.text()
-    if re.search(r"\b(IN[EF9][0-9A-Z]{8}\d)\b", txt, re.I):
+    if block.kind == KIND_ROW:
         return False
-    ltxt = txt.lower().replace("\n", " ").replace("\t\t", " ")
+    ltxt = block.ltext.replace("\n", " ").replace("\t\t", " ")
     if "isin" in ltxt and ("security" in ltxt or "scheme name" in ltxt):
         return True
     if "current" in ltxt and "bal" in ltxt and "market" in ltxt:
@@ -446,7 +531,21 @@ def _is_total_row(block: Block) -> bool:
 # --- equity holdings row ---
 
 
-def _parse_holdings_row(block: Block) -> Optional[Tuple[str, str, Decimal, Decimal, Decimal]]:
+def _join_name(cells) -> Optional[str]:
+    """Security name split across `cells`, minus the '@' marker cell."""
+    return (
+        " ".join(
+            c.text.replace("\n", " ").strip()
+            for c in cells
+            if c.text.strip() and c.text.strip() not in ("@",)
+        )
+        or None
+    )
+
+
+def _parse_holdings_row(
+    block: Block, cols: Optional[ColumnMap] = None
+) -> Optional[Tuple[str, str, Decimal, Decimal, Decimal]]:
     """CDSL holdings row → `(isin, name, num_shares, price, value)`.
 
     Column layout (post-`HOLDING STATEMENT`):
@@ -459,7 +558,11 @@ def _parse_holdings_row(block: Block) -> Optional[Tuple[str, str, Decimal, Decim
     parsed — `_to_decimal` maps `--` to 0. We use position-based
     assignment, not the last-three-numerics heuristic, because some
     rows have only 2 numeric cells (price + value) when all balance
-    columns are `--`."""
+    columns are `--`.
+
+    With `cols` (compiled from the table header), cells left of the
+    Current Bal column form the name and the three fields are read
+    straight from their columns."""
     if not block.cells:
         return None
     first = block.cells[0].text.strip()
@@ -467,6 +570,19 @@ def _parse_holdings_row(block: Block) -> Optional[Tuple[str, str, Decimal, Decim
         return None
     isin = first
 
+    decoded = cols.split(block, start=1) if cols is not None else None
+    # A non-numeric field cell (e.g. a wrapped name spilling into a
+    # blank column) means the row doesn't follow the header.
+    if decoded is not None and all(_numeric_or_dash(c.text) for c in decoded[1].values()):
+        lead, fields = decoded
+        return (
+            isin,
+            _join_name(lead),
+            _to_decimal(fields["num_shares"].text),
+            _to_decimal(fields["price"].text),
+            _to_decimal(fields["value"].text),
+        )
+
     # Find the data-cell boundary: the first cell after ISIN whose
     # text is a number or `--`. Everything between ISIN and that cell
     # is part of the security name (PDF renderer sometimes splits
@@ -475,19 +591,12 @@ def _parse_holdings_row(block: Block) -> Optional[Tuple[str, str, Decimal, Decim
     data_start = None
     for i in range(1, len(block.cells)):
         t = block.cells[i].text.strip()
-        if _looks_numeric(t) or t in ("--", "-"):
+        if _numeric_or_dash(t):
             data_start = i
             break
     if data_start is None or len(block.cells) - data_start < 3:
         return None
-    name = (
-        " ".join(
-            c.text.replace("\n", " ").strip()
-            for c in block.cells[1:data_start]
-            if c.text.strip() and c.text.strip() not in ("@",)
-        )
-        or None
-    )
+    name = _join_name(block.cells[1:data_start])
 
     num_shares = _to_decimal(block.cells[data_start].text)
     price = _to_decimal(block.cells[-2].text)
@@ -501,6 +610,7 @@ def _parse_holdings_row(block: Block) -> Optional[Tuple[str, str, Decimal, Decim
 def _parse_mf_holdings_row(
     block: Block,
     scheme_meta: Dict[str, Dict[str, str]],
+    cols: Optional[ColumnMap] = None,
 ) -> Optional[MutualFund]:
     """MF holdings table row. Known templates:
 
@@ -526,9 +636,40 @@ def _parse_mf_holdings_row(
     "invested" otherwise. A holdings statement always prints the
     current value, so when only three numerics survive we treat the
     third as the value (not the optional invested/cost column).
+
+    With `cols` (compiled from the table header), a row with one cell
+    per header column is read straight from its columns; anything else
+    (e.g. a wrapped folio, which adds a cell) takes the rules above.
     """
     if len(block.cells) < 5:
         return None
+    decoded = cols.split(block) if cols is not None and len(block.cells) == cols.width else None
+    if decoded is not None:
+        lead, fields = decoded
+        isin = fields["isin"].text.strip()
+        numeric = all(
+            _numeric_or_dash(c.text) for k, c in fields.items() if k not in ("isin", "folio")
+        )
+        if ISIN_RE.match(isin) and numeric:
+            opt = {
+                k: _opt_decimal(fields[k].text)
+                for k in ("invested", "pnl", "return")
+                if k in fields
+            }
+            return _mf_holding(
+                scheme_meta,
+                name=" ".join(c.text.replace("\n", " ").strip() for c in lead if c.text.strip())
+                or None,
+                isin=isin,
+                folio=fields["folio"].text.strip() or None,
+                balance=_to_decimal(fields["balance"].text),
+                nav=_to_decimal(fields["nav"].text),
+                value=_to_decimal(fields["value"].text),
+                invested=opt.get("invested"),
+                pnl=opt.get("pnl"),
+                ret=opt.get("return"),
+            )
+
     # Find the ISIN cell — usually cell 1.
     isin_idx = None
     for i in range(min(3, len(block.cells))):
@@ -588,7 +729,34 @@ def _parse_mf_holdings_row(
         value = _to_decimal(numerics[2])
     pnl = _opt_decimal(numerics[-2]) if has_distrib_col and len(numerics) >= 6 else None
     ret = _opt_decimal(numerics[-1]) if has_distrib_col and len(numerics) >= 5 else None
+    return _mf_holding(
+        scheme_meta,
+        name=name,
+        isin=isin,
+        folio=folio,
+        balance=balance,
+        nav=nav,
+        value=value,
+        invested=invested,
+        pnl=pnl,
+        ret=ret,
+    )
 
+
+def _mf_holding(
+    scheme_meta: Dict[str, Dict[str, str]],
+    *,
+    name: Optional[str],
+    isin: str,
+    folio: Optional[str],
+    balance: Decimal,
+    nav: Decimal,
+    value: Decimal,
+    invested: Optional[Decimal],
+    pnl: Optional[Decimal],
+    ret: Optional[Decimal],
+) -> MutualFund:
+    """Build the `MutualFund`, taking its UCC from `scheme_meta`."""
     # Pull UCC from scheme_meta keyed on scheme_code (prefix of name)
     ucc = None
     if name:
@@ -5,10 +5,11 @@ We look at the first 1-2 pages of text for unambiguous source markers
 `Consolidated Account (Statement|Summary)` heading.
 
 All public functions accept an optional pre-opened `pdfium.PdfDocument`
-so the dispatcher can open the PDF exactly once per `read_cas_pdf`
-call. When `_doc` is `None`, the function falls back to opening from
-the path argument — keeping the path-based signature usable for
-direct calls (unit tests, third-party consumers).
+(or the dispatcher's shared `walk.DocumentWalk`) so the PDF is opened
+and each sampled page loaded exactly once per `read_cas_pdf` call. When
+both are `None`, the function falls back to opening from the path
+argument — keeping the path-based signature usable for direct calls
+(unit tests, third-party consumers).
 """
 
 from __future__ import annotations
@@ -22,6 +23,8 @@ from pypdfium2._helpers.misc import PdfiumError
 from casparser.enums import CASFileType, FileType
 from casparser.exceptions import CASParseError, IncorrectPasswordError
 
+from .walk import DocumentWalk
+
 _CAS_TYPE_RE = re.compile(
     r"consolidated\s+account\s+(statement|summary)",
     re.I,
@@ -48,16 +51,12 @@ def _read_text_sample(
     max_pages: int = 2,
     *,
     _doc: Optional[pdfium.PdfDocument] = None,
+    _walk: Optional[DocumentWalk] = None,
 ) -> str:
     """Extract text from the first `max_pages` of the PDF."""
-    doc = _doc if _doc is not None else _open_document(pdf_path, password)
-    out = []
-    for page_num, page in enumerate(doc):
-        if page_num >= max_pages:
-            break
-        tp = page.get_textpage()
-        out.append(tp.get_text_bounded())
-    return "\n".join(out)
+    if _walk is None:
+        _walk = DocumentWalk(_doc if _doc is not None else _open_document(pdf_path, password))
+    return _walk.text(max_pages)
 
 
 def detect_file_type(
@@ -65,10 +64,11 @@ def detect_file_type(
     password,
     *,
     _doc: Optional[pdfium.PdfDocument] = None,
+    _walk: Optional[DocumentWalk] = None,
 ) -> FileType:
     """Identify the issuer (CAMS / KFin / NSDL / CDSL) from the PDF
     text. Raises nothing — returns `FileType.UNKNOWN` on no match."""
-    text = _read_text_sample(pdf_path, password, _doc=_doc)
+    text = _read_text_sample(pdf_path, password, _doc=_doc, _walk=_walk)
     if "CAMSCASWS" in text:
         return FileType.CAMS
     if "KFINCASWS" in text:
@@ -85,10 +85,11 @@ def detect_cas_type(
     password,
     *,
     _doc: Optional[pdfium.PdfDocument] = None,
+    _walk: Optional[DocumentWalk] = None,
 ) -> CASFileType:
     """For CAMS / KFin only: SUMMARY vs DETAILED statement.
     NSDL / CDSL don't have this split."""
-    text = _read_text_sample(pdf_path, password, max_pages=1, _doc=_doc)
+    text = _read_text_sample(pdf_path, password, max_pages=1, _doc=_doc, _walk=_walk)
     if m := _CAS_TYPE_RE.search(text):
         kind = m.group(1).lower().strip()
         if kind == "statement":
@@ -45,17 +45,36 @@ Why baseline y not bbox y
 Per-char y still uses ``FPDFText_GetCharOrigin`` — the typographic
 baseline, not the bbox bottom which varies with descenders. This keeps
 dashes and `g`/`y`/`p` glyphs at the same y as the rest of their line.
+
+Columnar glyph store
+====================
+
+Glyph extraction dominates CAMS parsing time, so the per-glyph loop is
+kept tight: the page text comes from one ``FPDFText_GetText`` call,
+boxes and origins are read through raw ``FPDFText_*`` calls into
+reused ctypes buffers, and the results land in a per-page
+`GlyphStore` of parallel arrays rather than one object per glyph.
+Atoms reference their glyphs by id. After overlay dedup the survivors
+are compacted into line order, so a `Line` is just a ``[start, stop)``
+view over the store and line text / cell assignment walk index ranges
+instead of re-sorting object lists. `Char` objects are only built on
+demand (`Line.chars`).
 """
 
 from __future__ import annotations
 
 import ctypes
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
-import pypdfium2 as pdfium
 import pypdfium2.raw as pdfium_raw
 
+if TYPE_CHECKING:  # pragma: no cover
+    import pypdfium2 as pdfium
+
+    from .walk import DocumentWalk
+
 # Per-line baseline-clustering tolerance. With origin-based y, glyphs
 # from one text-show op share an exact baseline; 1.5pt absorbs the
 # small inter-atom drift you see between, e.g., a date atom and a
@@ -79,6 +98,10 @@ Y_OVERLAY_MIN_OFFSET = 0.05
 # just neighbouring columns.
 X_OVERLAY_MIN_FRAC = 0.5
 
+# Textpage chars that never make it into a `Char`: PDFium-generated line
+# breaks and the replacement char for unmappable glyphs.
+_SKIP_CHARS = ("\r", "\n", "\ufffd")
+
 # Buffer size for the PDFium font-name lookup.
 _FONT_BUF_SIZE = 128
 
@@ -91,7 +114,7 @@ _NON_LATIN_FONT_KEYWORDS = ("Mangal",)
 # ---------------------------------------------------------------------- types
 
 
-@dataclass
+@dataclass(slots=True)
 class Char:
     """One glyph at a known typographic position."""
 
@@ -107,37 +130,226 @@ class Char:
         return self.y1 - self.y0
 
 
-@dataclass
-class Line:
-    page: int
-    baseline: float
-    chars: List[Char] = field(default_factory=list)
+class GlyphStore:
+    """Columnar (structure-of-arrays) glyph table for one page.
 
-    @property
-    def text(self) -> str:
-        """Reconstruct line text with spaces where x-gap is significant.
+    Parallel arrays indexed by glyph id: box / baseline coordinates as
+    ``array('d')``, the glyph's code point, and an id into the page's
+    interned `fonts` list. Glyph text that isn't a single code point
+    (rare PDFium quirks) is stored out of line in `_extra` under a
+    code of -1.
 
-        Gap threshold = ``0.6 × median char height`` (floored at 1.5pt).
+    `_walk_page_atoms` fills one with every kept glyph in textpage order;
+    `_cluster_into_lines` then compacts the survivors into line order so
+    each `Line` is a contiguous ``[start, stop)`` range, left to right.
+    """
+
+    __slots__ = ("code", "font_id", "fonts", "x0", "y0", "x1", "y1", "_extra", "_font_ids")
+
+    def __init__(self, fonts: Optional[List[str]] = None):
+        self.code = array("l")
+        self.font_id = array("H")
+        self.fonts: List[str] = fonts if fonts is not None else []
+        self.x0 = array("d")
+        self.y0 = array("d")  # baseline
+        self.x1 = array("d")
+        self.y1 = array("d")  # visual glyph top
+        self._extra: dict = {}
+        self._font_ids = {f: i for i, f in enumerate(self.fonts)}
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def intern_font(self, font: str) -> int:
+        fid = self._font_ids.get(font)
+        if fid is None:
+            fid = self._font_ids[font] = len(self.fonts)
+            self.fonts.append(font)
+        return fid
+
+    def append(self, text: str, font_id: int, x0: float, y0: float, x1: float, y1: float):
+        if len(text) == 1:
+            self.code.append(ord(text))
+        else:
+            self._extra[len(self.code)] = text
+            self.code.append(-1)
+        self.font_id.append(font_id)
+        self.x0.append(x0)
+        self.y0.append(y0)
+        self.x1.append(x1)
+        self.y1.append(y1)
+
+    def take(self, order) -> "GlyphStore":
+        """Return a new store holding glyphs `order` (old ids), renumbered
+        0..n-1 in that order. Fonts are shared, not copied."""
+        out = GlyphStore(self.fonts)
+        out._font_ids = self._font_ids
+        code = self.code
+        out.code = array("l", [code[g] for g in order])
+        out.font_id = array("H", [self.font_id[g] for g in order])
+        out.x0 = array("d", [self.x0[g] for g in order])
+        out.y0 = array("d", [self.y0[g] for g in order])
+        out.x1 = array("d", [self.x1[g] for g in order])
+        out.y1 = array("d", [self.y1[g] for g in order])
+        if self._extra:
+            out._extra = {i: self._extra[g] for i, g in enumerate(order) if code[g] < 0}
+        return out
+
+    def text_of(self, g: int) -> str:
+        cp = self.code[g]
+        return chr(cp) if cp >= 0 else self._extra[g]
+
+    def char(self, g: int) -> Char:
+        return Char(
+            text=self.text_of(g),
+            x0=self.x0[g],
+            y0=self.y0[g],
+            x1=self.x1[g],
+            y1=self.y1[g],
+            font=self.fonts[self.font_id[g]],
+        )
+
+    def render(self, ids) -> str:
+        """Join glyphs `ids` (already left-to-right) into text, with a
+        space wherever the x-gap is significant.
+
+        Gap threshold = ``0.6 × median glyph height`` (floored at 1.5pt).
         Lower thresholds catch kerning gaps inside numerics (e.g.
         ``'12124203'`` rendered as multiple text-show ops with ~2pt
         jumps) so folio numbers and amounts don't fragment.
         """
-        cs = sorted(self.chars, key=lambda c: c.x0)
-        if not cs:
+        if not ids:
             return ""
-        heights = sorted(c.h for c in cs)
-        h_med = heights[len(heights) // 2]
-        gap = max(1.5, 0.6 * h_med)
+        x0, x1, y0, y1 = self.x0, self.x1, self.y0, self.y1
+        heights = sorted([y1[g] - y0[g] for g in ids])
+        gap = max(1.5, 0.6 * heights[len(heights) // 2])
+        text_of = self.text_of
         out, prev_x1 = [], None
-        for c in cs:
-            if prev_x1 is not None and (c.x0 - prev_x1) > gap:
+        for g in ids:
+            if prev_x1 is not None and (x0[g] - prev_x1) > gap:
                 out.append(" ")
-            out.append(c.text)
-            prev_x1 = c.x1
+            out.append(text_of(g))
+            prev_x1 = x1[g]
         return "".join(out)
 
 
-@dataclass
+class Line:
+    """One baseline-clustered line: a view over glyphs ``[start, stop)``
+    of its page's `GlyphStore`, ordered left to right.
+
+    The rendered `text` and each `words` segmentation are computed on
+    first access and cached; re-pointing the line at other glyphs
+    (assigning `store`, `start` or `stop`) drops the caches.
+    """
+
+    __slots__ = ("page", "baseline", "_store", "_start", "_stop", "_text", "_words")
+
+    def __init__(self, page: int, baseline: float, store: GlyphStore, start: int, stop: int):
+        self.page = page
+        self.baseline = baseline
+        self._store = store
+        self._start = start
+        self._stop = stop
+        self._text: Optional[str] = None
+        self._words: dict = {}
+
+    def __repr__(self) -> str:
+        return f"Line(page={self.page}, baseline={self.baseline:.2f}, text={self.text!r})"
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def _invalidate(self) -> None:
+        self._text = None
+        self._words = {}
+
+    @property
+    def store(self) -> GlyphStore:
+        return self._store
+
+    @store.setter
+    def store(self, value: GlyphStore) -> None:
+        self._store = value
+        self._invalidate()
+
+    @property
+    def start(self) -> int:
+        return self._start
+
+    @start.setter
+    def start(self, value: int) -> None:
+        self._start = value
+        self._invalidate()
+
+    @property
+    def stop(self) -> int:
+        return self._stop
+
+    @stop.setter
+    def stop(self, value: int) -> None:
+        self._stop = value
+        self._invalidate()
+
+    @property
+    def glyphs(self) -> range:
+        """Glyph ids of this line in its store, left to right."""
+        return range(self._start, self._stop)
+
+    @property
+    def chars(self) -> List[Char]:
+        """The line's glyphs as `Char` objects, left to right."""
+        return [self._store.char(g) for g in self.glyphs]
+
+    @property
+    def text(self) -> str:
+        """Reconstruct line text with spaces where x-gap is significant
+        (see `GlyphStore.render`). Cached."""
+        if self._text is None:
+            self._text = self._store.render(self.glyphs)
+        return self._text
+
+    def words(
+        self, min_gap: float = 1.5, split_on_space: bool = False
+    ) -> List[tuple[str, float, float]]:
+        """Return ``[(text, x0, x1)]`` words, splitting wherever the x-gap
+        exceeds `min_gap` (and, with `split_on_space`, at literal
+        whitespace glyphs, which are themselves dropped).
+
+        Cached per ``(min_gap, split_on_space)``; the returned list is
+        shared, so callers must not mutate it.
+        """
+        key = (min_gap, split_on_space)
+        words = self._words.get(key)
+        if words is None:
+            words = self._words[key] = self._segment(min_gap, split_on_space)
+        return words
+
+    def _segment(self, min_gap: float, split_on_space: bool) -> List[tuple[str, float, float]]:
+        store = self._store
+        xs0, xs1, text_of = store.x0, store.x1, store.text_of
+        words = []
+        cur, cur_x0, cur_x1 = "", None, None
+        for g in self.glyphs:
+            t = text_of(g)
+            if split_on_space and t.isspace():
+                if cur:
+                    words.append((cur, cur_x0, cur_x1))
+                    cur = ""
+                continue
+            x0 = xs0[g]
+            if cur and (x0 - cur_x1) > min_gap:
+                words.append((cur, cur_x0, cur_x1))
+                cur = ""
+            if not cur:
+                cur_x0 = x0
+            cur += t
+            cur_x1 = xs1[g]
+        if cur:
+            words.append((cur, cur_x0, cur_x1))
+        return words
+
+
+@dataclass(slots=True)
 class Page:
     number: int
     lines: List[Line]
@@ -145,7 +357,8 @@ class Page:
 
 @dataclass
 class _Atom:
-    """One PDF text-show op, with its bbox, font, and the glyphs it emitted.
+    """One PDF text-show op, with its bbox, font, and the ids of the
+    glyphs it emitted in the page's `GlyphStore`.
 
     Internal to this module — `extract_pages` returns `Page`/`Line`/`Char`
     so downstream parsers don't have to know about the atom layer.
@@ -156,7 +369,8 @@ class _Atom:
     y_top: float
     y_bot: float
     font: str
-    chars: List[Char] = field(default_factory=list)
+    font_id: int = 0
+    glyphs: List[int] = field(default_factory=list)
 
     @property
     def width(self) -> float:
@@ -185,38 +399,72 @@ def extract_pages(
     password: str,
     *,
     _doc: "Optional[pdfium.PdfDocument]" = None,
+    _walk: "Optional[DocumentWalk]" = None,
 ) -> List[Page]:
     """Return one `Page` per PDF page, each containing baseline-clustered
     `Line`s of `Char`s. See module docstring for the design rationale.
 
-    ``_doc``: pre-opened document supplied by the dispatcher. When not
-    provided, the function opens the PDF from `pdf_path` itself.
+    ``_doc`` / ``_walk``: pre-opened document or shared page walk
+    supplied by the dispatcher. Lines already computed through the walk
+    (e.g. for detection) are reused rather than re-extracted. When
+    neither is provided, the function opens the PDF from `pdf_path`.
+    """
+    return list(iter_pages(pdf_path, password, _doc=_doc, _walk=_walk))
+
+
+def iter_pages(
+    pdf_path: str,
+    password: str,
+    *,
+    _doc: "Optional[pdfium.PdfDocument]" = None,
+    _walk: "Optional[DocumentWalk]" = None,
+) -> Iterator[Page]:
+    """Streaming form of `extract_pages`: yield pages one at a time.
+
+    Each page's pdfium page / text page handles are released as soon as
+    the consumer asks for the next page, so only the `Page` currently
+    being parsed (plus whatever the consumer keeps) is alive at once.
+    Anything that needs raw page data later — e.g. the investor
+    extractor on page 1 — must read it before the walk moves past it.
     """
-    doc = _doc if _doc is not None else pdfium.PdfDocument(pdf_path, password=password)
-    pages: List[Page] = []
-    for page_num, page in enumerate(doc, start=1):
-        atoms = _walk_page_atoms(page)
-        atoms = _dedupe_overlay_atoms(atoms)
-        pages.append(Page(number=page_num, lines=_cluster_into_lines(atoms, page_num)))
-    return pages
+    from .walk import get_walk
+
+    walk = get_walk(pdf_path, password, _doc=_doc, _walk=_walk)
+    for index in range(len(walk)):
+        wp = walk.page(index)
+        page = Page(number=wp.number, lines=wp.lines)
+        walk.release(index)
+        yield page
+
+
+def _page_lines(page, textpage, page_num: int) -> List[Line]:
+    """Atom walk → overlay dedup → baseline clustering for one page."""
+    store, atoms = _walk_page_atoms(page, textpage)
+    atoms = _dedupe_overlay_atoms(atoms)
+    return _cluster_into_lines(store, atoms, page_num)
 
 
 # ---------------------------------------------------------------------- atom walk
 
 
-def _walk_page_atoms(page) -> List[_Atom]:
+def _walk_page_atoms(page, tp=None) -> tuple[GlyphStore, List[_Atom]]:
     """Walk every text page object on `page`, capturing each atom's
-    bbox, font, and the per-glyph `Char`s it contributed.
+    bbox, font, and the glyphs it contributed to the page's glyph table.
 
     Char-to-atom mapping uses ``FPDFText_GetTextObject(textpage, i)``,
     which is PDFium's own authoritative lookup. The textpage walks
     chars in reading order (top-down, left-to-right), so cursor-based
     indexing across page objects in stream order does not work.
+
+    ``tp``: the page's already-loaded text page, if the caller has one.
     """
     page_handle = page.raw
-    tp = page.get_textpage()
+    if tp is None:
+        tp = page.get_textpage()
     tp_handle = tp.raw
 
+    store = GlyphStore()
+
     # 1. Index page objects by handle so we can look up each char's
     #    atom in O(1) below. The handle is the raw PDFium pointer
     #    returned by FPDFPage_GetObject; comparing with `ctypes`
@@ -264,45 +512,73 @@ def _walk_page_atoms(page) -> List[_Atom]:
             ctypes.byref(top),
         )
         key = _obj_key(obj)
+        font = _strip_font_subset_prefix(raw_font)
         obj_index[key] = _Atom(
             x_left=left.value,
             x_right=right.value,
             y_top=top.value,
             y_bot=bottom.value,
-            font=_strip_font_subset_prefix(raw_font),
+            font=font,
+            font_id=store.intern_font(font),
         )
         obj_order.append(key)
 
     # 2. Walk per-glyph chars. For each char, ask PDFium which text
-    #    object owns it and append the char to that atom's list.
-    n_chars = tp.count_chars()
-    ox = ctypes.c_double()
-    oy = ctypes.c_double()
+    #    object owns it and record the glyph against that atom. Owner
+    #    lookup comes first so dropped (watermark / non-Latin) glyphs
+    #    never pay for the box and origin calls.
+    n_chars = pdfium_raw.FPDFText_CountChars(tp_handle)
+    texts = _page_chars(tp, n_chars)
+    append = store.append
+    get_owner = pdfium_raw.FPDFText_GetTextObject
+    get_box = pdfium_raw.FPDFText_GetCharBox
+    get_origin = pdfium_raw.FPDFText_GetCharOrigin
+    bl, bb, br, bt = ctypes.c_double(), ctypes.c_double(), ctypes.c_double(), ctypes.c_double()
+    ox, oy = ctypes.c_double(), ctypes.c_double()
+    p_bl, p_bb, p_br, p_bt = ctypes.byref(bl), ctypes.byref(bb), ctypes.byref(br), ctypes.byref(bt)
+    p_ox, p_oy = ctypes.byref(ox), ctypes.byref(oy)
     for ci in range(n_chars):
-        ch = tp.get_text_range(ci, 1)
-        if ch in ("\r", "\n", "�"):
-            continue
-        x0, y0_bbox, x1, y1_bbox = tp.get_charbox(ci)
-        if y1_bbox - y0_bbox <= 0 or x1 - x0 <= 0:
+        ch = texts[ci]
+        if ch in _SKIP_CHARS:
             continue
-        text_obj = pdfium_raw.FPDFText_GetTextObject(tp_handle, ci)
-        atom = obj_index.get(_obj_key(text_obj))
+        atom = obj_index.get(_obj_key(get_owner(tp_handle, ci)))
         if atom is None:  # None == not text, or non-Latin (dropped)
             continue
-        pdfium_raw.FPDFText_GetCharOrigin(tp_handle, ci, ox, oy)
-        atom.chars.append(
-            Char(
-                text=ch,
-                x0=x0,
-                y0=oy.value,
-                x1=x1,
-                y1=y1_bbox,
-                font=atom.font,
-            )
-        )
+        if not get_box(tp_handle, ci, p_bl, p_br, p_bb, p_bt):  # yes, l-r-b-t
+            continue
+        x0, x1, y1 = bl.value, br.value, bt.value
+        if y1 - bb.value <= 0 or x1 - x0 <= 0:
+            continue
+        get_origin(tp_handle, ci, p_ox, p_oy)
+        atom.glyphs.append(len(store))
+        append(ch, atom.font_id, x0, oy.value, x1, y1)
 
     # 3. Return atoms in page-object order, dropping empties.
-    return [a for k in obj_order if (a := obj_index.get(k)) is not None and a.chars]
+    atoms = [a for k in obj_order if (a := obj_index.get(k)) is not None and a.glyphs]
+    return store, atoms
+
+
+def _page_chars(tp, n_chars: int) -> List[str]:
+    """Return the text of every textpage char, indexed by char index.
+
+    Reads the whole page with one ``FPDFText_GetText`` call. PDFium can
+    exclude or insert chars relative to its char list, and non-BMP
+    glyphs come back as surrogate pairs; in either case the text no
+    longer lines up with char indices, so fall back to per-char reads.
+    """
+    if n_chars <= 0:
+        return []
+    # Room for every char to expand to a surrogate pair, plus the NUL.
+    buf = (ctypes.c_ushort * (2 * n_chars + 1))()
+    n_out = pdfium_raw.FPDFText_GetText(tp.raw, 0, n_chars, buf)
+    if n_out - 1 == n_chars:
+        try:
+            text = memoryview(buf)[:n_chars].tobytes().decode("utf-16-le")
+        except UnicodeDecodeError:
+            text = ""
+        if len(text) == n_chars:
+            return list(text)
+    return [tp.get_text_range(ci, 1) for ci in range(n_chars)]
 
 
 def _obj_key(obj_ptr) -> int:
@@ -337,10 +613,17 @@ def _dedupe_overlay_atoms(atoms: List[_Atom]) -> List[_Atom]:
     ``y_top`` of nearby atoms in the same row band. The "real" row
     atoms cluster tightly around the median; the overlay sits a hair
     above or below.
+
+    Rather than testing every pair in a row, each row is split by font
+    id and an x-interval sweep yields only the x-overlapping pairs.
+    Those are then resolved in the same (row position, row position)
+    order a full pairwise scan would visit them, so which atom of a
+    chain of overlaps gets dropped is unchanged.
     """
     if len(atoms) < 2:
         return atoms
-    # Bucket atoms into approximate rows.
+    # Bucket atoms into approximate rows (row position = index in the
+    # y-sorted row list).
     sorted_atoms = sorted(enumerate(atoms), key=lambda p: -p[1].y_top)
     rows: List[List[tuple]] = []
     anchor: Optional[float] = None
@@ -355,52 +638,104 @@ def _dedupe_overlay_atoms(atoms: List[_Atom]) -> List[_Atom]:
     for row in rows:
         if len(row) < 2:
             continue
+        pairs = _overlay_candidates(row)
+        if not pairs:
+            continue
         median_y = sorted(a.y_top for _, a in row)[len(row) // 2]
-        for ii in range(len(row)):
+        cur_ii, skip = -1, False
+        for ii, jj in pairs:
+            if ii != cur_ii:
+                # An atom already dropped when its turn comes is never
+                # compared again; one dropped mid-turn keeps comparing.
+                cur_ii, skip = ii, row[ii][0] in drop
+            if skip:
+                continue
             oi, ai = row[ii]
-            if oi in drop:
+            oj, aj = row[jj]
+            if oj in drop:
+                continue
+            narrower = min(ai.width, aj.width)
+            xo = min(ai.x_right, aj.x_right) - max(ai.x_left, aj.x_left)
+            if narrower <= 0 or xo / narrower < X_OVERLAY_MIN_FRAC:
+                continue
+            # Same-row check: y-offset must be in the "overlay" band.
+            if abs(ai.y_top - aj.y_top) < Y_OVERLAY_MIN_OFFSET:
                 continue
-            for jj in range(ii + 1, len(row)):
-                oj, aj = row[jj]
-                if oj in drop or not ai.font or ai.font != aj.font:
-                    continue
-                # x-overlap as fraction of the narrower atom's width.
-                xo = min(ai.x_right, aj.x_right) - max(ai.x_left, aj.x_left)
-                if xo <= 0:
-                    continue
-                narrower = min(ai.width, aj.width)
-                if narrower <= 0 or xo / narrower < X_OVERLAY_MIN_FRAC:
-                    continue
-                # Same-row check: y-offset must be in the "overlay" band.
-                dy = abs(ai.y_top - aj.y_top)
-                if dy < Y_OVERLAY_MIN_OFFSET:
-                    continue
-                # Found a duplicate pair — drop the one further from median.
-                drop.add(oi if abs(ai.y_top - median_y) > abs(aj.y_top - median_y) else oj)
+            # Found a duplicate pair — drop the one further from median.
+            drop.add(oi if abs(ai.y_top - median_y) > abs(aj.y_top - median_y) else oj)
 
     return [a for i, a in enumerate(atoms) if i not in drop]
 
 
+def _overlay_candidates(row: List[tuple]) -> List[tuple[int, int]]:
+    """Return the ``(ii, jj)`` row positions, ``ii < jj``, of same-font
+    atoms whose x-ranges strictly overlap, in ascending order.
+
+    Atoms are grouped by font id and each group is swept left to right
+    by ``x_left``, keeping only the intervals still open at the current
+    left edge. Atoms with no font name never pair up.
+    """
+    by_font: dict = {}
+    for pos, (_, a) in enumerate(row):
+        if a.font:
+            by_font.setdefault(a.font_id, []).append(pos)
+    pairs: List[tuple[int, int]] = []
+    for members in by_font.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda p: row[p][1].x_left)
+        active: List[int] = []
+        for p in members:
+            a = row[p][1]
+            active = [q for q in active if row[q][1].x_right > a.x_left]
+            for q in active:
+                # Swept by x_left, so the later left edge is a's own.
+                if min(a.x_right, row[q][1].x_right) - a.x_left > 0:
+                    pairs.append((q, p) if q < p else (p, q))
+            active.append(p)
+    pairs.sort()
+    return pairs
+
+
 # ---------------------------------------------------------------------- line clustering
 
 
-def _cluster_into_lines(atoms: List[_Atom], page_num: int) -> List[Line]:
-    """Cluster surviving chars into top-down `Line`s by baseline y.
+def _cluster_into_lines(store: GlyphStore, atoms: List[_Atom], page_num: int) -> List[Line]:
+    """Cluster surviving glyphs into top-down `Line`s by baseline y.
 
     Within `Y_TOL` of the running baseline → same line; otherwise →
     new line. The running average makes the line slowly track a
     visual drift across many atoms (CAMS scheme + registrar wraps
     on different baselines are intentionally merged this way).
+
+    The survivors are then copied into a fresh store in line order,
+    each line sorted left to right (stable, so x-ties keep baseline
+    order), and every `Line` becomes a contiguous range over it.
     """
-    all_chars = [c for a in atoms for c in a.chars]
-    all_chars.sort(key=lambda c: -c.y0)
-    lines: List[Line] = []
-    for c in all_chars:
-        if lines and abs(c.y0 - lines[-1].baseline) <= Y_TOL:
-            ln = lines[-1]
-            ln.chars.append(c)
-            n = len(ln.chars)
-            ln.baseline = (ln.baseline * (n - 1) + c.y0) / n
+    y0, x0 = store.y0, store.x0
+    glyphs = [g for a in atoms for g in a.glyphs]
+    glyphs.sort(key=y0.__getitem__, reverse=True)
+    groups: List[List[int]] = []
+    baselines: List[float] = []
+    for g in glyphs:
+        y = y0[g]
+        if groups and abs(y - baselines[-1]) <= Y_TOL:
+            grp = groups[-1]
+            grp.append(g)
+            n = len(grp)
+            baselines[-1] = (baselines[-1] * (n - 1) + y) / n
         else:
-            lines.append(Line(page=page_num, baseline=c.y0, chars=[c]))
-    return lines
+            groups.append([g])
+            baselines.append(y)
+
+    order: List[int] = []
+    bounds: List[tuple[int, int]] = []
+    for grp in groups:
+        grp.sort(key=x0.__getitem__)
+        bounds.append((len(order), len(order) + len(grp)))
+        order.extend(grp)
+    compact = store.take(order)
+    return [
+        Line(page_num, baseline, compact, start, stop)
+        for baseline, (start, stop) in zip(baselines, bounds)
+    ]
@@ -49,7 +49,8 @@ from casparser.types import (
 
 from . import pageobj
 from ._investor import extract_nsdl_cdsl_investor
-from .pageobj import Block, Cell
+from .pageobj import KIND_LABEL, KIND_ROW, Block, Cell, ColumnMap, PageBlocks
+from .walk import get_walk
 
 # --- patterns ---
 
@@ -76,6 +77,20 @@ PAN_RE = re.compile(r"(.+?)\s*\(PAN\s*:\s*([^)]+)\)", re.I)
 MF_FOLIOS_HEADER_RE = re.compile(r"^Mutual\s+Fund\s+Folios\b", re.I)
 
 
+# Section headings that follow the holdings part of the statement.
+# Once every roster account's section has started and no holdings
+# table is open, a label matching one of these in full ends the
+# holdings walk; nothing after it is parsed. Full matches only, so a
+# "Notes:" label or a footer line inside a section never does.
+_TRAILER_RE = re.compile(
+    r"transactions for the period(?: from \S+ to \S+)?|notes|about nsdl|glossary"
+)
+
+# `unvisited` stand-in for the MF-folios pseudo-account, which has no
+# `(type, dp_id, client_id)` key.
+_MF_FOLIOS_KEY = ("MF", "", "")
+
+
 # --- decimal helpers ---
 
 
@@ -110,6 +125,10 @@ def _looks_numeric(text: str) -> bool:
     return bool(NUMERIC_RE.match(s))
 
 
+def _numeric_or_dash(text: str) -> bool:
+    return _looks_numeric(text) or text.strip() in ("--", "-")
+
+
 # --- column anchors (x_left ranges) for the detailed MF Holdings table ---
 
 
@@ -176,6 +195,56 @@ class _BondSummaryCols:
 _BOND_SUMMARY = _BondSummaryCols()
 
 
+# --- header-compiled column maps ---
+#
+# The other holdings tables are decoded through a `pageobj.ColumnMap`
+# compiled from their column-header row: header keywords name the
+# numeric columns, and each row's cells are looked up by x-band rather
+# than re-scanned with `_looks_numeric`. ISIN and name stay on cells 0
+# and 1. A row the map can't decode (a column missing or hit twice)
+# falls back to the positional rules in each row parser.
+_EQUITY_COLUMNS = (
+    ("_face_value", ("face value",)),
+    ("num_shares", ("no. of shares", "current bal")),
+    ("price", ("market price",)),
+    ("value", ("value",)),
+)
+_SUMMARY_MF_COLUMNS = (
+    ("balance", ("no. of units",)),
+    ("nav", ("nav",)),
+    ("value", ("value",)),
+)
+_DETAILED_COLUMNS = (
+    ("balance", ("current bal",)),
+    ("price", ("market price",)),
+    ("value", ("value",)),
+)
+_HEADER_COLUMNS = {
+    "equities_summary": _EQUITY_COLUMNS,
+    "equities_detailed": _EQUITY_COLUMNS,
+    "mfunds_summary": _SUMMARY_MF_COLUMNS,
+    "mfunds_detailed": _DETAILED_COLUMNS,
+    "bonds_detailed": _DETAILED_COLUMNS,
+}
+
+
+def _compile_columns(mode: str, header: Block) -> Optional[ColumnMap]:
+    spec = _HEADER_COLUMNS.get(mode)
+    return ColumnMap.compile(header, spec) if spec is not None else None
+
+
+def _data_cells(block: Block, cols: Optional[ColumnMap]) -> Optional[Dict[str, Cell]]:
+    """Field → cell for the data cells (after ISIN and name) of `block`,
+    or None if any of them isn't a number or dash (e.g. a wrapped name
+    spilling into a blank column), so the positional rules run."""
+    if cols is None:
+        return None
+    decoded = cols.split(block, start=2)
+    if decoded is None or not all(_numeric_or_dash(c.text) for c in decoded[1].values()):
+        return None
+    return decoded[1]
+
+
 # --- account key utilities ---
 
 
@@ -198,11 +267,14 @@ def parse_nsdl(
     file_type: FileType = FileType.NSDL,
     *,
     _doc=None,
+    _walk=None,
 ) -> NSDLCASData:
-    # Extract atoms once, then derive both the structured Blocks the
-    # holdings parser needs and the investor info from the same pages.
-    atoms = pageobj.extract_atoms(pdf_path, password, _doc=_doc)
-    blocks = pageobj.blocks_from_atoms(atoms)
+    # One page walk feeds both the structured Blocks the holdings parser
+    # needs and the investor info. Pages are clustered lazily, so the
+    # trailing sections after the last account's holdings are never
+    # extracted (see `_TRAILER_RE`).
+    walk = get_walk(pdf_path, password, _doc=_doc, _walk=_walk)
+    blocks = pageobj.blocks_from_walk(walk)
     period = _find_period(blocks) or StatementPeriod(**{"from": "", "to": ""})
 
     # Phase 1: bootstrap accounts from page-2 summary table.
@@ -214,11 +286,9 @@ def parse_nsdl(
     # the most recent 'in the (single|joint) name of' header; consumed
     # by the next summary-demat row and reset on each new header.
 
-    for b in blocks:
-        if b.page != 2:
-            continue
+    for b in blocks.page(2):
         txt = b.text()
-        ltxt = txt.lower()
+        ltxt = b.ltext
         if (
             "in the single name of" in ltxt
             or "in the joint names of" in ltxt
@@ -264,89 +334,125 @@ def parse_nsdl(
     # 'mfunds_detailed', 'mf_holdings', 'bonds_summary',
     # 'bonds_detailed') chosen by `_detect_mode_from_header` once the
     # column-header row arrives.
-    page_blocks = [b for b in blocks if b.page > 2]
+    #
+    # Each block's `kind` hint gates the recognisers: only blocks
+    # without an ISIN can be column headers, and only `KIND_LABEL`
+    # blocks (short, ISIN-free) can be section markers.
+    #
+    # A per-account header's look-ahead never crosses a page, so the
+    # state machine runs page by page. `unvisited` holds the roster
+    # accounts whose section hasn't started yet, and `table_open` is
+    # set from a table's header row until its total row. Once the
+    # former is empty and the latter clear, the next trailer heading
+    # ends the walk.
     cur_account: Optional[DematAccount] = None
     cur_mode: Optional[str] = None
     cur_section: Optional[str] = None
+    cur_cols: Optional[ColumnMap] = None
+    unvisited = set(accounts_by_key)
+    if mf_folios_account is not None:
+        unvisited.add(_MF_FOLIOS_KEY)
+    table_open = False
+
+    done = False
+    for page_blocks in blocks.iter_pages(3):
+        i = 0
+        while i < len(page_blocks):
+            b = page_blocks[i]
+            ltxt = b.ltext
+            if (
+                not unvisited
+                and not table_open
+                and b.kind == KIND_LABEL
+                and _TRAILER_RE.fullmatch(ltxt.strip())
+            ):
+                done = True
+                break
 
-    i = 0
-    while i < len(page_blocks):
-        b = page_blocks[i]
-        txt = b.text()
-        ltxt = txt.lower()
-
-        # Per-account section header. Same-block form (single-name
-        # accounts) or split across 3 blocks (joint-name accounts).
-        ac_key, consumed = _try_per_account_header(page_blocks, i)
-        if ac_key is not None:
-            cur_account = accounts_by_key.get(ac_key)
-            cur_mode = None
-            cur_section = None
-            i += consumed
-            continue
-
-        # MF Folios detailed-table header
-        if "mutual fund folios (f)" in ltxt:
-            cur_account = mf_folios_account
-            cur_mode = "mf_holdings"
-            cur_section = "mfunds"
-            i += 1
-            continue
-
-        # Table-header rows tell us which kind of holdings table follows.
-        if cur_account is not None:
-            mode = _detect_mode_from_header(b, cur_section)
-            if mode is not None:
-                cur_mode = mode
-                i += 1
+            # Per-account section header. Same-block form (single-name
+            # accounts) or split across 3 blocks (joint-name accounts).
+            ac_key, consumed = (
+                _try_per_account_header(page_blocks, i) if "demat" in ltxt else (None, 1)
+            )
+            if ac_key is not None:
+                cur_account = accounts_by_key.get(ac_key)
+                unvisited.discard(ac_key)
+                cur_mode = None
+                cur_section = None
+                table_open = False
+                i += consumed
                 continue
-            if _is_total_row(b):
+
+            # MF Folios detailed-table header
+            if "mutual fund folios (f)" in ltxt:
+                cur_account = mf_folios_account
+                unvisited.discard(_MF_FOLIOS_KEY)
+                cur_mode = "mf_holdings"
+                cur_section = "mfunds"
+                table_open = True
                 i += 1
                 continue
-            sec = _section_marker_kind(b)
-            if sec is not None:
-                cur_section = sec
-                # Don't clear cur_mode here — for unsupported sections
-                # (preference shares, AIF, etc.) we want subsequent
-                # rows to fall through and be ignored. cur_mode is
-                # cleared/reset when the next table header is seen.
-                cur_mode = None
+
+            # Table-header rows tell us which kind of holdings table follows.
+            if cur_account is not None:
+                mode = _detect_mode_from_header(b, cur_section) if b.kind != KIND_ROW else None
+                if mode is not None:
+                    cur_mode = mode
+                    cur_cols = _compile_columns(mode, b)
+                    table_open = True
+                    i += 1
+                    continue
+                if _is_total_row(b):
+                    table_open = False
+                    i += 1
+                    continue
+                sec = _section_marker_kind(b) if b.kind == KIND_LABEL else None
+                if sec is not None:
+                    cur_section = sec
+                    # Don't clear cur_mode here — for unsupported sections
+                    # (preference shares, AIF, etc.) we want subsequent
+                    # rows to fall through and be ignored. cur_mode is
+                    # cleared/reset when the next table header is seen.
+                    cur_mode = None
+                    table_open = False
+                    i += 1
+                    continue
+
+            # Holdings rows
+            if cur_account is None or cur_mode is None:
                 i += 1
                 continue
-
-        # Holdings rows
-        if cur_account is None or cur_mode is None:
+            if cur_mode == "equities_summary":
+                eq = _parse_equity_row(b, detailed=False, cols=cur_cols)
+                if eq:
+                    cur_account.equities.append(eq)
+            elif cur_mode == "equities_detailed":
+                eq = _parse_equity_row(b, detailed=True, cols=cur_cols)
+                if eq:
+                    cur_account.equities.append(eq)
+            elif cur_mode == "mfunds_summary":
+                mf = _parse_summary_mf_row(b, cur_cols)
+                if mf:
+                    cur_account.mutual_funds.append(mf)
+            elif cur_mode == "mfunds_detailed":
+                mf = _parse_detailed_mf_row(b, cur_cols)
+                if mf:
+                    cur_account.mutual_funds.append(mf)
+            elif cur_mode == "mf_holdings":
+                mf = _parse_mf_holdings_row(b)
+                if mf:
+                    cur_account.mutual_funds.append(mf)
+            elif cur_mode == "bonds_summary":
+                bd = _parse_bond_summary_row(b)
+                if bd:
+                    cur_account.bonds.append(bd)
+            elif cur_mode == "bonds_detailed":
+                bd = _parse_bond_detailed_row(b, cur_cols)
+                if bd:
+                    cur_account.bonds.append(bd)
             i += 1
-            continue
-        if cur_mode == "equities_summary":
-            eq = _parse_equity_row(b, detailed=False)
-            if eq:
-                cur_account.equities.append(eq)
-        elif cur_mode == "equities_detailed":
-            eq = _parse_equity_row(b, detailed=True)
-            if eq:
-                cur_account.equities.append(eq)
-        elif cur_mode == "mfunds_summary":
-            mf = _parse_summary_mf_row(b)
-            if mf:
-                cur_account.mutual_funds.append(mf)
-        elif cur_mode == "mfunds_detailed":
-            mf = _parse_detailed_mf_row(b)
-            if mf:
-                cur_account.mutual_funds.append(mf)
-        elif cur_mode == "mf_holdings":
-            mf = _parse_mf_holdings_row(b)
-            if mf:
-                cur_account.mutual_funds.append(mf)
-        elif cur_mode == "bonds_summary":
-            bd = _parse_bond_summary_row(b)
-            if bd:
-                cur_account.bonds.append(bd)
-        elif cur_mode == "bonds_detailed":
-            bd = _parse_bond_detailed_row(b)
-            if bd:
-                cur_account.bonds.append(bd)
-        i += 1
+        if done:
+            break
 
     return NSDLCASData(
         statement_period=period,
@@ -354,7 +460,7 @@ def parse_nsdl(
         investor_info=extract_nsdl_cdsl_investor(
             pdf_path,
             password,
-            _atoms=atoms,
+            _walk=walk,
         ),
         file_type=file_type,
     )
@@ -491,7 +597,7 @@ def _try_per_account_header(
         return _account_key(type_m.group(1), dpc.group(1), dpc.group(2)), 1
 
     # Case B: look ahead for DP/Client (joint-account header form)
-    if "account holders" in txt.lower() or "account holder" in txt.lower():
+    if "account holder" in b.ltext:
         for j in range(1, 4):
             if i + j >= len(blocks):
                 break
@@ -517,9 +623,9 @@ def _detect_mode_from_header(
     is identical for equities, mutual funds and bonds, and only the
     preceding section marker tells us which.
     """
-    if re.search(r"\b(IN[EF9][0-9A-Z]{8}\d)\b", block.text(), re.I):
+    if block.kind == KIND_ROW:
         return None  # has an ISIN → it's a data row
-    txt = block.text().lower().replace("\n", " ").replace("\t\t", " ")
+    txt = block.ltext.replace("\n", " ").replace("\t\t", " ")
     # MF Holdings (F) — must check before the simpler "folio no" guard
     # since this header also carries "ISIN Description" and "Folio No.".
     if "folio no" in txt and ("average" in txt or "total cost" in txt):
@@ -581,7 +687,7 @@ def _section_marker_kind(block: Block) -> Optional[str]:
     'unsupported') if `block` is a section marker, else None."""
     if len(block.cells) > 2:
         return None
-    txt = block.text().strip().lower()
+    txt = block.ltext.strip()
     if txt in _SECTION_MARKER_MAP:
         return _SECTION_MARKER_MAP[txt]
     if txt in _UNSUPPORTED_SECTION_MARKERS:
@@ -592,7 +698,7 @@ def _section_marker_kind(block: Block) -> Optional[str]:
 # --- generic recognisers ---
 
 
-def _find_period(blocks: List[Block]) -> Optional[StatementPeriod]:
+def _find_period(blocks: PageBlocks) -> Optional[StatementPeriod]:
     for b in blocks:
         m = PERIOD_RE.search(b.text())
         if m:
@@ -602,9 +708,9 @@ def _find_period(blocks: List[Block]) -> Optional[StatementPeriod]:
 
 def _is_table_header(block: Block) -> bool:
     """Column-label row (no ISIN, multiple recognisable header words)."""
-    txt = block.text().lower().replace("\t\t", " ").replace("\n", " ")
-    if re.search(r"\b(IN[EF9][0-9A-Z]{8}\d)\b", txt, re.I):
+    if block.kind == KIND_ROW:
         return False
+    txt = block.ltext.replace("\t\t", " ").replace("\n", " ")
     keywords = (
         "isin description",
         "no. of\nunits",
@@ -632,7 +738,9 @@ def _is_total_row(block: Block) -> bool:
 # --- equity row ---
 
 
-def _parse_equity_row(block: Block, detailed: bool = False) -> Optional[Equity]:
+def _parse_equity_row(
+    block: Block, detailed: bool = False, cols: Optional[ColumnMap] = None
+) -> Optional[Equity]:
     """Equity row. Cell 0 carries the ISIN (sometimes with ticker on a
     second line). Trailing cells are numerics.
 
@@ -644,6 +752,9 @@ def _parse_equity_row(block: Block, detailed: bool = False) -> Optional[Equity]:
       locked_in, safekeep, earmarked, pledged, pledgee, market_price,
       value. We take numerics[0] for num_shares and the last two for
       price / value.
+
+    With `cols` (compiled from the table header), the three fields are
+    read straight from their columns instead.
     """
     if not block.cells:
         return None
@@ -655,6 +766,16 @@ def _parse_equity_row(block: Block, detailed: bool = False) -> Optional[Equity]:
 
     name_cell = block.cells[1].text.replace("\n", " ").strip() if len(block.cells) > 1 else None
 
+    fields = _data_cells(block, cols)
+    if fields is not None:
+        return Equity(
+            name=name_cell,
+            isin=isin,
+            num_shares=_to_decimal(fields["num_shares"].text),
+            price=_to_decimal(fields["price"].text),
+            value=_to_decimal(fields["value"].text),
+        )
+
     numerics = [c.text.strip() for c in block.cells[2:] if _looks_numeric(c.text)]
     if len(numerics) < 3:
         return None
@@ -677,7 +798,7 @@ def _parse_equity_row(block: Block, detailed: bool = False) -> Optional[Equity]:
 # --- summary MF row (per-account 'Mutual Funds (M)' table) ---
 
 
-def _parse_summary_mf_row(block: Block) -> Optional[MutualFund]:
+def _parse_summary_mf_row(block: Block, cols: Optional[ColumnMap] = None) -> Optional[MutualFund]:
     if not block.cells:
         return None
     first = block.cells[0].text.strip()
@@ -685,6 +806,15 @@ def _parse_summary_mf_row(block: Block) -> Optional[MutualFund]:
         return None
     isin = first
     name = block.cells[1].text.replace("\n", " ").strip() if len(block.cells) > 1 else None
+    fields = _data_cells(block, cols)
+    if fields is not None:
+        return MutualFund(
+            name=name,
+            isin=isin,
+            balance=_to_decimal(fields["balance"].text),
+            nav=_to_decimal(fields["nav"].text),
+            value=_to_decimal(fields["value"].text),
+        )
     numerics = [c.text.strip() for c in block.cells[2:] if _looks_numeric(c.text)]
     if len(numerics) < 3:
         return None
@@ -766,7 +896,7 @@ def _parse_mf_holdings_row(block: Block) -> Optional[MutualFund]:
 # --- detailed MF row (CDSL-style 'Mutual Funds (M)' table) ---
 
 
-def _parse_detailed_mf_row(block: Block) -> Optional[MutualFund]:
+def _parse_detailed_mf_row(block: Block, cols: Optional[ColumnMap] = None) -> Optional[MutualFund]:
     """Detailed 'Mutual Funds (M)' row on a CDSL demat-account page.
 
     Same 18-column header / 13-cell data row as detailed equities;
@@ -780,6 +910,15 @@ def _parse_detailed_mf_row(block: Block) -> Optional[MutualFund]:
         return None
     isin = first
     name = block.cells[1].text.replace("\n", " ").strip() if len(block.cells) > 1 else None
+    fields = _data_cells(block, cols)
+    if fields is not None:
+        return MutualFund(
+            name=name,
+            isin=isin,
+            balance=_to_decimal(fields["balance"].text),
+            nav=_to_decimal(fields["price"].text),
+            value=_to_decimal(fields["value"].text),
+        )
     numerics = [c.text.strip() for c in block.cells[2:] if _looks_numeric(c.text)]
     if len(numerics) < 3:
         return None
@@ -854,7 +993,7 @@ def _parse_bond_summary_row(block: Block) -> Optional[Bond]:
     )
 
 
-def _parse_bond_detailed_row(block: Block) -> Optional[Bond]:
+def _parse_bond_detailed_row(block: Block, cols: Optional[ColumnMap] = None) -> Optional[Bond]:
     """CDSL-flavour detailed bonds row (13 data cells, same layout as
     detailed equities). Yields only `num_bonds`, `market_price` and
     `value` — the detailed table doesn't carry coupon / maturity /
@@ -867,6 +1006,15 @@ def _parse_bond_detailed_row(block: Block) -> Optional[Bond]:
         return None
     isin = first
     name = block.cells[1].text.replace("\n", " ").strip() if len(block.cells) > 1 else None
+    fields = _data_cells(block, cols)
+    if fields is not None:
+        return Bond(
+            name=name,
+            isin=isin,
+            num_bonds=_to_decimal(fields["balance"].text),
+            value=_to_decimal(fields["value"].text),
+            market_price=_opt_decimal(fields["price"].text),
+        )
     numerics = [c.text.strip() for c in block.cells[2:] if _looks_numeric(c.text)]
     if len(numerics) < 3:
         return None
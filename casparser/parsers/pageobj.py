@@ -38,13 +38,30 @@ The output is compatible with `text.split("\\u2029")` in
 from __future__ import annotations
 
 import ctypes
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-import pypdfium2 as pdfium
 import pypdfium2.raw as pdfium_raw
 
-from .extract import _is_non_latin_font
+from .extract import _is_non_latin_font, _obj_key
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pypdfium2 as pdfium
+
+    from .walk import DocumentWalk
 
 # y_top tolerance for grouping atoms into one *raw line*. Text-show ops
 # on the same visual line share an identical baseline; 1.5pt absorbs
@@ -90,18 +107,64 @@ class Atom:
     stream_seq: int = 0
 
 
-def _read_text_obj(obj, tp_handle, buf, fname_buf) -> Tuple[str, str]:
+class _TextObjReader:
+    """Decodes one page's text objects with a single set of ctypes
+    buffers and one reusable `FS_MATRIX`. Font names and their
+    non-Latin verdict are cached per font handle, since a page shows
+    hundreds of text objects in a handful of fonts."""
+
+    __slots__ = ("tp_handle", "buf", "fname_buf", "mtx", "p_mtx", "fonts")
+
+    def __init__(self, tp_handle):
+        self.tp_handle = tp_handle
+        self.buf = (ctypes.c_ushort * (_TEXT_BUF_SIZE // 2))()
+        self.fname_buf = (ctypes.c_char * _FONT_BUF_SIZE)()
+        self.mtx = pdfium_raw.FS_MATRIX()
+        self.p_mtx = ctypes.byref(self.mtx)
+        self.fonts: dict = {}  # font handle address -> name, or None if non-Latin
+
+    def is_vertical(self, obj) -> bool:
+        """True for text whose glyph advance vector `(a, b)` runs
+        vertically (`|b| > |a|`)."""
+        mtx = self.mtx
+        return bool(pdfium_raw.FPDFPageObj_GetMatrix(obj, self.p_mtx)) and abs(mtx.b) > abs(mtx.a)
+
+    def text(self, obj) -> str:
+        # The return value is the byte length INCLUDING the UTF-16 null
+        # terminator; decode just those bytes, not the whole buffer.
+        n = pdfium_raw.FPDFTextObj_GetText(obj, self.tp_handle, self.buf, _TEXT_BUF_SIZE)
+        buf = self.buf
+        if n > _TEXT_BUF_SIZE:  # PDFium leaves a too-small buffer untouched
+            buf = (ctypes.c_ushort * (n // 2))()
+            n = pdfium_raw.FPDFTextObj_GetText(obj, self.tp_handle, buf, n)
+        if n <= 2:
+            return ""
+        return ctypes.string_at(buf, n - 2).decode("utf-16-le", errors="replace")
+
+    def font(self, obj) -> Optional[str]:
+        """Base font name of `obj`, or None if the font is non-Latin."""
+        handle = pdfium_raw.FPDFTextObj_GetFont(obj)
+        key = _obj_key(handle)
+        try:
+            return self.fonts[key]
+        except KeyError:
+            pass
+        fn = pdfium_raw.FPDFFont_GetBaseFontName(handle, self.fname_buf, _FONT_BUF_SIZE)
+        fname = (
+            self.fname_buf.raw[: max(0, fn - 1)].decode("utf-8", errors="replace") if fn > 0 else ""
+        )
+        name = self.fonts[key] = None if _is_non_latin_font(fname) else fname
+        return name
+
+
+def _read_text_obj(obj, reader: _TextObjReader) -> Tuple[str, str]:
     """Decode a text object's content and font name. Returns ('', '') if
     the object has no readable text or its font is non-Latin."""
-    cc = pdfium_raw.FPDFTextObj_GetText(obj, tp_handle, buf, _TEXT_BUF_SIZE)
-    # `cc` is byte length INCLUDING null terminator. Strip the null.
-    text = bytes(buf)[: max(0, cc - 2)].decode("utf-16-le", errors="replace")
+    text = reader.text(obj)
     if not text.strip():
         return "", ""
-    font = pdfium_raw.FPDFTextObj_GetFont(obj)
-    fn = pdfium_raw.FPDFFont_GetBaseFontName(font, fname_buf, _FONT_BUF_SIZE)
-    fname = fname_buf.raw[: max(0, fn - 1)].decode("utf-8", errors="replace") if fn > 0 else ""
-    if _is_non_latin_font(fname):
+    fname = reader.font(obj)
+    if fname is None:
         return "", ""
     return text, fname
 
@@ -151,56 +214,56 @@ def extract_atoms(
     password: str,
     *,
     _doc: "Optional[pdfium.PdfDocument]" = None,
+    _walk: "Optional[DocumentWalk]" = None,
 ) -> List[List[Atom]]:
     """Return one list of Atoms per page (in object-index order).
     Recurses into Form XObjects (CDSL CAS PDFs nest their entire page
     inside a top-level FORM).
 
-    When `_doc` is provided, reuse it instead of re-opening the PDF —
-    the dispatcher opens the document exactly once and threads it
-    through detect / parser / investor extractor.
+    When `_doc` / `_walk` is provided, reuse it instead of re-opening
+    the PDF — the dispatcher opens the document exactly once and
+    threads one page walk through detect / parser / investor extractor.
     """
-    doc = _doc if _doc is not None else pdfium.PdfDocument(pdf_path, password=password)
-    pages: List[List[Atom]] = []
+    from .walk import get_walk
+
+    return get_walk(pdf_path, password, _doc=_doc, _walk=_walk).atoms()
+
+
+def _page_atoms(page, tp) -> List[Atom]:
+    """Walk one page's text objects into deduplicated `Atom`s."""
     left = ctypes.c_float()
     bottom = ctypes.c_float()
     right = ctypes.c_float()
     top = ctypes.c_float()
-    buf = (ctypes.c_ushort * (_TEXT_BUF_SIZE // 2))()
-    fname_buf = (ctypes.c_char * _FONT_BUF_SIZE)()
-    for page in doc:
-        page_handle = page.raw
-        tp = page.get_textpage()
-        tp_handle = tp.raw
-        atoms: List[Atom] = []
-        seen: set = set()  # dedup by (x_left, y_top, text)
-        counter = _StreamCounter()
-        for obj, seq in _iter_text_objects(page_handle, is_form=False, counter=counter):
-            # Skip vertically-oriented text — the rotated CAS watermark
-            # ("CAMSCASWS… / NSDLCASWS…") whose glyphs otherwise bleed
-            # down the right-hand columns. The object matrix's glyph
-            # advance vector is (a, b); |b| > |a| means a vertical run.
-            mtx = pdfium_raw.FS_MATRIX()
-            if pdfium_raw.FPDFPageObj_GetMatrix(obj, ctypes.byref(mtx)) and abs(mtx.b) > abs(mtx.a):
-                continue
-            text, fname = _read_text_obj(obj, tp_handle, buf, fname_buf)
-            if not text:
-                continue
-            pdfium_raw.FPDFPageObj_GetBounds(
-                obj,
-                ctypes.byref(left),
-                ctypes.byref(bottom),
-                ctypes.byref(right),
-                ctypes.byref(top),
-            )
-            xl, xr, yt, yb = left.value, right.value, top.value, bottom.value
-            key = (round(xl, 1), round(yt, 1), text)
-            if key in seen:
-                continue
-            seen.add(key)
-            atoms.append(Atom(xl, xr, yt, yb, text, fname, stream_seq=seq))
-        pages.append(_dedupe_overlapping(atoms))
-    return pages
+    reader = _TextObjReader(tp.raw)
+    page_handle = page.raw
+    atoms: List[Atom] = []
+    seen: set = set()  # dedup by (x_left, y_top, text)
+    counter = _StreamCounter()
+    for obj, seq in _iter_text_objects(page_handle, is_form=False, counter=counter):
+        # Skip vertically-oriented text — the rotated CAS watermark
+        # ("CAMSCASWS… / NSDLCASWS…") whose glyphs otherwise bleed
+        # down the right-hand columns. The object matrix's glyph
+        # advance vector is (a, b); |b| > |a| means a vertical run.
+        if reader.is_vertical(obj):
+            continue
+        text, fname = _read_text_obj(obj, reader)
+        if not text:
+            continue
+        pdfium_raw.FPDFPageObj_GetBounds(
+            obj,
+            ctypes.byref(left),
+            ctypes.byref(bottom),
+            ctypes.byref(right),
+            ctypes.byref(top),
+        )
+        xl, xr, yt, yb = left.value, right.value, top.value, bottom.value
+        key = (round(xl, 1), round(yt, 1), text)
+        if key in seen:
+            continue
+        seen.add(key)
+        atoms.append(Atom(xl, xr, yt, yb, text, fname, stream_seq=seq))
+    return _dedupe_overlapping(atoms)
 
 
 def _dedupe_overlapping(atoms: List[Atom]) -> List[Atom]:
@@ -219,22 +282,17 @@ def _dedupe_overlapping(atoms: List[Atom]) -> List[Atom]:
         by_line.setdefault(round(a.y_top, 1), []).append(a)
 
     keep: List[Atom] = []
-    for y, line_atoms in by_line.items():
-        kept_at_y: List[Atom] = []
+    for line_atoms in by_line.values():
+        # Kept atoms at this y, keyed by stripped text: only same-text
+        # atoms can be duplicates, so each check is an x-overlap test
+        # against the (usually zero or one) kept twins.
+        kept_by_text: dict = {}
         for a in line_atoms:
-            atxt = a.text.strip()
-            is_dup = False
-            for k in kept_at_y:
-                ktxt = k.text.strip()
-                if atxt != ktxt:
-                    continue
-                # x-range overlap?
-                if a.x_left < k.x_right and k.x_left < a.x_right:
-                    is_dup = True
-                    break
-            if not is_dup:
-                kept_at_y.append(a)
-        keep.extend(kept_at_y)
+            twins = kept_by_text.setdefault(a.text.strip(), [])
+            if any(a.x_left < k.x_right and k.x_left < a.x_right for k in twins):
+                continue
+            twins.append(a)
+            keep.append(a)
     return keep
 
 
@@ -318,27 +376,44 @@ def _column_cluster(block_atoms: List[Atom]) -> List[List[Atom]]:
     behaviour as production.
     """
     strips: List[List[Atom]] = []
+    # Open strips bucketed by their last atom's x_left in `X_LEFT_TOL`
+    # wide bins, so an atom only looks at strips in its own and the two
+    # neighbouring bins. Atoms arrive top-down, so a strip whose last
+    # atom is more than `STRIP_VERTICAL_GAP` above the current one can
+    # never grow again and is dropped from the index.
+    buckets: Dict[int, List[int]] = {}
     for a in sorted(block_atoms, key=lambda x: (-x.y_top, x.x_left)):
-        placed = False
         a_center = (a.x_left + a.x_right) / 2
-        for strip in strips:
-            last = strip[-1]
-            x_left_ok = abs(a.x_left - last.x_left) <= X_LEFT_TOL
-            y_ok = -0.1 <= last.y_top - a.y_top <= STRIP_VERTICAL_GAP
-            if not (x_left_ok and y_ok):
+        at_left_edge = a.x_left < LEFT_EDGE_X
+        key = int(a.x_left // X_LEFT_TOL)
+        best = None
+        for k in (key - 1, key, key + 1):
+            members = buckets.get(k)
+            if not members:
                 continue
-            # Left-edge column: trust x_left match. Mid-table columns:
-            # also require centre drift so centre-aligned headers don't
-            # collapse into a single cell.
-            at_left_edge = a.x_left < LEFT_EDGE_X
-            last_center = (last.x_left + last.x_right) / 2
-            center_drifts = abs(a_center - last_center) > CENTER_LEFT_ALIGN_TOL
-            if at_left_edge or center_drifts:
-                strip.append(a)
-                placed = True
-                break
-        if not placed:
+            for idx in list(members):
+                last = strips[idx][-1]
+                if last.y_top - a.y_top > STRIP_VERTICAL_GAP:
+                    members.remove(idx)
+                    continue
+                if best is not None and idx > best:
+                    continue
+                if abs(a.x_left - last.x_left) > X_LEFT_TOL:
+                    continue
+                # Left-edge column: trust x_left match. Mid-table
+                # columns: also require centre drift so centre-aligned
+                # headers don't collapse into a single cell.
+                last_center = (last.x_left + last.x_right) / 2
+                if at_left_edge or abs(a_center - last_center) > CENTER_LEFT_ALIGN_TOL:
+                    best = idx
+        if best is None:
+            best = len(strips)
             strips.append([a])
+        else:
+            last = strips[best][-1]
+            buckets[int(last.x_left // X_LEFT_TOL)].remove(best)
+            strips[best].append(a)
+        buckets.setdefault(key, []).append(best)
     return strips
 
 
@@ -358,32 +433,216 @@ class Cell:
     atoms: List[Atom]  # the underlying text-show ops, for debugging
 
 
+# Block `kind` hints, so the NSDL/CDSL state machines only run the
+# recognisers that can apply to a block.
+KIND_ROW = "row"  # carries an Indian ISIN token: a holdings data row
+KIND_LABEL = "label"  # at most two cells: titles and section markers
+KIND_TEXT = "text"  # anything else: column headers, section headers, prose
+
+# Case-insensitive ISIN token anywhere in a block's text; the header
+# recognisers reject any block that carries one.
+ISIN_TOKEN_RE = re.compile(r"\b(IN[EF9][0-9A-Z]{8}\d)\b", re.I)
+
+
+def _block_kind(cells: List[Cell], text: str) -> str:
+    if ISIN_TOKEN_RE.search(text):
+        return KIND_ROW
+    if len(cells) <= 2:
+        return KIND_LABEL
+    return KIND_TEXT
+
+
 @dataclass
 class Block:
-    """A logical row block. Cells are sorted left→right by x_left."""
+    """A logical row block. Cells are sorted left→right by x_left.
+
+    The bbox, the joined text (plus its lowercase form) and the `kind`
+    hint are computed once at construction; `cells` is not expected to
+    change afterwards.
+    """
 
     page: int  # 1-indexed page number
     cells: List[Cell]
+    y_top: float = field(init=False, repr=False, compare=False)
+    y_bot: float = field(init=False, repr=False, compare=False)
+    x_left: float = field(init=False, repr=False, compare=False)
+    x_right: float = field(init=False, repr=False, compare=False)
+    ltext: str = field(init=False, repr=False, compare=False)
+    kind: str = field(init=False, repr=False, compare=False)
+    _text: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        cells = self.cells
+        self.y_top = max((c.y_top for c in cells), default=0.0)
+        self.y_bot = min((c.y_bot for c in cells), default=0.0)
+        self.x_left = min((c.x_left for c in cells), default=0.0)
+        self.x_right = max((c.x_right for c in cells), default=0.0)
+        self._text = "\t\t".join(c.text for c in cells if c.text)
+        self.ltext = self._text.lower()
+        self.kind = _block_kind(cells, self._text)
 
-    @property
-    def y_top(self) -> float:
-        return max((c.y_top for c in self.cells), default=0.0)
+    def text(self) -> str:
+        """Lossy single-string view (cells joined by `\\t\\t`)."""
+        return self._text
 
-    @property
-    def y_bot(self) -> float:
-        return min((c.y_bot for c in self.cells), default=0.0)
+
+class PageBlocks:
+    """`Block`s in reading order, indexed by page.
+
+    Iterates and indexes like a flat list of blocks; `page` and
+    `from_page` slice out one page, or every page from a given one on,
+    without scanning the blocks before it.
+
+    With a `source` (see `blocks_from_walk`), pages are clustered on
+    first use: iteration and `iter_pages` pull one page at a time, so a
+    consumer that stops early never extracts the pages after it.
+    `len()`, indexing and `from_page` load every page.
+    """
+
+    def __init__(self, source: Optional[Callable[[int], List[Block]]] = None, page_count: int = 0):
+        self._blocks: List[Block] = []
+        # `_starts[n - 1]` is the offset of page n's first block; the
+        # last entry is the count of blocks loaded so far.
+        self._starts: List[int] = [0]
+        self._source = source
+        self._page_count = page_count
 
     @property
-    def x_left(self) -> float:
-        return min((c.x_left for c in self.cells), default=0.0)
+    def page_count(self) -> int:
+        return max(self._page_count, self.loaded)
 
     @property
-    def x_right(self) -> float:
-        return max((c.x_right for c in self.cells), default=0.0)
+    def loaded(self) -> int:
+        """Number of pages clustered so far."""
+        return len(self._starts) - 1
+
+    def append_page(self, blocks: List[Block]) -> None:
+        """Add the next page's blocks (page numbers are 1-indexed)."""
+        self._blocks.extend(blocks)
+        self._starts.append(len(self._blocks))
+
+    def _load(self, number: int) -> None:
+        """Cluster pages from the source up to and including `number`."""
+        if self._source is None:
+            return
+        for page_num in range(self.loaded + 1, min(number, self._page_count) + 1):
+            self.append_page(self._source(page_num))
+
+    def page(self, number: int) -> List[Block]:
+        """Blocks on the 1-indexed page `number`."""
+        if not 1 <= number <= self.page_count:
+            return []
+        self._load(number)
+        return self._blocks[self._starts[number - 1] : self._starts[number]]
+
+    def from_page(self, number: int) -> List[Block]:
+        """Blocks on page `number` and every later page."""
+        number = max(number, 1)
+        if number > self.page_count:
+            return []
+        self._load(self.page_count)
+        return self._blocks[self._starts[number - 1] :]
+
+    def iter_pages(self, start: int = 1) -> Iterator[List[Block]]:
+        """Yield each page's blocks from page `start` on, loading lazily."""
+        for number in range(max(start, 1), self.page_count + 1):
+            yield self.page(number)
+
+    def __iter__(self) -> Iterator[Block]:
+        for blocks in self.iter_pages():
+            yield from blocks
+
+    def __len__(self) -> int:
+        self._load(self.page_count)
+        return len(self._blocks)
+
+    def __getitem__(self, index):
+        self._load(self.page_count)
+        return self._blocks[index]
+
+
+@dataclass(frozen=True)
+class ColumnMap:
+    """x-band → field map for one table, compiled once from its header row.
+
+    Each header cell takes the first not-yet-claimed field whose
+    keywords occur in its lowercased label (so ``("_face_value",
+    ("face value",))`` listed before ``("value", ("value",))`` keeps the
+    bare value column unambiguous). Bands split halfway between
+    neighbouring header cells' centres, and a data cell belongs to the
+    band its own centre falls in. Fields starting with `_` only mark a
+    column so its cells aren't mistaken for another field.
+    """
 
-    def text(self) -> str:
-        """Lossy single-string view (cells joined by `\\t\\t`)."""
-        return "\t\t".join(c.text for c in self.cells if c.text)
+    edges: Tuple[float, ...]
+    fields: Tuple[Optional[str], ...]
+    required: FrozenSet[str]
+    first_data: int  # band index of the first labelled column
+
+    @classmethod
+    def compile(
+        cls,
+        header: Block,
+        spec: Sequence[Tuple[str, Sequence[str]]],
+        required: Optional[Iterable[str]] = None,
+    ) -> Optional["ColumnMap"]:
+        """Build the map for `header`, or None if its cells don't run
+        strictly left to right or a required field has no column.
+        `required` defaults to every non-`_` field of `spec`."""
+        centres: List[float] = []
+        fields: List[Optional[str]] = []
+        claimed = set()
+        for cell in header.cells:
+            centre = (cell.x_left + cell.x_right) / 2
+            if centres and centre <= centres[-1]:
+                return None
+            label = cell.text.lower().replace("\n", " ")
+            field_name = next(
+                (
+                    name
+                    for name, keywords in spec
+                    if name not in claimed and any(k in label for k in keywords)
+                ),
+                None,
+            )
+            if field_name is not None:
+                claimed.add(field_name)
+            centres.append(centre)
+            fields.append(field_name)
+        if required is None:
+            required = (name for name, _ in spec if not name.startswith("_"))
+        required = frozenset(required)
+        if not required <= claimed:
+            return None
+        first_data = next((i for i, name in enumerate(fields) if name is not None), len(fields))
+        edges = tuple((a + b) / 2 for a, b in zip(centres, centres[1:]))
+        return cls(edges, tuple(fields), required, first_data)
+
+    @property
+    def width(self) -> int:
+        return len(self.fields)
+
+    def split(self, block: Block, start: int = 0) -> Optional[Tuple[List[Cell], Dict[str, Cell]]]:
+        """Decode `block.cells[start:]` into the cells left of the first
+        labelled column and the cell of each labelled field. Returns
+        None if a field is hit twice or a required field is missing."""
+        lead: List[Cell] = []
+        by_field: Dict[str, Cell] = {}
+        edges, fields, first_data = self.edges, self.fields, self.first_data
+        for cell in block.cells[start:]:
+            band = bisect_right(edges, (cell.x_left + cell.x_right) / 2)
+            if band < first_data:
+                lead.append(cell)
+                continue
+            name = fields[band]
+            if name is None:
+                continue
+            if name in by_field:
+                return None
+            by_field[name] = cell
+        if not self.required <= by_field.keys():
+            return None
+        return lead, by_field
 
 
 def _join_column_atoms(atoms_top_down: List[Atom]) -> str:
@@ -444,28 +703,44 @@ def _cells_from_block_atoms(block_atoms: List[Atom]) -> List[Cell]:
     return cells
 
 
-def blocks_from_atoms(pages: List[List[Atom]]) -> List[Block]:
-    """Convert pre-extracted atoms into `Block`s. Lets a single
-    `extract_atoms` call feed both the holdings parser and the
-    investor extractor in one go (NSDL/CDSL)."""
+def _page_blocks(page_num: int, atoms: List[Atom]) -> List[Block]:
+    """Cluster one page's atoms into `Block`s."""
     out: List[Block] = []
+    for block_atoms in _cluster_blocks(_cluster_raw_lines(atoms)):
+        cells = _cells_from_block_atoms(block_atoms)
+        if cells:
+            out.append(Block(page=page_num, cells=cells))
+    return out
+
+
+def blocks_from_atoms(pages: List[List[Atom]]) -> PageBlocks:
+    """Convert pre-extracted atoms into page-indexed `Block`s. Lets a
+    single `extract_atoms` call feed both the holdings parser and the
+    investor extractor in one go (NSDL/CDSL)."""
+    out = PageBlocks()
     for page_num, atoms in enumerate(pages, start=1):
-        raw_lines = _cluster_raw_lines(atoms)
-        atom_blocks = _cluster_blocks(raw_lines)
-        for block_atoms in atom_blocks:
-            cells = _cells_from_block_atoms(block_atoms)
-            if cells:
-                out.append(Block(page=page_num, cells=cells))
+        out.append_page(_page_blocks(page_num, atoms))
     return out
 
 
+def blocks_from_walk(walk: "DocumentWalk") -> PageBlocks:
+    """Page-indexed `Block`s over `walk`, extracting each page's atoms
+    only when a consumer first reaches that page."""
+
+    def source(page_num: int) -> List[Block]:
+        return _page_blocks(page_num, walk.page(page_num - 1).atoms)
+
+    return PageBlocks(source, len(walk))
+
+
 def extract_blocks(
     pdf_path: str,
     password: str,
     *,
     _doc: "Optional[pdfium.PdfDocument]" = None,
+    _walk: "Optional[DocumentWalk]" = None,
     _atoms: "Optional[List[List[Atom]]]" = None,
-) -> List[Block]:
+) -> PageBlocks:
     """Return a flat list of `Block`s across all pages, in reading
     order (top-down per page, pages in document order). Entry point
     that dedicated NSDL/CDSL parsers consume.
@@ -474,5 +749,7 @@ def extract_blocks(
     extracts atoms once and feeds both the parser and the investor
     extractor.
     """
-    pages = _atoms if _atoms is not None else extract_atoms(pdf_path, password, _doc=_doc)
+    pages = (
+        _atoms if _atoms is not None else extract_atoms(pdf_path, password, _doc=_doc, _walk=_walk)
+    )
     return blocks_from_atoms(pages)
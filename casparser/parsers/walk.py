@@ -0,0 +1,129 @@
+"""Single-pass page walk shared by detection, parsers and investor extraction.
+
+A CAMS/KFin DETAILED statement used to be read four times: page 1-2
+text for `detect_file_type`, page 1 again for `detect_cas_type`, every
+page for `extract.extract_pages`, and then a full `pageobj.extract_atoms`
+walk just so the investor extractor could look at page 1.
+
+`DocumentWalk` loads each page (and its text page) once and memoises the
+per-page intermediates the consumers need:
+
+  - `WalkedPage.text`  — raw page text (issuer / statement-type sniffing)
+  - `WalkedPage.lines` — baseline-clustered `extract.Line`s (CAMS/KFin)
+  - `WalkedPage.atoms` — `pageobj.Atom`s (investor block, NSDL/CDSL)
+
+Each intermediate is computed on first access and shared by every later
+consumer, so detection reading page 1 and the parser reading page 1
+cost one text-page load between them, and the investor extractor only
+ever walks the page it actually reads.
+
+Streaming consumers (`extract.iter_pages`) call `DocumentWalk.release`
+once they are done with a page, which closes its pdfium page / text
+page handles and drops the memoised intermediates, so peak memory stays
+bounded by one page rather than growing with the page count.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional
+
+import pypdfium2 as pdfium
+
+
+class WalkedPage:
+    """One PDF page plus its lazily-computed intermediates."""
+
+    def __init__(self, number: int, page: pdfium.PdfPage):
+        self.number = number  # 1-indexed
+        self.page = page
+
+    @cached_property
+    def textpage(self) -> pdfium.PdfTextPage:
+        return self.page.get_textpage()
+
+    @cached_property
+    def text(self) -> str:
+        return self.textpage.get_text_bounded()
+
+    @cached_property
+    def lines(self):
+        """Baseline-clustered `extract.Line`s for the CAMS/KFin parsers."""
+        from .extract import _page_lines
+
+        return _page_lines(self.page, self.textpage, self.number)
+
+    @cached_property
+    def atoms(self):
+        """Deduplicated `pageobj.Atom`s (one per text-show op)."""
+        from .pageobj import _page_atoms
+
+        return _page_atoms(self.page, self.textpage)
+
+    def close(self) -> None:
+        """Close the text page (if it was loaded) and the page handle."""
+        textpage = self.__dict__.pop("textpage", None)
+        if textpage is not None:
+            textpage.close()
+        self.page.close()
+
+
+class DocumentWalk:
+    """Memoising page walker over an open `pdfium.PdfDocument`.
+
+    Pages are loaded on first access and kept until `release` is called
+    for them; closing the document releases whatever is left along with
+    every other child handle.
+    """
+
+    def __init__(self, doc: pdfium.PdfDocument):
+        self.doc = doc
+        self._pages: Dict[int, WalkedPage] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc)
+
+    def page(self, index: int) -> WalkedPage:
+        """Return the `WalkedPage` for the 0-based page `index`."""
+        wp = self._pages.get(index)
+        if wp is None:
+            wp = WalkedPage(index + 1, self.doc[index])
+            self._pages[index] = wp
+        return wp
+
+    def release(self, index: int) -> None:
+        """Close and forget the 0-based page `index`. A later `page` call
+        for the same index reloads it from the document."""
+        wp = self._pages.pop(index, None)
+        if wp is not None:
+            wp.close()
+
+    def __iter__(self) -> Iterator[WalkedPage]:
+        for index in range(len(self)):
+            yield self.page(index)
+
+    def text(self, max_pages: int) -> str:
+        """Raw text of the first `max_pages` pages, newline-joined."""
+        return "\n".join(self.page(i).text for i in range(min(max_pages, len(self))))
+
+    def atoms(self) -> List[list]:
+        """One list of `pageobj.Atom`s per page, in document order."""
+        return [wp.atoms for wp in self]
+
+
+def get_walk(
+    pdf_path,
+    password,
+    *,
+    _doc: Optional[pdfium.PdfDocument] = None,
+    _walk: Optional[DocumentWalk] = None,
+) -> DocumentWalk:
+    """Resolve the dispatcher-provided overrides into a `DocumentWalk`.
+
+    Prefers `_walk`, then wraps `_doc`, and finally opens the PDF from
+    `pdf_path` so the path-based signatures stay usable for direct calls.
+    """
+    if _walk is not None:
+        return _walk
+    doc = _doc if _doc is not None else pdfium.PdfDocument(pdf_path, password=password)
+    return DocumentWalk(doc)
@@ -0,0 +1,665 @@
+"""Unit tests for the CAMS/KFin extraction layer (`parsers.walk`,
+`parsers.extract`) on small synthetic PDFs built with pdfium's
+text-object API, so they run without the encrypted sample bundle."""
+
+from __future__ import annotations
+
+import ctypes
+from decimal import Decimal
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_raw
+import pytest
+
+from casparser.enums import CASFileType, FileType
+from casparser.parsers import cdsl, nsdl
+from casparser.parsers._investor import extract_cams_kfin_investor
+from casparser.parsers.cams_detailed import (
+    Column,
+    ColumnLayout,
+    _template_columns,
+    detect_txn_columns,
+)
+from casparser.parsers.cdsl import parse_cdsl
+from casparser.parsers.detect import detect_cas_type, detect_file_type
+from casparser.parsers.extract import (
+    GlyphStore,
+    Line,
+    _Atom,
+    _cluster_into_lines,
+    _dedupe_overlay_atoms,
+    iter_pages,
+)
+from casparser.parsers.nsdl import parse_nsdl
+from casparser.parsers.pageobj import (
+    _TEXT_BUF_SIZE,
+    KIND_LABEL,
+    KIND_ROW,
+    KIND_TEXT,
+    Atom,
+    Block,
+    Cell,
+    ColumnMap,
+    PageBlocks,
+    _cells_from_block_atoms,
+    _page_atoms,
+    blocks_from_atoms,
+)
+from casparser.parsers.walk import DocumentWalk
+
+
+def _put(pdf, page, text, x, y, size=8.0):
+    obj = pdfium_raw.FPDFPageObj_NewTextObj(pdf.raw, b"Helvetica", ctypes.c_float(size))
+    ws = (text + "\x00").encode("utf-16-le")
+    buf = ctypes.create_string_buffer(ws, len(ws))
+    pdfium_raw.FPDFText_SetText(obj, ctypes.cast(buf, ctypes.POINTER(pdfium_raw.FPDF_WCHAR)))
+    pdfium_raw.FPDFPageObj_Transform(obj, 1, 0, 0, 1, x, y)
+    pdfium_raw.FPDFPage_InsertObject(page.raw, obj)
+
+
+def _text_pdf(path, pages):
+    """Write a PDF with one page per entry of `pages`, each a list of
+    `(text, x, y)` placements, and return the path as a string."""
+    pdf = pdfium.PdfDocument.new()
+    for placements in pages:
+        page = pdf.new_page(595, 842)
+        for text, x, y in placements:
+            _put(pdf, page, text, x, y)
+        pdfium_raw.FPDFPage_GenerateContent(page.raw)
+    pdf.save(str(path))
+    return str(path)
+
+
+_PAGE_1 = [
+    ("CAMSCASWS", 400, 820),
+    ("Consolidated Account Statement", 200, 800),
+    ("Email Id: someone@example.com", 40, 760),
+    ("Jane Investor", 40, 750),
+    ("1 Main Road", 40, 740),
+    ("Mobile: +919999999999", 40, 730),
+]
+
+
+@pytest.fixture
+def three_page_pdf(tmp_path):
+    return _text_pdf(tmp_path / "walk.pdf", [_PAGE_1, [("page two", 40, 800)], [("x", 40, 800)]])
+
+
+class TestDocumentWalk:
+    def test_pages_and_intermediates_are_memoised(self, three_page_pdf):
+        doc = pdfium.PdfDocument(three_page_pdf)
+        try:
+            walk = DocumentWalk(doc)
+            assert len(walk) == 3
+            first = walk.page(0)
+            assert walk.page(0) is first
+            assert first.lines is first.lines
+            assert first.atoms is first.atoms
+            assert [wp.number for wp in walk] == [1, 2, 3]
+        finally:
+            doc.close()
+
+    def test_detection_and_investor_share_page_one(self, three_page_pdf):
+        doc = pdfium.PdfDocument(three_page_pdf)
+        try:
+            walk = DocumentWalk(doc)
+            assert detect_file_type(three_page_pdf, "", _walk=walk) == FileType.CAMS
+            assert detect_cas_type(three_page_pdf, "", _walk=walk) == CASFileType.DETAILED
+            info = extract_cams_kfin_investor(three_page_pdf, "", _walk=walk)
+            assert info.name == "Jane Investor"
+            assert info.mobile == "+919999999999"
+            # Detection sampled pages 1-2; the investor block never
+            # needs anything past page 1, so page 3 was never loaded.
+            assert sorted(walk._pages) == [0, 1]
+        finally:
+            doc.close()
+
+    def test_iter_pages_releases_each_page(self, three_page_pdf):
+        doc = pdfium.PdfDocument(three_page_pdf)
+        try:
+            walk = DocumentWalk(doc)
+            seen = []
+            for page in iter_pages(three_page_pdf, "", _walk=walk):
+                # Earlier pages are closed by the time the next is built.
+                assert sorted(walk._pages) == []
+                seen.append((page.number, [line.text for line in page.lines]))
+            assert seen[1] == (2, ["page two"])
+            assert [n for n, _ in seen] == [1, 2, 3]
+        finally:
+            doc.close()
+
+
+class TestGlyphStore:
+    def test_lines_are_left_to_right_ranges_over_compacted_store(self):
+        store = GlyphStore()
+        fid = store.intern_font("Helvetica")
+        atoms = []
+        # Two atoms per row, emitted right-hand atom first.
+        for x_left, y, text in ((40, 700.0, "Units"), (10, 700.3, "Date"), (10, 680.0, "Row")):
+            atom = _Atom(x_left, x_left + 5 * len(text), y + 6, y, "Helvetica", fid)
+            for k, ch in enumerate(text):
+                atom.glyphs.append(len(store))
+                store.append(ch, fid, x_left + 5 * k, y, x_left + 5 * k + 4, y + 6)
+            atoms.append(atom)
+        lines = _cluster_into_lines(store, atoms, page_num=1)
+        assert [line.text for line in lines] == ["Date Units", "Row"]
+        assert [(line.start, line.stop) for line in lines] == [(0, 9), (9, 12)]
+        assert lines[0].store is lines[1].store
+        assert len(lines[0].store) == 12
+        assert [c.text for c in lines[0].chars][:4] == list("Date")
+        assert lines[0].chars[0].font == "Helvetica"
+
+
+class TestOverlayDedup:
+    def test_drops_only_the_off_median_same_font_twin(self):
+        atoms = [
+            _Atom(10, 50, 700.0, 694, "F", 0),  # date
+            _Atom(10, 50, 700.7, 694.7, "F", 0),  # overlay twin
+            _Atom(60, 90, 700.0, 694, "F", 0),  # next cell
+            _Atom(12, 48, 700.7, 694.7, "G", 1),  # other font
+            _Atom(95, 120, 700.0, 694, "F", 0),
+        ]
+        kept = _dedupe_overlay_atoms(atoms)
+        assert [atoms.index(a) for a in kept] == [0, 2, 3, 4]
+
+
+class TestColumnLayout:
+    def test_first_containing_range_wins(self):
+        store = GlyphStore()
+        fid = store.intern_font("F")
+        for ch, x in (("a", 0), ("b", 12), ("c", 30), ("d", 80)):
+            store.append(ch, fid, x, 0, x + 4, 6)
+        line = Line(1, 0.0, store, 0, len(store))
+        columns = [Column("Date", 0, 0, "left"), Column("Amount", 0, 0, "right")]
+        # Overlapping [0, 40) and [10, 60): "b" and "c" go to Date; "d"
+        # falls in no range.
+        layout = ColumnLayout([(columns[0], 0.0, 40.0), (columns[1], 10.0, 60.0)])
+        assert layout.assign(line) == {"Date": "a b c"}
+        layout = ColumnLayout([(columns[1], 10.0, 60.0), (columns[0], 0.0, 40.0)])
+        assert layout.assign(line) == {"Amount": "b c", "Date": "a"}
+
+
+class TestLineCache:
+    def test_text_and_words_are_cached_until_the_range_changes(self):
+        store = GlyphStore()
+        fid = store.intern_font("F")
+        for ch, x in (("N", 0), ("A", 4), (" ", 8), ("V", 12), ("X", 40)):
+            store.append(ch, fid, x, 0, x + 4, 6)
+        line = Line(1, 0.0, store, 0, 4)
+        assert line.text == "NA V"
+        assert line.words() is line.words()
+        assert line.words() == [("NA V", 0, 16)]
+        assert line.words(split_on_space=True) == [("NA", 0, 8), ("V", 12, 16)]
+        line.stop = 5
+        assert line.text == "NA V X"
+        assert line.words()[-1] == ("X", 40, 44)
+
+
+def _line(baseline, *words):
+    """A `Line` holding `(text, x)` words, 4pt per glyph, no inner gaps."""
+    store = GlyphStore()
+    fid = store.intern_font("F")
+    for text, x in words:
+        for k, ch in enumerate(text):
+            store.append(ch, fid, x + 4 * k, baseline, x + 4 * k + 4, baseline + 6)
+    return Line(1, baseline, store, 0, len(store))
+
+
+class TestDetectTxnColumns:
+    def _page(self):
+        return [
+            _line(800, ("Folio No: 123", 10)),
+            _line(700, ("Date", 10), ("Transaction", 60), ("Amount", 200), ("Units", 260)),
+            _line(690, ("Price", 320), ("Unit", 380)),
+            _line(687, ("Balance", 376)),
+            _line(600, ("01-Jan-2021", 10), ("Purchase", 60)),
+        ]
+
+    def test_window_spans_wrapped_header_baselines(self):
+        first, last, columns = detect_txn_columns(self._page(), 0)
+        assert (first, last) == (1, 3)
+        assert [c.label for c in columns] == [
+            "Date",
+            "Transaction",
+            "Amount",
+            "Units",
+            "Price",
+            "Unit Balance",
+        ]
+
+    def test_repeated_template_reuses_cached_columns(self):
+        _template_columns.cache_clear()
+        _, _, first = detect_txn_columns(self._page(), 0)
+        _, _, again = detect_txn_columns(self._page(), 0)
+        assert again == first
+        assert _template_columns.cache_info().hits == 1
+
+
+class TestPageObjAtoms:
+    def test_text_is_decoded_to_its_length_and_fonts_cached(self, tmp_path):
+        long_text = "9" * _TEXT_BUF_SIZE
+        path = _text_pdf(tmp_path / "atoms.pdf", [[("short", 40, 800), (long_text, 40, 700)]])
+        doc = pdfium.PdfDocument(path)
+        try:
+            page = doc[0]
+            atoms = _page_atoms(page, page.get_textpage())
+            assert [a.text for a in atoms] == ["short", long_text]
+            assert {a.font for a in atoms} == {"Helvetica"}
+        finally:
+            doc.close()
+
+    def test_column_cluster_and_block_geometry(self):
+        atoms = [
+            Atom(20, 80, 700, 694, "INF179K01", "F"),
+            Atom(21, 40, 693, 687, "WN9", "F"),  # left edge: stacks on x_left alone
+            Atom(200, 240, 700, 694, "Average Total", "F"),
+            Atom(200, 240, 693, 687, "Expense Ratio", "F"),  # centred: own cell
+            Atom(300, 330, 700, 694, "12.5", "F"),
+            Atom(302, 350, 693, 687, "more", "F"),  # left-aligned, centre drifts
+            Atom(301, 330, 680, 674, "far", "F"),  # too far below to continue
+        ]
+        block = Block(page=1, cells=_cells_from_block_atoms(atoms))
+        assert [c.text for c in block.cells] == [
+            "INF179K01\nWN9",
+            "Average Total",
+            "Expense Ratio",
+            "12.5\nmore",
+            "far",
+        ]
+        assert (block.x_left, block.x_right, block.y_top, block.y_bot) == (20, 350, 700, 674)
+        assert block.text() == "\t\t".join(c.text for c in block.cells)
+
+    def test_blocks_are_page_indexed_with_kind_hints(self):
+        def atom(x, y, text):
+            return Atom(x, x + 5 * len(text), y, y - 6, text, "F")
+
+        pages = [
+            [atom(20, 800, "Statement")],
+            [],
+            [
+                atom(20, 800, "ISIN"),
+                atom(100, 800, "Security"),
+                atom(200, 800, "Current Bal"),
+                atom(20, 780, "INE002A01018"),
+                atom(100, 780, "RELIANCE"),
+                atom(200, 780, "10"),
+            ],
+        ]
+        blocks = blocks_from_atoms(pages)
+        assert blocks.page_count == 3
+        assert [b.page for b in blocks] == [1, 3, 3]
+        assert blocks.page(2) == [] and blocks.page(4) == []
+        assert blocks.page(3) == blocks.from_page(2) == list(blocks)[1:]
+        assert [b.kind for b in blocks] == [KIND_LABEL, KIND_TEXT, KIND_ROW]
+        assert blocks[1].ltext == "isin\t\tsecurity\t\tcurrent bal"
+
+    def test_column_map_decodes_rows_by_header_band(self):
+        def block(*cells):
+            return Block(
+                page=1,
+                cells=[Cell(x, x + 40, 700, 694, text, []) for x, text in cells],
+            )
+
+        spec = (("isin", ("isin",)), ("balance", ("current bal",)), ("value", ("value",)))
+        header = block((20, "Security"), (120, "ISIN"), (220, "Current Bal"), (320, "Value"))
+        cols = ColumnMap.compile(header, spec)
+        assert cols.width == 4
+        lead, fields = cols.split(
+            block((0, "1"), (20, "RELIANCE"), (120, "INE002A01018"), (230, "10"), (310, "1,000"))
+        )
+        assert [c.text for c in lead] == ["1", "RELIANCE"]
+        assert {k: c.text for k, c in fields.items()} == {
+            "isin": "INE002A01018",
+            "balance": "10",
+            "value": "1,000",
+        }
+        # Two cells in one band, or a missing required column, defer to the
+        # positional rules.
+        assert cols.split(block((120, "INE002A01018"), (205, "10"), (235, "11"))) is None
+        assert cols.split(block((120, "INE002A01018"), (320, "1,000"))) is None
+        assert ColumnMap.compile(header, spec + (("nav", ("nav",)),)) is None
+
+    def test_lazy_blocks_load_pages_on_demand(self):
+        loaded = []
+
+        def source(page_num):
+            loaded.append(page_num)
+            return [Block(page=page_num, cells=[])]
+
+        blocks = PageBlocks(source, page_count=4)
+        assert blocks.page(2)[0].page == 2 and loaded == [1, 2]
+        for page in blocks.iter_pages(3):
+            break
+        assert loaded == [1, 2, 3]
+        assert [b.page for b in blocks] == [1, 2, 3, 4]
+        assert loaded == [1, 2, 3, 4]
+
+
+_NSDL_PAGES = [
+    [("Statement for the period from 01-Dec-2021 to 31-Dec-2021", 40, 800)],
+    [
+        ("NSDL ID: 1234567890", 20, 800),
+        ("JANE DEMAT", 20, 780),
+        ("PINCODE: 560001", 20, 760),
+        ("NSDL Demat Account", 20, 700),
+        ("ALPHA BROKING", 150, 700),
+        ("DP ID:IN300001 Client ID:11111111", 150, 693),
+        ("1", 400, 700),
+        ("1,000.00", 500, 700),
+    ],
+    [
+        ("NSDL Demat Account", 20, 800),
+        ("DP ID:IN300001 Client ID:11111111", 150, 800),
+        ("ACCOUNT HOLDER", 400, 800),
+        ("Equities (E)", 20, 760),
+        ("Stock Symbol", 20, 720),
+        ("Company Name", 100, 720),
+        ("Face Value", 250, 720),
+        ("No. of Shares", 320, 720),
+        ("Market Price", 400, 720),
+        ("Value in", 480, 720),
+        ("INE002A01018", 20, 700),
+        ("Reliance", 100, 700),
+        ("10.00", 250, 700),
+        ("4", 320, 700),
+        ("250.00", 400, 700),
+        ("1,000.00", 480, 700),
+        ("Sub Total", 20, 680),
+        ("1,000.00", 480, 680),
+    ],
+    [("About NSDL", 20, 800)],
+    [("INE009A01021", 20, 800), ("Trailer", 100, 800), ("1", 250, 800), ("2", 320, 800)],
+]
+
+
+class TestNSDLEarlyStop:
+    def test_pages_after_the_trailer_are_never_extracted(self, tmp_path):
+        path = _text_pdf(tmp_path / "nsdl.pdf", _NSDL_PAGES)
+        doc = pdfium.PdfDocument(path)
+        try:
+            walk = DocumentWalk(doc)
+            data = parse_nsdl(path, "", _walk=walk)
+            assert [e.isin for e in data.accounts[0].equities] == ["INE002A01018"]
+            assert data.statement_period.to == "31-Dec-2021"
+            assert sorted(walk._pages) == [0, 1, 2, 3]
+        finally:
+            doc.close()
+
+    def test_notes_labels_inside_the_last_section_do_not_end_the_walk(self, tmp_path):
+        # A bare "Notes" inside the open equity table, and a "Notes:"
+        # label between the equity and MF tables.
+        section = _NSDL_PAGES[2][:-2] + [
+            ("Notes", 20, 680),
+            ("INE009A01021", 20, 660),
+            ("Infosys", 100, 660),
+            ("5.00", 250, 660),
+            ("2", 320, 660),
+            ("1,500.00", 400, 660),
+            ("3,000.00", 480, 660),
+            ("Sub Total", 20, 640),
+            ("4,000.00", 480, 640),
+            ("Notes:", 20, 620),
+            ("Mutual Funds (M)", 20, 600),
+            ("ISIN Description", 20, 580),
+            ("No. of Units", 250, 580),
+            ("NAV", 350, 580),
+            ("Value in", 480, 580),
+            ("INF200K01RJ1", 20, 560),
+            ("SBI Bluechip Growth", 90, 560),
+            ("10.000", 250, 560),
+            ("50.0000", 350, 560),
+            ("500.00", 480, 560),
+            ("Sub Total", 20, 540),
+            ("500.00", 480, 540),
+        ]
+        pages = _NSDL_PAGES[:2] + [section, [("Notes", 20, 800)]] + _NSDL_PAGES[4:]
+        path = _text_pdf(tmp_path / "nsdl.pdf", pages)
+        doc = pdfium.PdfDocument(path)
+        try:
+            walk = DocumentWalk(doc)
+            account = parse_nsdl(path, "", _walk=walk).accounts[0]
+            assert [e.isin for e in account.equities] == ["INE002A01018", "INE009A01021"]
+            assert [m.isin for m in account.mutual_funds] == ["INF200K01RJ1"]
+            assert sorted(walk._pages) == [0, 1, 2, 3]
+        finally:
+            doc.close()
+
+
+_CDSL_HEADER = ["ISIN", "Security", "Current Bal", "Free Bal", "Market Price", "Value"]
+_CDSL_COLUMNS = [20, 90, 240, 300, 380, 460]
+
+
+def _cdsl_row(y, *values):
+    return [(v, x, y) for v, x in zip(values, _CDSL_COLUMNS)]
+
+
+_CDSL_PAGES = [
+    [("Statement for the period from 01-12-2021 to 31-12-2021", 40, 800)],
+    [
+        ("CAS ID: 998877", 20, 800),
+        ("JOHN CDSL", 20, 792),
+        ("PINCODE: 110001", 20, 784),
+        ("In the single name of", 20, 760),
+        ("JOHN CDSL (PAN:ZZZZZ9999Z)", 20, 740),
+        ("CDSL Demat Account", 20, 720),
+        ("GAMMA BROKERS", 150, 720),
+        ("DP Id: 12345678 Client Id : 87654321", 150, 713),
+        ("2", 400, 720),
+        ("1,300.00", 480, 720),
+    ],
+    [
+        ("DP Name : GAMMA BROKERS", 20, 800),
+        ("BO ID : 1234567887654321", 300, 800),
+        ("HOLDING STATEMENT AS ON 31-12-2021", 20, 780),
+        *_cdsl_row(760, *_CDSL_HEADER),
+        *_cdsl_row(740, "INE002A01018", "Reliance", "4", "4", "250.00", "1,000.00"),
+        ("Notes", 20, 720),
+        *_cdsl_row(700, "INE009A01021", "Infosys", "2", "2", "150.00", "300.00"),
+        ("Total", 20, 680),
+        ("1,300.00", 460, 680),
+        ("Notes:", 20, 660),
+    ],
+    [("Notes", 20, 800)],
+    _cdsl_row(800, "INE467B01029", "Trailer", "1", "1", "1.00", "1.00"),
+]
+
+
+class TestCDSLEarlyStop:
+    def test_walk_ends_at_the_trailer_but_not_at_notes_labels(self, tmp_path):
+        path = _text_pdf(tmp_path / "cdsl.pdf", _CDSL_PAGES)
+        doc = pdfium.PdfDocument(path)
+        try:
+            walk = DocumentWalk(doc)
+            data = parse_cdsl(path, "", _walk=walk)
+            assert [e.isin for e in data.accounts[0].equities] == [
+                "INE002A01018",
+                "INE009A01021",
+            ]
+            assert sorted(walk._pages) == [0, 1, 2, 3]
+        finally:
+            doc.close()
+
+    def test_dpc_only_statement_stops_before_the_trailer(self, tmp_path):
+        # Section headers in the `DP Name : ... DP ID : ... CLIENT ID`
+        # form only; the scheme-meta scan must not read past them.
+        section = [
+            ("DP Name : GAMMA BROKERS", 20, 800),
+            ("DP ID : 12345678", 200, 800),
+            ("CLIENT ID : 87654321", 320, 800),
+            *_CDSL_PAGES[2][2:],
+        ]
+        pages = _CDSL_PAGES[:2] + [section] + _CDSL_PAGES[3:]
+        path = _text_pdf(tmp_path / "cdsl.pdf", pages)
+        doc = pdfium.PdfDocument(path)
+        try:
+            walk = DocumentWalk(doc)
+            data = parse_cdsl(path, "", _walk=walk)
+            assert len(data.accounts[0].equities) == 2
+            assert sorted(walk._pages) == [0, 1, 2, 3]
+        finally:
+            doc.close()
+
+
+def _table(*rows):
+    """Blocks of one page; each row is `(y, [(x, text), ...])` and a
+    `\n` in `text` stacks a second line under the first. A cell given
+    as `(x, text, lines)` starts `lines` lines below the row."""
+    atoms = []
+    for y, cells in rows:
+        for x, text, *drop in cells:
+            for k, line in enumerate(text.split("\n"), start=drop[0] if drop else 0):
+                top = y - 7 * k
+                atoms.append(Atom(x, x + 4 * len(line), top, top - 6, line, "F"))
+    return list(blocks_from_atoms([atoms]))
+
+
+def _both_paths(parse, header, row, compile_columns, mode):
+    """`parse(row, cols)` through the header's column map, through the
+    positional rules (`cols=None`), and the map itself."""
+    cols = compile_columns(mode, header)
+    assert cols is not None
+    return parse(row, cols), parse(row, None), cols
+
+
+class TestColumnMapParity:
+    """The header-compiled column maps read the same holding from a
+    row as the positional rules they short-cut."""
+
+    NSDL_HEADER = [
+        (20, "ISIN\nStock Symbol"),
+        (90, "Company Name"),
+        (250, "Face Value"),
+        (320, "No. of Shares"),
+        (400, "Market Price"),
+        (480, "Value in"),
+    ]
+
+    def test_nsdl_equity_rows(self):
+        header, wrapped, blank, twice, spill = _table(
+            (800, self.NSDL_HEADER),
+            (770, [(20, "INE002A01018\nRELIANCE"), (90, "Reliance Industries\nLimited"),
+                   (250, "10.00"), (320, "4"), (400, "2,500.00"), (480, "10,000.00")]),
+            (740, [(20, "INE009A01021"), (90, "Infosys Limited"), (320, "2"),
+                   (400, "1,500.00"), (480, "3,000.00")]),
+            # A wide price spills into the value band: value is hit twice.
+            (710, [(20, "INE467B01029"), (90, "TCS"), (250, "1.00"), (320, "3"),
+                   (452, "3,200.00"), (490, "9,600.00")]),
+            # The name's second line spills into the blank shares column.
+            (680, [(20, "INE040A01034"), (90, "HDFC Bank"), (300, "Limited", 1),
+                   (250, "1.00"), (400, "1,600.00"), (480, "1,600.00")]),
+        )  # fmt: skip
+        for row, decoded in ((wrapped, True), (blank, True), (spill, False), (twice, False)):
+            fast, slow, cols = _both_paths(
+                lambda b, c: nsdl._parse_equity_row(b, cols=c),
+                header,
+                row,
+                nsdl._compile_columns,
+                "equities_summary",
+            )
+            assert fast == slow
+            assert (nsdl._data_cells(row, cols) is not None) is decoded
+        assert fast.value == Decimal("9600.00")
+        assert nsdl._parse_equity_row(wrapped).name == "Reliance Industries Limited"
+
+    CDSL_HEADER = [
+        (20, "ISIN"),
+        (90, "Security"),
+        (240, "Current Bal"),
+        (290, "Frozen Bal"),
+        (340, "Free Bal"),
+        (400, "Market Price"),
+        (470, "Value"),
+    ]
+
+    def test_cdsl_equity_rows(self):
+        header, wrapped, blank, twice, spill = _table(
+            (800, self.CDSL_HEADER),
+            # The name's second line is offset into a cell of its own.
+            (770, [(20, "INE002A01018"), (90, "RELIANCE INDUSTRIES"), (160, "LTD"),
+                   (240, "4"), (290, "--"), (340, "4"), (400, "2,500.00"), (470, "10,000.00")]),
+            (740, [(20, "INE009A01021"), (90, "INFOSYS LTD"), (240, "--"), (340, "--"),
+                   (400, "1,500.00"), (470, "0.00")]),
+            (710, [(20, "INE467B01029"), (90, "TCS LTD"), (240, "3"), (290, "--"),
+                   (340, "3"), (400, "3,200.00"), (470, "9,600.00"), (500, "*")]),
+            # The name's second line spills into the blank Current Bal.
+            (680, [(20, "INE001A01036"), (90, "HOUSING DEVELOPMENT FINANCE"),
+                   (225, "CORPORATION", 1), (290, "--"), (340, "--"), (400, "2,700.00"),
+                   (470, "0.00")]),
+        )  # fmt: skip
+        for row, decoded in ((wrapped, True), (blank, True), (spill, False), (twice, False)):
+            fast, slow, cols = _both_paths(
+                cdsl._parse_holdings_row, header, row, cdsl._compile_columns, "equities"
+            )
+            assert fast == slow
+            split = cols.split(row, start=1)
+            numeric = split is not None and all(
+                cdsl._numeric_or_dash(c.text) for c in split[1].values()
+            )
+            assert numeric is decoded
+        assert cdsl._parse_holdings_row(wrapped)[1] == "RELIANCE INDUSTRIES LTD"
+        assert cdsl._parse_holdings_row(spill)[1] == "HOUSING DEVELOPMENT FINANCE CORPORATION"
+
+    CDSL_MF_HEADER = [
+        (20, "Scheme Name"),
+        (130, "ISIN"),
+        (185, "Folio No."),
+        (240, "ARN Code"),
+        (290, "Closing Bal\n(Units)"),
+        (340, "NAV"),
+        (380, "Cumulative\nAmount Invested"),
+        (440, "Market Value"),
+        (480, "Annualised\nTER"),
+        (520, "Direct"),
+        (550, "Commission"),
+        (600, "Unrealised\nProfit/(Loss)"),
+        (660, "Return (%)"),
+    ]
+
+    def test_cdsl_mf_rows(self):
+        def mf(x_values, y):
+            return (y, list(zip([x for x, _ in self.CDSL_MF_HEADER], x_values)))
+
+        header, wrapped, blank, twice, spill = _table(
+            (800, self.CDSL_MF_HEADER),
+            mf(["S1G - SBI Bluechip\nFund Growth", "INF200K01RJ1", "7700001/0", "DIRECT",
+                "10.000", "50.0000", "400.00", "500.00", "1.10", "0.00", "0.00", "100.00",
+                "12.50"], 760),
+            mf(["S2G - HDFC Index Fund", "INF179K01WN9", "7700002/0", "ARN-0001", "5.000",
+                "20.0000", "", "100.00", "0.90", "0.00", "0.00", "", ""], 720),
+            # The folio wraps its tail into a cell of its own.
+            (680, [(20, "S3G - Axis Liquid"), (130, "INF846K01CH7"), (185, "910121125"),
+                   (212, "82/0"), (240, "DIRECT"), (290, "1.000"), (340, "2,000.0000"),
+                   (380, "1,900.00"), (440, "2,000.00"), (480, "0.20"), (520, "0.00"),
+                   (550, "0.00"), (600, "100.00"), (660, "5.26")]),
+            # The name's second line spills into the blank invested
+            # column, so the row has one cell per header column again.
+            (640, [(20, "S4G - Kotak Flexicap"), (380, "Fund Growth", 1), (130, "INF174K01LS2"),
+                   (185, "7700004/0"), (240, "DIRECT"), (290, "3.000"), (340, "60.0000"),
+                   (440, "180.00"), (480, "0.60"), (520, "0.00"), (550, "0.00"),
+                   (600, "30.00"), (660, "20.00")]),
+        )  # fmt: skip
+        meta = {"S1G": {"ucc": "U1"}}
+        # Blank cells drop out of a row, and a short row keeps the
+        # positional rules; so does the wrapped folio (its tail is a
+        # second cell in the folio band).
+        for row, decoded in ((wrapped, True), (blank, False), (twice, False), (spill, False)):
+            fast, slow, cols = _both_paths(
+                lambda b, c: cdsl._parse_mf_holdings_row(b, meta, c),
+                header,
+                row,
+                cdsl._compile_columns,
+                "mf_holdings",
+            )
+            assert fast == slow
+            assert (len(row.cells) == cols.width and row is not spill) is decoded
+        assert len(spill.cells) == cols.width
+        assert cols.split(spill)[1]["invested"].text == "Fund Growth"
+        assert cols.split(twice) is None
+        twice_mf = cdsl._parse_mf_holdings_row(twice, meta)
+        assert twice_mf.folio == "91012112582/0"
+        first = cdsl._parse_mf_holdings_row(wrapped, meta)
+        assert (first.name, first.ucc, first.pnl) == (
+            "S1G - SBI Bluechip Fund Growth",
+            "U1",
+            Decimal("100.00"),
+        )
@@ -1,3 +1,5 @@
+import io
+import json
 from datetime import date
 from decimal import Decimal
 
@@ -5,19 +7,32 @@ import pytest
 
 from casparser.analysis.gains import (
     CapitalGainsReport,
+    FIFOSnapshot,
     FIFOUnits,
     Fund,
     FundType,
     GainEntry,
+    GainType,
+    LotQueue,
     MergedTransaction,
+    _DailyTotals,
     _fy_needs_transfer_col,
     _transfer_flag,
     get_fund_type,
 )
-from casparser.analysis.utils import CII, get_fin_year
-from casparser.enums import TransactionType
+from casparser.analysis.harvest import HarvestSimulator
+from casparser.analysis.utils import CII, fin_year_start, get_fin_year
+from casparser.enums import CASFileType, FileType, TransactionType
 from casparser.exceptions import GainsError
-from casparser.types import TransactionData
+from casparser.types import (
+    CASData,
+    Folio,
+    InvestorInfo,
+    Scheme,
+    SchemeValuation,
+    StatementPeriod,
+    TransactionData,
+)
 
 
 class TestGainsClass:
@@ -42,6 +57,13 @@ class TestGainsClass:
         assert CII["FY1990-91"] == 100
         assert CII[get_fin_year(future_date)] == CII[CII._max_year]
 
+    def test_cii_integer_index_matches_fy_strings(self):
+        for year in range(1995, date.today().year + 5):
+            dt = date(year, 6, 1)
+            assert fin_year_start(dt) == year
+            assert CII.for_year(year) == CII[get_fin_year(dt)]
+        assert fin_year_start(date(2024, 3, 31)) == 2023
+
     def test_fund_type(self):
         transactions = [
             TransactionData(
@@ -422,6 +444,359 @@ class TestSchedule112A:
         assert cols[1] == "ISIN Code(2)"
 
 
+class TestGainEntryClassification:
+    def test_gain_type_and_split_are_fixed_at_creation(self):
+        fund = Fund("Equity Fund", "F1", "INF000A01001", "EQUITY")
+        ge = _ltcg_entry("FY2024-25", fund, date(2020, 2, 29), date(2021, 3, 1))
+        assert ge.gain_type == GainType.LTCG
+        assert (ge.ltcg, ge.stcg) == (ge.gain, Decimal(0))
+        # Held exactly one year (29-Feb clamps to 28-Feb): still short-term.
+        ge = _ltcg_entry("FY2020-21", fund, date(2020, 2, 29), date(2021, 2, 28))
+        assert ge.gain_type == GainType.STCG
+        assert (ge.ltcg, ge.stcg, ge.ltcg_taxable) == (Decimal(0), ge.gain, Decimal(0))
+        assert not hasattr(ge, "__dict__")
+
+
+class TestDailyTotals:
+    def _txn(self, dt, txn_type, amount, units=None, nav=None):
+        return TransactionData(
+            date=dt,
+            description="x",
+            amount=Decimal(amount),
+            units=Decimal(units) if units else None,
+            nav=Decimal(nav) if nav else None,
+            type=txn_type,
+        )
+
+    def test_days_are_netted_in_date_order_with_largest_amount_first(self):
+        days = _DailyTotals(
+            [
+                self._txn("2021-03-01", TransactionType.REDEMPTION, "-50", "-5", "10"),
+                self._txn(date(2021, 1, 1), TransactionType.PURCHASE, "100", "10", "10"),
+                self._txn(date(2021, 1, 1), TransactionType.STAMP_DUTY_TAX, "0.01"),
+                # Smaller amount, so applied last: its NAV is the day's NAV.
+                self._txn(date(2021, 1, 1), TransactionType.PURCHASE_SIP, "22", "2", "11"),
+                self._txn("2021-03-01", TransactionType.STT_TAX, "0.5"),
+            ],
+            after=None,
+        )
+        assert days.dates == [date(2021, 1, 1), date(2021, 3, 1)]
+        assert days.navs == [Decimal("11"), Decimal("10")]
+        assert days.purchase_units == [Decimal("12"), Decimal("0")]
+        assert days.stamp_duty == [Decimal("0.01"), Decimal("0")]
+        assert (days.sale_units[1], days.stt[1]) == (Decimal("-5"), Decimal("0.5"))
+        assert days.merged(0).purchase == Decimal("122")
+        later = _DailyTotals(
+            [self._txn(date(2021, 1, 1), TransactionType.PURCHASE, "100", "10", "10")],
+            after=date(2021, 1, 1),
+        )
+        assert len(later) == 0
+
+
+class TestLotQueue:
+    def test_match_spans_lots_and_keeps_partial_remainder_in_front(self):
+        lots = LotQueue()
+        for day, units in ((1, "10.5"), (2, "20.125"), (3, "5")):
+            lots.push(date(2020, 1, day), Decimal(units), Decimal("10"), Decimal("0.30"))
+        # 10.5 + 20.125 < 31 units: the sale reaches into the third lot.
+        assert lots.match(Decimal("31")) == range(0, 3)
+        assert lots.match(Decimal("30.625")) == range(0, 2)
+        # Below the 0.01 threshold nothing is matched.
+        assert lots.match(Decimal("0.01")) == range(0, 0)
+        assert lots.match(Decimal("35.64")) is None
+
+        lots.consume(2, Decimal("5.125"), Decimal("0.08"))
+        assert list(lots)[0] == (date(2020, 1, 2), Decimal("5.125"), Decimal("10"), Decimal("0.08"))
+        assert lots.match(Decimal("5.14")) == range(1, 3)
+        lots.consume(3)
+        assert len(lots) == 0
+
+
+def _cas(*folios):
+    """CASData with one EQUITY scheme per `(folio, [(date, units, nav)])`
+    entry; negative units are redemptions (each with STT)."""
+    built = []
+    for folio, trades in folios:
+        txns = []
+        for dt, units, nav in trades:
+            units, nav = Decimal(units), Decimal(nav)
+            sale = units < 0
+            txns.append(
+                TransactionData(
+                    date=dt,
+                    description="Redemption" if sale else "Purchase",
+                    amount=units * nav,
+                    units=units,
+                    nav=nav,
+                    type=TransactionType.REDEMPTION if sale else TransactionType.PURCHASE,
+                )
+            )
+            if sale:
+                txns.append(
+                    TransactionData(
+                        date=dt,
+                        description="STT",
+                        amount=Decimal("1"),
+                        type=TransactionType.STT_TAX,
+                    )
+                )
+        scheme = Scheme(
+            scheme=f"Fund {folio}",
+            rta_code="X",
+            rta="CAMS",
+            type="EQUITY",
+            isin=None,
+            open=0,
+            close=0,
+            close_calculated=0,
+            valuation=SchemeValuation(date=date(2025, 3, 31), nav=20, value=Decimal("100.00")),
+            transactions=txns,
+        )
+        built.append(Folio(folio=folio, amc="AMC", schemes=[scheme]))
+    return CASData(
+        statement_period=StatementPeriod(**{"from": "", "to": ""}),
+        folios=built,
+        investor_info=InvestorInfo(name="", email="", address="", mobile=""),
+        cas_type=CASFileType.DETAILED,
+        file_type=FileType.CAMS,
+    )
+
+
+class TestParallelGains:
+    def _signature(self, report):
+        return (
+            report.get_gains_csv_data(),
+            report.errors,
+            report.invested_amount,
+            report.current_value,
+        )
+
+    def test_process_pool_and_batch_match_serial_run(self):
+        family = [
+            _cas(
+                ("A1", [(date(2020, 1, 1), "100", "10"), (date(2022, 6, 1), "-60", "15")]),
+                ("A2", [(date(2021, 1, 1), "50", "10"), (date(2021, 6, 1), "-80", "12")]),
+                ("A3", [(date(2019, 5, 1), "10.5", "9"), (date(2024, 8, 1), "-10.5", "30")]),
+            ),
+            _cas(("B1", [(date(2018, 3, 1), "40", "20"), (date(2023, 1, 1), "-25", "25")])),
+        ]
+        serial = [self._signature(CapitalGainsReport(data)) for data in family]
+        assert serial[0][1] == [
+            ("Fund A2 [A2]", "FIFOUnits mismatch for Fund A2 [A2]. Please contact support.")
+        ]
+        pooled = [self._signature(CapitalGainsReport(data, workers=2)) for data in family]
+        batched = [self._signature(r) for r in CapitalGainsReport.batch(family, workers=2)]
+        assert pooled == serial
+        assert batched == serial
+
+    def test_batch_runs_in_process_by_default(self, monkeypatch):
+        import casparser.analysis.gains as gains_mod
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("batch() started a process pool")
+
+        monkeypatch.setattr(gains_mod, "ProcessPoolExecutor", no_pool)
+        family = [
+            _cas(("A1", [(date(2020, 1, 1), "100", "10"), (date(2022, 6, 1), "-60", "15")])),
+            _cas(("B1", [(date(2018, 3, 1), "40", "20"), (date(2023, 1, 1), "-25", "25")])),
+        ]
+        batched = [self._signature(r) for r in CapitalGainsReport.batch(family)]
+        assert batched == [self._signature(CapitalGainsReport(data)) for data in family]
+
+
+class TestFIFOSnapshots:
+    TRADES = [
+        (date(2019, 1, 1), "100", "10"),
+        (date(2019, 6, 1), "50.5", "12"),
+        (date(2021, 2, 1), "-120", "15"),
+        (date(2022, 3, 1), "20", "14"),
+        (date(2023, 5, 1), "-40", "18"),
+    ]
+
+    def test_resume_processes_only_transactions_after_the_checkpoint(self):
+        full = CapitalGainsReport(_cas(("F1", self.TRADES)))
+        first = CapitalGainsReport(_cas(("F1", self.TRADES[:3])))
+        snapshots = first.get_snapshots()
+        state = snapshots[("F1", "Fund F1")]
+        assert state.as_of == date(2021, 2, 1)
+        assert state.balance == Decimal("30.5")
+        assert state.lots == [(date(2019, 6, 1), Decimal("30.5"), Decimal("12"), Decimal("0"))]
+
+        # Round-trip through JSON, as a nightly job would store it.
+        stored = json.loads(json.dumps([s.to_dict() for s in snapshots.values()]))
+        resume = {s.key: s for s in map(FIFOSnapshot.from_dict, stored)}
+        # The next statement overlaps the last one and opens with units held.
+        data = _cas(("F1", self.TRADES[2:]))
+        data.folios[0].schemes[0].open = Decimal("30.5")
+        resumed = CapitalGainsReport(data, resume=resume)
+
+        assert resumed.gains == [g for g in full.gains if g.sale_date > state.as_of]
+        assert resumed.invested_amount == full.invested_amount
+        assert resumed.get_snapshots() == full.get_snapshots()
+
+
+class TestUnrealisedGains:
+    TRADES = [
+        (date(2023, 1, 1), "100", "10"),
+        (date(2024, 12, 1), "50", "16"),
+        (date(2025, 1, 1), "-60", "18"),
+    ]
+
+    def test_open_lots_are_valued_at_scheme_nav_and_classified(self):
+        report = CapitalGainsReport(_cas(("F1", self.TRADES)))
+        lots = report.get_unrealised()
+        # Valuation: NAV 20 on 31-Mar-2025.
+        assert [(g.purchase_date, g.units, g.gain_type) for g in lots] == [
+            (date(2023, 1, 1), Decimal("40"), GainType.LTCG),
+            (date(2024, 12, 1), Decimal("50"), GainType.STCG),
+        ]
+        assert [(g.ltcg, g.stcg) for g in lots] == [
+            (Decimal("400.00"), Decimal(0)),
+            (Decimal(0), Decimal("200.00")),
+        ]
+        assert all(g.fy == "FY2024-25" and g.stt == 0 for g in lots)
+        assert (
+            report.get_unrealised_csv_data()
+            .splitlines()[1]
+            .startswith("FY2024-25,Fund F1 [F1],,EQUITY,40,2023-01-01,400.00")
+        )
+
+    def test_resumed_scheme_without_new_transactions_keeps_its_lots(self):
+        first = CapitalGainsReport(_cas(("F1", [(date(2023, 1, 1), "100", "10")])))
+        data = _cas(("F1", []))
+        data.folios[0].schemes[0].open = Decimal("100")
+        report = CapitalGainsReport(data, resume=first.get_snapshots())
+        assert report.get_unrealised() == first.get_unrealised()
+        assert report.invested_amount == Decimal("1000")
+
+    def test_buy_only_scheme_of_unknown_type_is_skipped_with_an_error(self):
+        data = _cas(("F1", [(date(2023, 1, 1), "100", "10")]), ("F2", self.TRADES))
+        data.folios[0].schemes[0].type = "N/A"
+        report = CapitalGainsReport(data)
+        assert report.errors == []
+        lots = report.get_unrealised()
+        assert {g.fund.folio for g in lots} == {"F2"}
+        assert report.errors == [
+            ("Fund F1 [F1]", "Cannot value open lots of Fund F1 [F1]; unknown fund type.")
+        ]
+        # Cached: asking again doesn't record the error twice.
+        assert report.get_unrealised() == lots and len(report.errors) == 1
+
+
+class TestHarvestSimulator:
+    TRADES = [
+        (date(2022, 1, 1), "100", "10"),
+        (date(2022, 6, 1), "100", "12"),
+        (date(2024, 12, 1), "50", "18"),
+    ]
+
+    def _simulator(self):
+        report = CapitalGainsReport(_cas(("F1", self.TRADES)))
+        return HarvestSimulator.from_report(report)[("F1", "Fund F1")]
+
+    def test_gain_matches_a_fifo_replay(self):
+        sim = self._simulator()
+        # Defaults to the valuation: NAV 20 on 31-Mar-2025.
+        result = sim.gain(Decimal("220"))
+        replay = CapitalGainsReport(
+            _cas(("F1", self.TRADES + [(date(2025, 3, 31), "-220", "20")]))
+        ).gains
+        assert result.units == Decimal("220")
+        assert result.ltcg == sum(g.ltcg for g in replay) == Decimal("1800.00")
+        assert result.stcg == sum(g.stcg for g in replay) == Decimal("40.00")
+        assert result.ltcg_taxable == sum(g.ltcg_taxable for g in replay)
+        # Before 1-Jun-2023 the second lot is still short-term.
+        assert sim.gain(Decimal("150"), date(2023, 5, 1)).stcg == Decimal("400.00")
+        with pytest.raises(GainsError):
+            sim.gain(Decimal("251"))
+
+    def test_units_for_target_gain(self):
+        sim = self._simulator()
+        # 10/unit on the first lot, then 8/unit on the second.
+        assert sim.units_for_gain(Decimal("500")) == Decimal("50")
+        assert sim.units_for_gain(Decimal("1400")) == Decimal("150")
+        assert sim.gain(Decimal("150")).ltcg_taxable == Decimal("1400.00")
+        # Never reaches into the short-term third lot.
+        assert sim.units_for_gain(Decimal("100000")) == Decimal("200")
+        assert sim.units_for_gain(Decimal("-1")) == Decimal("0")
+
+    def test_unknown_fund_type_is_rejected_and_left_out_of_reports(self):
+        data = _cas(("F1", self.TRADES), ("F2", [(date(2023, 1, 1), "100", "10")]))
+        data.folios[1].schemes[0].type = "N/A"
+        simulators = HarvestSimulator.from_report(CapitalGainsReport(data))
+        assert list(simulators) == [("F1", "Fund F1")]
+        fund = Fund("Fund F2", "F2", None, "N/A")
+        with pytest.raises(ValueError, match="unknown fund type 'UNKNOWN'"):
+            HarvestSimulator(fund, "UNKNOWN", [(date(2023, 1, 1), Decimal(1), Decimal(1), 0)])
+
+
+class TestGainsIndex:
+    def test_indexes_follow_report_order_and_rebuild_when_invalidated(self):
+        f1 = Fund("Alpha Fund", "F1", "INF000A01001", "EQUITY")
+        f2 = Fund("Beta Fund", "F2", "INF000A01002", "EQUITY")
+        gains = [
+            _ltcg_entry("FY2024-25", f2, date(2022, 1, 1), date(2024, 9, 1)),
+            _ltcg_entry("FY2023-24", f1, date(2021, 1, 1), date(2023, 9, 1)),
+            _ltcg_entry("FY2024-25", f1, date(2022, 1, 1), date(2024, 6, 1)),
+        ]
+        report = _report_with_gains(gains)
+        assert report.get_fy_list() == ["FY2024-25", "FY2023-24"]
+        assert [g.fund.scheme for g in report.get_fy_gains("FY2024-25")] == [
+            "Alpha Fund",
+            "Beta Fund",
+        ]
+        assert report.get_fy_gains("FY2024-25", GainType.STCG) == []
+        assert [g.fy for g in report.get_fund_gains(f1)] == ["FY2023-24", "FY2024-25"]
+        assert report._index is report._index
+
+        # Replaced in place, same length: the index only follows once
+        # it is invalidated.
+        gains[2] = _ltcg_entry("FY2022-23", f2, date(2020, 1, 1), date(2022, 9, 1))
+        assert report.get_fy_list() == ["FY2024-25", "FY2023-24"]
+        report._invalidate_index()
+        assert report.get_fy_list()[-1] == "FY2022-23"
+        assert [g.fy for g in report.gains][0] == "FY2022-23"
+
+
+class TestSchedule112AAll:
+    def test_all_years_match_per_year_rows_and_csv(self):
+        fund = Fund("Equity Fund", "F1", "INF000A01001", "EQUITY")
+        debt = Fund("Debt Fund", "F2", "INF000A01002", "DEBT")
+        gains = [
+            _ltcg_entry("FY2024-25", fund, date(2022, 1, 1), date(2024, 6, 1)),
+            _ltcg_entry("FY2024-25", fund, date(2022, 2, 1), date(2024, 9, 1)),
+            _ltcg_entry("FY2021-22", fund, date(2019, 1, 1), date(2021, 6, 1)),
+            _ltcg_entry("FY2022-23", debt, date(2019, 1, 1), date(2022, 6, 1)),
+        ]
+        report = _report_with_gains(gains)
+        all_rows = report.generate_112a_all()
+        # FY2022-23 only has debt LTCG, so no 112A rows.
+        assert list(all_rows) == ["FY2024-25", "FY2021-22"]
+        assert report.generate_112a("FY2022-23") == []
+        for fy, rows in all_rows.items():
+            assert rows == report.generate_112a(fy)
+            with io.StringIO() as fp:
+                report.write_112a_csv(fp, fy, rows)
+                assert fp.getvalue() == report.generate_112a_csv_data(fy)
+
+    def test_cli_all_option_skips_years_without_rows(self, tmp_path, capsys):
+        from casparser.cli import save_gains_112a
+
+        fund = Fund("Equity Fund", "F1", "INF000A01001", "EQUITY")
+        debt = Fund("Debt Fund", "F2", "INF000A01002", "DEBT")
+        report = _report_with_gains(
+            [
+                _ltcg_entry("FY2024-25", fund, date(2022, 1, 1), date(2024, 6, 1)),
+                _ltcg_entry("FY2022-23", debt, date(2019, 1, 1), date(2022, 6, 1)),
+            ]
+        )
+        save_gains_112a(report, "all", str(tmp_path / "cas.json"))
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["cas-FY2024-25-gains-112a.csv"]
+        out = capsys.readouterr().out
+        assert "FY2022-23; skipped" in out
+        assert "written for: FY2024-25" in out
+
+
 class TestStampDutyInCostOfAcquisition:
     """Purchase-side stamp duty is part of the cost of acquisition.
 
@@ -458,3 +833,32 @@ class TestStampDutyInCostOfAcquisition:
         assert row.expenditure == Decimal("0.00")  # STT excluded
         assert row.deductions == Decimal("1001.00")
         assert row.balance == Decimal("999.00")
+
+
+class TestPrefetchedFMV:
+    """GainEntry reads its 31-Jan-2018 NAV lazily, from the report's
+    prefetched table when it has the ISIN."""
+
+    def test_fmv_nav_comes_from_table_without_db_lookup(self, monkeypatch):
+        import casparser.analysis.gains as gains_mod
+
+        calls = []
+        monkeypatch.setattr(gains_mod, "nav_search", lambda isin: calls.append(isin))
+        fund = Fund("Equity Fund", "F1", "INF000A01001", "EQUITY")
+        ge = _ltcg_entry("FY2019-20", fund, date(2017, 1, 1), date(2019, 9, 1))
+        ge.nav_table = {"INF000A01001": Decimal("12.5")}
+        assert ge.fmv_nav == Decimal("12.5")
+        assert ge.fmv == Decimal("1250.0000")
+        assert calls == []
+
+    def test_lookup_is_deferred_until_fmv_nav_is_read(self, monkeypatch):
+        import casparser.analysis.gains as gains_mod
+
+        calls = []
+        monkeypatch.setattr(gains_mod, "nav_search", lambda isin: calls.append(isin))
+        fund = Fund("Equity Fund", "F1", "INF000A01001", "EQUITY")
+        ge = _ltcg_entry("FY2024-25", fund, date(2022, 1, 1), date(2024, 9, 1))
+        assert ge.ltcg == Decimal("999.00")
+        assert calls == []
+        assert ge.fmv_nav is None
+        assert calls == ["INF000A01001"]
@@ -2,7 +2,7 @@
 
 - `casparser.parsers._classify.get_transaction_type`
 - `casparser.parsers._classify.get_parsed_scheme_name`
-- `casparser.parsers._isin.isin_search`
+- `casparser.parsers._isin.isin_search` / `ISINResolver`
 """
 
 from decimal import Decimal
@@ -12,7 +12,7 @@ from casparser.parsers._classify import (
     get_parsed_scheme_name,
     get_transaction_type,
 )
-from casparser.parsers._isin import isin_search
+from casparser.parsers._isin import ISINResolver, isin_search
 from casparser.parsers.cams_detailed import _reconcile_balances
 from casparser.types import Scheme, SchemeValuation, TransactionData
 
@@ -218,6 +218,27 @@ class TestISINSearch:
         assert scheme_type is None
 
 
+class TestISINResolver:
+    def test_batches_and_dedupes_lookups(self):
+        resolver = ISINResolver()
+        got = []
+        key = ("Axis Long Term Equity Fund - Direct Growth", "KFINTECH", "128TSDGG")
+        resolver.request(*key, on_result=got.append)
+        resolver.request(*key, on_result=got.append)
+        resolver.request("", "KARVY", "", on_result=got.append)
+        assert len(resolver) == 2
+        results = resolver.resolve()
+        assert results[(*key, None)] == ("INF846K01EW2", "120503", "EQUITY")
+        assert got == [
+            ("INF846K01EW2", "120503", "EQUITY"),
+            ("INF846K01EW2", "120503", "EQUITY"),
+            (None, None, None),
+        ]
+        # Resolving drains the queue.
+        assert len(resolver) == 0
+        assert resolver.resolve() == {}
+
+
 class TestBalanceSignFix:
     """Cover `_apply_balance_sign_fix`, the running-balance sign
     validator that catches cosmetic-parens sign mis-parses (notably